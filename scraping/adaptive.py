@@ -0,0 +1,105 @@
+"""
+Réglage adaptatif des délais / timeouts du scraper
+Au lieu d'un multiplicateur fixe (3x dès que GITHUB_ACTIONS est défini), on mesure la latence
+réelle de chargement (panneau de détail, résultats de recherche) et on ajuste le multiplicateur
+par moyenne mobile exponentielle (EWMA), dans des bornes.
+"""
+import threading
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Latence "normale" (secondes) de chaque attente pour un multiplicateur de 1.0 (poste local rapide)
+# Les timeouts du scraper laissent ~5x cette latence de marge : multiplicateur = latence / référence
+LATENCES_REFERENCE = {
+    'panneau_detail': 1.0,
+    'resultats': 2.0,
+    'document': 1.5,
+}
+
+
+class ControleurDelais:
+    """
+    Multiplicateur de délais/timeouts ajusté d'après les latences observées
+
+    Peut être partagé entre plusieurs scrapers (un run GitHub Actions) : thread-safe.
+    """
+
+    def __init__(self, multiplicateur_initial: float = 1.0, minimum: float = 1.0, maximum: float = 4.0,
+                 alpha: float = 0.2, facteur_timeout: float = 1.5):
+        """
+        Args:
+            multiplicateur_initial: Valeur de départ (avant toute mesure)
+            minimum / maximum: Bornes du multiplicateur
+            alpha: Poids d'une nouvelle mesure dans l'EWMA (0-1)
+            facteur_timeout: Hausse immédiate du multiplicateur quand une attente expire
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.alpha = alpha
+        self.facteur_timeout = facteur_timeout
+        self.multiplicateur_initial = self._borner(multiplicateur_initial)
+        self._ewma = self.multiplicateur_initial
+        self._lock = threading.Lock()
+        self.nb_mesures = 0
+        self.nb_timeouts = 0
+        self.valeur_min_vue = self._ewma
+        self.valeur_max_vue = self._ewma
+
+    def _borner(self, valeur: float) -> float:
+        return max(self.minimum, min(self.maximum, valeur))
+
+    @property
+    def multiplicateur(self) -> float:
+        return self._ewma
+
+    def observer(self, nom: str, duree: float, ok: bool):
+        """
+        Observateur branché sur MoteurAttente : reçoit chaque attente (nom, durée, succès)
+
+        Seules les attentes de LATENCES_REFERENCE comptent (un scroll qui attend en vain
+        la fin de liste n'indique pas une machine lente).
+        """
+        reference = LATENCES_REFERENCE.get(nom)
+        if reference is None:
+            return
+        with self._lock:
+            if ok:
+                cible = duree / reference
+            else:
+                # Timeout : la machine est plus lente que prévu, remonter tout de suite
+                cible = self._ewma * self.facteur_timeout
+                self.nb_timeouts += 1
+            self._ewma = self._borner(self.alpha * cible + (1 - self.alpha) * self._ewma)
+            self.nb_mesures += 1
+            self.valeur_min_vue = min(self.valeur_min_vue, self._ewma)
+            self.valeur_max_vue = max(self.valeur_max_vue, self._ewma)
+
+    def resume(self) -> Dict:
+        return {
+            'initial': round(self.multiplicateur_initial, 2),
+            'final': round(self._ewma, 2),
+            'min': round(self.valeur_min_vue, 2),
+            'max': round(self.valeur_max_vue, 2),
+            'mesures': self.nb_mesures,
+            'timeouts': self.nb_timeouts,
+        }
+
+    def log_resume(self, prefixe: str = ''):
+        r = self.resume()
+        logger.info(
+            f"🎚️ {prefixe}Multiplicateur délais: {r['initial']}x -> {r['final']}x "
+            f"(min {r['min']}x, max {r['max']}x, {r['mesures']} mesures, {r['timeouts']} timeouts)"
+        )
+
+
+def controleur_par_defaut(is_github_actions: bool, multiplicateur_initial: Optional[float] = None) -> ControleurDelais:
+    """
+    Contrôleur avec les valeurs de départ de l'environnement
+
+    GitHub Actions démarre prudemment à 2x (au lieu du 3x fixe) et descend si le runner est rapide.
+    """
+    if multiplicateur_initial is None:
+        multiplicateur_initial = 2.0 if is_github_actions else 1.0
+    return ControleurDelais(multiplicateur_initial=multiplicateur_initial)
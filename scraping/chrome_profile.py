@@ -0,0 +1,114 @@
+"""
+Profils Chrome persistants et cache du chemin ChromeDriver
+- Un dossier --user-data-dir par worker : les cookies de consentement Google sont gardés
+  d'une session à l'autre (consentement accepté une seule fois), sans partage entre threads
+  (Chrome verrouille un profil par instance).
+- Un profil restauré depuis une autre machine (cache GitHub Actions) garde les verrous Singleton*
+  de l'instance qui l'a écrit : ils sont retirés, sinon Chrome croit le profil utilisé ailleurs.
+- Le chemin du ChromeDriver résolu est mis en cache (mémoire + disque) pour ne pas
+  interroger ChromeDriverManager().install() à chaque lancement.
+"""
+import os
+import json
+import socket
+import threading
+import logging
+from pathlib import Path
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Dossier racine des profils (surchargeable via SCRAPER_PROFILE_DIR, désactivable avec SCRAPER_PROFILE_DIR=none)
+DOSSIER_PROFILS_DEFAUT = Path(__file__).parent.parent / "data" / "chrome_profiles"
+FICHIER_CACHE_CHROMEDRIVER = Path(__file__).parent.parent / "data" / ".chromedriver_path.json"
+
+_chemin_chromedriver: Optional[str] = None
+_lock_chromedriver = threading.Lock()
+
+
+def dossier_profil(identifiant_worker) -> Optional[str]:
+    """
+    Dossier de profil Chrome dédié à un worker
+
+    Args:
+        identifiant_worker: Numéro du worker dans le DriverPool, ou 'solo' sans pool
+
+    Returns:
+        Chemin absolu du dossier (créé si besoin), ou None si les profils sont désactivés
+    """
+    racine = os.environ.get('SCRAPER_PROFILE_DIR', '')
+    if racine.strip().lower() in ('none', '0', 'false'):
+        return None
+    racine = Path(racine) if racine else DOSSIER_PROFILS_DEFAUT
+    dossier = racine / f"worker_{identifiant_worker}"
+    try:
+        dossier.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        logger.warning(f"⚠️ Dossier de profil Chrome indisponible ({dossier}): {e}")
+        return None
+    _retirer_verrous_etrangers(dossier)
+    return str(dossier.resolve())
+
+
+def _retirer_verrous_etrangers(dossier: Path):
+    """Supprime SingletonLock/Cookie/Socket si le verrou a été posé par une autre machine"""
+    verrou = dossier / 'SingletonLock'
+    try:
+        cible = os.readlink(verrou)  # "<hostname>-<pid>"
+    except OSError:
+        return
+    if cible.rsplit('-', 1)[0] == socket.gethostname():
+        return  # Verrou local : Chrome sait s'il est périmé
+    for nom in ('SingletonLock', 'SingletonCookie', 'SingletonSocket'):
+        try:
+            (dossier / nom).unlink()
+        except OSError:
+            pass
+    logger.info(f"🔓 Verrous d'un profil Chrome restauré retirés ({dossier.name}, posés par {cible})")
+
+
+def chemin_chromedriver(resoudre: Callable[[], str]) -> str:
+    """
+    Chemin du ChromeDriver, résolu une seule fois par processus et mémorisé sur disque
+
+    Args:
+        resoudre: Fonction de résolution complète (chemins système, ChromeDriverManager...)
+                  appelée seulement si aucun chemin valide n'est en cache
+
+    Returns:
+        Chemin de l'exécutable chromedriver
+    """
+    global _chemin_chromedriver
+    with _lock_chromedriver:
+        if _chemin_chromedriver and os.path.exists(_chemin_chromedriver):
+            return _chemin_chromedriver
+
+        try:
+            cache = json.loads(FICHIER_CACHE_CHROMEDRIVER.read_text(encoding='utf-8'))
+            chemin = cache.get('chemin')
+            if chemin and os.path.exists(chemin):
+                _chemin_chromedriver = chemin
+                logger.info(f"⚡ ChromeDriver en cache: {chemin}")
+                return chemin
+        except (OSError, ValueError):
+            pass
+
+        chemin = resoudre()
+        _chemin_chromedriver = chemin
+        try:
+            FICHIER_CACHE_CHROMEDRIVER.parent.mkdir(parents=True, exist_ok=True)
+            FICHIER_CACHE_CHROMEDRIVER.write_text(json.dumps({'chemin': chemin}), encoding='utf-8')
+        except OSError as e:
+            logger.debug(f"Impossible d'écrire le cache ChromeDriver: {e}")
+        return chemin
+
+
+def invalider_cache_chromedriver():
+    """Oublie le chemin en cache (ex : Chrome mis à jour, version de driver incompatible)"""
+    global _chemin_chromedriver
+    with _lock_chromedriver:
+        _chemin_chromedriver = None
+        try:
+            FICHIER_CACHE_CHROMEDRIVER.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,319 @@
+"""
+Extraction "snapshot" du panneau de détail Google Maps
+Un seul execute_script récupère tout l'état brut du panneau (titre, boutons téléphone,
+liens site web, adresse, note/avis...), puis le parsing se fait entièrement en Python.
+Remplace les dizaines d'appels find_elements/get_attribute (un aller-retour WebDriver chacun).
+"""
+import re
+from typing import Callable, Dict, List, Optional
+from urllib.parse import unquote
+
+# Script exécuté dans la page : retourne l'état brut du panneau de détail ouvert
+# arguments[0] = nom attendu (aria-label de la carte cliquée) ou null
+PANNEAU_JS = """
+var nomAttendu = (arguments[0] || '').toLowerCase().trim();
+function txt(e) { return e ? (e.innerText || e.textContent || '').trim() : ''; }
+function attrs(racine, selecteur, attr) {
+    return Array.from(racine.querySelectorAll(selecteur)).map(function(e) {
+        return e.getAttribute(attr) || '';
+    });
+}
+
+// 1. Identifier le panneau de détail : div[role="main"] qui contient un h1 (le plus récent en dernier)
+var candidats = Array.from(document.querySelectorAll('div[role="main"]')).filter(function(c) {
+    return c.querySelector('h1') !== null;
+});
+var panneau = null;
+for (var i = candidats.length - 1; i >= 0; i--) {
+    var titreCandidat = txt(candidats[i].querySelector('h1')).toLowerCase();
+    var ariaCandidat = (candidats[i].getAttribute('aria-label') || '').toLowerCase();
+    if (!nomAttendu || titreCandidat.indexOf(nomAttendu.slice(0, 10)) !== -1 ||
+        ariaCandidat.indexOf(nomAttendu.slice(0, 10)) !== -1) {
+        panneau = candidats[i];
+        break;
+    }
+}
+if (!panneau && candidats.length) { panneau = candidats[candidats.length - 1]; }
+var trouve = panneau !== null;
+if (!panneau) { panneau = document.body; }
+
+var titre = panneau.querySelector('h1.DUwDvf') || panneau.querySelector('h1');
+
+return {
+    url: window.location.href,
+    panneau_trouve: trouve,
+    titre: txt(titre),
+    aria_panneau: panneau.getAttribute ? (panneau.getAttribute('aria-label') || '') : '',
+    telephones: Array.from(panneau.querySelectorAll(
+        'button[data-item-id*="phone"], button[aria-label*="Numéro de téléphone"], button[aria-label*="phone"]'
+    )).map(function(b) { return (b.getAttribute('aria-label') || '') + ' ' + txt(b); }),
+    liens_tel: attrs(panneau, 'a[href^="tel:"]', 'href'),
+    sites: Array.from(panneau.querySelectorAll(
+        'a[data-item-id*="authority"], a[aria-label*="Visiter le site Web"], a[aria-label*="site Web"], a[aria-label*="Website"]'
+    )).map(function(a) { return a.href || a.getAttribute('href') || ''; }),
+    adresses: Array.from(panneau.querySelectorAll(
+        'button[data-item-id*="address"], button[aria-label*="Adresse"], button[aria-label*="Address"]'
+    )).map(function(b) { return b.getAttribute('aria-label') || txt(b); }),
+    notes: attrs(panneau,
+        'span[role="img"][aria-label*="étoile"], span[role="img"][aria-label*="star"], ' +
+        'span[role="img"][aria-label*="avis"], span[role="img"][aria-label*="review"]', 'aria-label'),
+    avis: Array.from(panneau.querySelectorAll(
+        'span.UY7F9, span[class*="UY7F9"], span[aria-label*="avis"], span[aria-label*="review"]'
+    )).map(function(s) { return (s.getAttribute('aria-label') || '') + ' ' + txt(s); }),
+    categorie: txt(panneau.querySelector('button[jsaction*="category"]')),
+    texte: txt(panneau).slice(0, 5000)
+};
+"""
+
+# Script exécuté dans la page : état brut de TOUTES les cartes de résultat en un seul appel
+# arguments[0] = liste des éléments de la liste (liens /maps/place/ ou cartes)
+CARTES_JS = """
+function txt(e) { return e ? (e.innerText || e.textContent || '').trim() : ''; }
+return arguments[0].map(function(e) {
+    try {
+        var carte = e.closest('div[role="article"]') || (e.parentElement || e);
+        var lien = (e.href && e.href.indexOf('/maps/place/') !== -1) ? e : carte.querySelector('a[href*="/maps/place/"]');
+        return {
+            href: lien ? lien.href : null,
+            aria: (lien && lien.getAttribute('aria-label')) || carte.getAttribute('aria-label') || '',
+            titre: txt(carte.querySelector('div.fontHeadlineSmall, div[class*="fontHeadline"], div[role="heading"], h3')),
+            notes: Array.from(carte.querySelectorAll('span[role="img"]')).map(function(s) { return s.getAttribute('aria-label') || ''; }),
+            avis: Array.from(carte.querySelectorAll('span')).map(function(s) { return s.innerText || ''; })
+                .filter(function(t) { return t.indexOf('(') !== -1; }),
+            sites: Array.from(carte.querySelectorAll(
+                'a[data-value="Site Web"], a[data-value="Website"], a[aria-label*="site Web"], a[aria-label*="Website"]'
+            )).map(function(a) { return a.href || ''; }),
+            telephones: Array.from(carte.querySelectorAll('span.UsdlK, a[href^="tel:"]')).map(function(s) {
+                return (s.getAttribute('href') || '') + ' ' + txt(s);
+            }),
+            lignes: Array.from(carte.querySelectorAll('div.W4Efsd, div[class*="W4Efsd"]')).map(txt)
+        };
+    } catch (err) {
+        return null;
+    }
+});
+"""
+
+# Mots qui indiquent un faux nom (titre de liste, pub...)
+NOMS_INVALIDES = ['résultats', 'results', 'sponsorisé', 'sponsored', 'pereira', '']
+
+# Domaines à ne jamais prendre comme site web de l'artisan
+DOMAINES_EXCLUS = ['google.com', 'maps', 'goo.gl', 'googleapis.com', 'aclk']
+
+_RE_TEL_INTERNATIONAL = re.compile(r'\+33\s*([1-9]\s*(?:\d{2}\s*){4})|0\s*[1-9](?:\s*\d{2}){4}')
+_RE_TEL_PERMISSIF = re.compile(r'(\+33|0)[\s\-\.]?([1-9][\s\-\.]?\d{2}[\s\-\.]?\d{2}[\s\-\.]?\d{2}[\s\-\.]?\d{2})')
+_RE_STATUT_OUVERTURE = re.compile(r'\s*(Closed|Closes|Closes soon|Fermé|Fermée|Ouvert|Open|Opens|Opening|Soon)\s*', re.IGNORECASE)
+
+
+def nettoyer_nom(nom: Optional[str]) -> Optional[str]:
+    """Nettoie un nom d'établissement (emojis de badge, libellés génériques)"""
+    if not nom:
+        return None
+    nom = nom.replace('🏅', '').replace('📌', '').replace('⭐', '').strip()
+    if nom.lower() in NOMS_INVALIDES or len(nom) <= 2:
+        return None
+    return nom
+
+
+def nom_depuis_url(url: Optional[str]) -> Optional[str]:
+    """Extrait le nom depuis une URL /maps/place/<Nom>/..."""
+    if not url or '/maps/place/' not in url:
+        return None
+    try:
+        return nettoyer_nom(unquote(url.split('/maps/place/')[1].split('/')[0].replace('+', ' ')))
+    except Exception:
+        return None
+
+
+def est_site_valide(href: Optional[str]) -> bool:
+    """True si le lien est un vrai site web (pas un lien Google/pub)"""
+    if not href or not ('http://' in href or 'https://' in href):
+        return False
+    href_lower = href.lower()
+    return not any(domaine in href_lower for domaine in DOMAINES_EXCLUS)
+
+
+def extraire_telephone(textes: List[str], normaliser: Callable[[str], Optional[str]]) -> Optional[str]:
+    """Cherche le premier numéro français valide dans une liste de textes (aria-label, texte de bouton)"""
+    for texte in textes:
+        if not texte:
+            continue
+        for pattern in (_RE_TEL_INTERNATIONAL, _RE_TEL_PERMISSIF):
+            match = pattern.search(texte)
+            if not match:
+                continue
+            tel_brut = match.group(0).replace(' ', '').replace('-', '').replace('.', '').replace('+33', '0')
+            tel_clean = ''.join(filter(str.isdigit, tel_brut))
+            if len(tel_clean) == 10 and tel_clean.startswith('0'):
+                tel_normalise = normaliser(tel_clean)
+                if tel_normalise:
+                    return tel_normalise
+    return None
+
+
+def nettoyer_adresse(adresse_brute: str) -> str:
+    """Enlève les statuts d'ouverture, les sauts de ligne et les espaces multiples"""
+    adresse = adresse_brute.replace('Adresse: ', '').replace('Address: ', '').strip()
+    adresse = _RE_STATUT_OUVERTURE.sub('', adresse)
+    adresse = re.sub(r'\s*\n\s*', ' ', adresse)
+    return re.sub(r'\s+', ' ', adresse).strip()
+
+
+def completer_localisation(info: Dict):
+    """Remplit code_postal / departement / ville depuis info['adresse']"""
+    adresse = info.get('adresse')
+    if not adresse:
+        return
+    cp_match = re.search(r'\b(\d{5})\b', adresse)
+    if cp_match:
+        info['code_postal'] = cp_match.group(1)
+        info['departement'] = cp_match.group(1)[:2]
+    ville_match = re.search(r'\d{5}\s+(.+)', adresse)
+    if ville_match:
+        ville = re.sub(r'\s*(France|FR|FRANCE|Closed|Fermé|Fermée)\s*$', '', ville_match.group(1).strip(), flags=re.IGNORECASE).strip()
+        if ville:
+            info['ville'] = ville
+
+
+def extraire_note_avis(notes: List[str], avis: List[str]) -> tuple:
+    """
+    Extrait (note, nb_avis) depuis les aria-labels d'étoiles et les textes d'avis
+
+    Le premier élément est pris en priorité pour éviter la contamination par d'autres fiches.
+    """
+    note = None
+    nb_avis = None
+    for label in notes:
+        note_match = re.search(r'(\d+[,\.]\d+)', label or '')
+        avis_match = re.search(r'(\d[\d\s ]*)\s*(?:avis?|reviews?)', label or '', re.I)
+        if note_match and note is None:
+            note = float(note_match.group(1).replace(',', '.'))
+        if avis_match and nb_avis is None:
+            nb_avis = int(re.sub(r'\D', '', avis_match.group(1)))
+        if note is not None and nb_avis is not None:
+            break
+    if nb_avis is None:
+        for texte in avis:
+            match = re.search(r'\(([\d\s ]+)\)', texte or '') or re.search(r'(\d[\d\s ]*)\s*(?:avis?|reviews?)', texte or '', re.I)
+            if match:
+                valeur = int(re.sub(r'\D', '', match.group(1)) or 0)
+                if valeur > 0:
+                    nb_avis = valeur
+                    break
+    return note, nb_avis
+
+
+def parser_etat_panneau(etat: Dict, normaliser_telephone: Callable[[str], Optional[str]],
+                        nom_attendu: Optional[str] = None, url_carte: Optional[str] = None) -> Dict:
+    """
+    Construit le dict `info` (même format que _extraire_donnees_depuis_panneau) depuis l'état brut
+
+    Args:
+        etat: Dict retourné par PANNEAU_JS
+        normaliser_telephone: GoogleMapsScraper._normaliser_telephone
+        nom_attendu: Nom lu sur la carte de la liste (fallback)
+        url_carte: href /maps/place/ de la carte cliquée (prioritaire sur l'URL courante)
+    """
+    info = {
+        'nom': None,
+        'google_maps_url': None,
+        'telephone': None,
+        'site_web': None,
+        'adresse': None,
+        'code_postal': None,
+        'ville': None,
+        'note': None,
+        'nb_avis': None
+    }
+    etat = etat or {}
+
+    url_courante = etat.get('url') or ''
+    if url_carte and '/maps/place/' in url_carte:
+        info['google_maps_url'] = url_carte
+    elif '/maps/place/' in url_courante:
+        info['google_maps_url'] = url_courante
+
+    info['nom'] = (nettoyer_nom(etat.get('titre')) or nettoyer_nom(nom_attendu)
+                   or nom_depuis_url(url_courante) or nettoyer_nom(etat.get('aria_panneau')))
+
+    info['telephone'] = extraire_telephone(etat.get('telephones') or [], normaliser_telephone)
+    if not info['telephone']:
+        for href in etat.get('liens_tel') or []:
+            tel = normaliser_telephone(href.replace('tel:', '').replace(' ', '').replace('+33', '0'))
+            if tel:
+                info['telephone'] = tel
+                break
+
+    for href in etat.get('sites') or []:
+        if est_site_valide(href):
+            info['site_web'] = href
+            break
+
+    for label in etat.get('adresses') or []:
+        if label and ('Adresse' in label or 'Address' in label or re.search(r'\b\d{5}\b', label)):
+            info['adresse'] = nettoyer_adresse(label)
+            break
+    completer_localisation(info)
+
+    info['note'], info['nb_avis'] = extraire_note_avis(etat.get('notes') or [], etat.get('avis') or [])
+    # ✅ VALIDATION : une note sans nombre d'avis -> 0 avis (même règle que l'extraction classique)
+    if info['note'] and not info['nb_avis']:
+        info['nb_avis'] = 0
+
+    if etat.get('categorie'):
+        info['categorie'] = etat['categorie']
+
+    return info
+
+
+
+def parser_carte(etat: Dict, normaliser_telephone: Callable[[str], Optional[str]]) -> Dict:
+    """
+    Construit le dict `info` (même format que parser_etat_panneau) depuis une carte de la liste
+
+    Les cartes donnent nom, note, nombre d'avis, catégorie et souvent téléphone / site web ;
+    l'adresse n'y est qu'abrégée (pas de code postal), elle n'est donc pas reprise.
+
+    Args:
+        etat: Un élément de la liste retournée par CARTES_JS
+        normaliser_telephone: GoogleMapsScraper._normaliser_telephone
+    """
+    info = {
+        'nom': None,
+        'google_maps_url': None,
+        'telephone': None,
+        'site_web': None,
+        'adresse': None,
+        'code_postal': None,
+        'ville': None,
+        'note': None,
+        'nb_avis': None
+    }
+    etat = etat or {}
+    href = etat.get('href') or ''
+    if '/maps/place/' in href:
+        info['google_maps_url'] = href
+
+    info['nom'] = nettoyer_nom(etat.get('titre')) or nettoyer_nom(etat.get('aria')) or nom_depuis_url(href)
+
+    lignes = [l for l in (etat.get('lignes') or []) if l]
+    info['telephone'] = extraire_telephone((etat.get('telephones') or []) + lignes, normaliser_telephone)
+
+    for site in etat.get('sites') or []:
+        if est_site_valide(site):
+            info['site_web'] = site
+            break
+
+    info['note'], info['nb_avis'] = extraire_note_avis(etat.get('notes') or [], etat.get('avis') or [])
+    if info['note'] and not info['nb_avis']:
+        info['nb_avis'] = 0
+
+    # Catégorie : premier segment "Plombier · 12 rue ..." (après la ligne note/avis éventuelle)
+    for ligne in lignes:
+        segment = ligne.split('·')[0].strip()
+        if (segment and not re.search(r'\d', segment) and len(segment) > 2
+                and not _RE_STATUT_OUVERTURE.fullmatch(segment)):
+            info['categorie'] = segment
+            break
+
+    return info
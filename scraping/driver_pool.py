@@ -0,0 +1,169 @@
+"""
+Pool de navigateurs Chrome pour le scraping Google Maps
+Chaque thread de travail garde UN navigateur chaud qu'il réutilise de ville en ville,
+avec contrôle de santé et recyclage après N tâches.
+"""
+import threading
+import logging
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _SlotDriver:
+    """Navigateur attaché à un thread de travail"""
+
+    def __init__(self, driver, numero: int):
+        self.driver = driver
+        self.numero = numero  # Numéro stable du worker (0, 1, 2...)
+        self.taches = 0
+
+
+class DriverPool:
+    """
+    Pool de drivers Selenium : un navigateur persistant par thread de travail
+
+    Le pool ne sait pas créer un navigateur lui-même : c'est le scraper qui lui passe
+    sa fabrique (GoogleMapsScraper._creer_driver) au moment de l'emprunt.
+    """
+
+    def __init__(self, max_taches_par_driver: int = 30):
+        """
+        Args:
+            max_taches_par_driver: Nombre de tâches (villes) avant de recycler le navigateur
+                                   (limite les fuites mémoire de Google Maps)
+        """
+        self.max_taches_par_driver = max(1, int(max_taches_par_driver))
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._slots: Dict[int, _SlotDriver] = {}
+        self._prochain_numero = 0
+        self.drivers_crees = 0
+        self.drivers_recycles = 0
+
+    def _numero_worker(self) -> int:
+        """Retourne le numéro stable du thread courant dans le pool"""
+        numero = getattr(self._local, 'numero', None)
+        if numero is None:
+            with self._lock:
+                numero = self._prochain_numero
+                self._prochain_numero += 1
+            self._local.numero = numero
+        return numero
+
+    def numero_worker(self) -> int:
+        """Numéro du worker courant (utile pour isoler des ressources par thread)"""
+        return self._numero_worker()
+
+    def _est_sain(self, driver) -> bool:
+        """Contrôle de santé : le navigateur répond-il encore ?"""
+        try:
+            driver.execute_script("return 1")
+            return len(driver.window_handles) > 0
+        except Exception:
+            return False
+
+    def _fermer_onglets_supplementaires(self, driver):
+        """Ne garder qu'un seul onglet avant de rendre le navigateur"""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+        except Exception as e:
+            logger.debug(f"Erreur fermeture onglets: {e}")
+
+    def acquerir(self, creer_driver: Callable[[], Optional[object]]):
+        """
+        Emprunte le navigateur du thread courant (le crée ou le recrée si nécessaire)
+
+        Args:
+            creer_driver: Fabrique qui lance un nouveau Chrome (retourne None si échec)
+
+        Returns:
+            Driver Selenium ou None si le lancement a échoué
+        """
+        ident = threading.get_ident()
+        slot = self._slots.get(ident)
+
+        if slot and not self._est_sain(slot.driver):
+            logger.warning(f"♻️ Worker {slot.numero}: navigateur ne répond plus, recréation...")
+            self._quitter(slot)
+            slot = None
+
+        if slot is None:
+            driver = creer_driver()
+            if driver is None:
+                return None
+            slot = _SlotDriver(driver, self._numero_worker())
+            with self._lock:
+                self._slots[ident] = slot
+                self.drivers_crees += 1
+            logger.info(f"🚀 Worker {slot.numero}: nouveau navigateur dans le pool")
+        else:
+            logger.info(f"♻️ Worker {slot.numero}: réutilisation du navigateur chaud ({slot.taches} tâches)")
+
+        return slot.driver
+
+    def liberer(self, driver, sain: bool = True):
+        """
+        Rend le navigateur au pool après une tâche
+
+        Args:
+            driver: Driver emprunté via acquerir()
+            sain: False pour forcer la fermeture (erreur, arrêt utilisateur)
+        """
+        ident = threading.get_ident()
+        slot = self._slots.get(ident)
+        if slot is None or slot.driver is not driver:
+            # Driver inconnu du pool : le fermer simplement
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            return
+
+        slot.taches += 1
+        if not sain or slot.taches >= self.max_taches_par_driver:
+            raison = "arrêt/erreur" if not sain else f"{slot.taches} tâches"
+            logger.info(f"♻️ Worker {slot.numero}: recyclage du navigateur ({raison})")
+            self._quitter(slot)
+            with self._lock:
+                self.drivers_recycles += 1
+            return
+
+        self._fermer_onglets_supplementaires(driver)
+
+    def est_chaud(self, driver) -> bool:
+        """True si ce navigateur a déjà servi au moins une tâche (consentement déjà passé, etc.)"""
+        slot = self._slots.get(threading.get_ident())
+        return bool(slot and slot.driver is driver and slot.taches > 0)
+
+    def _quitter(self, slot: _SlotDriver):
+        """Ferme un navigateur et le retire du pool"""
+        try:
+            slot.driver.quit()
+        except Exception as e:
+            logger.debug(f"Erreur fermeture driver du pool: {e}")
+        with self._lock:
+            for ident, s in list(self._slots.items()):
+                if s is slot:
+                    del self._slots[ident]
+
+    def fermer_tout(self):
+        """Ferme tous les navigateurs du pool (fin de run)"""
+        with self._lock:
+            slots = list(self._slots.values())
+        for slot in slots:
+            self._quitter(slot)
+        logger.info(f"🔒 Pool fermé ({self.drivers_crees} navigateurs créés, {self.drivers_recycles} recyclés)")
+
+    def stats(self) -> Dict:
+        """Statistiques du pool"""
+        return {
+            'actifs': len(self._slots),
+            'crees': self.drivers_crees,
+            'recycles': self.drivers_recycles,
+            'max_taches_par_driver': self.max_taches_par_driver,
+        }
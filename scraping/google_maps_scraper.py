@@ -4,10 +4,9 @@ Extrait : nom, téléphone, site web, adresse, note, avis
 MÉTHODE URL DIRECTE : Utilise https://www.google.com/maps/search/{REQUÊTE}
 """
 import time
-import random
 import re
 import logging
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 from urllib.parse import quote, unquote
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -18,6 +17,24 @@ from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
 from webdriver_manager.chrome import ChromeDriverManager
 
+from scraping.dom_snapshot import (
+    CARTES_JS, PANNEAU_JS, extraire_note_avis, nom_depuis_url, parser_carte, parser_etat_panneau
+)
+from scraping.waits import MoteurAttente, HORS_CONSENTEMENT, PANNEAU_RESULTATS_PRESENT
+from scraping.place_ids import cle_fiche
+from scraping import instrumentation
+from scraping.instrumentation import Chronometre
+from scraping.adaptive import ControleurDelais, controleur_par_defaut
+from scraping.selector_stats import stats_selecteurs
+from scraping.xhr_capture import CaptureRecherche
+from scraping.memory_watchdog import SurveillanceMemoire
+from scraping.rate_limit import RegulateurGoogle, est_page_blocage
+from scraping.tile_planner import url_recherche_position
+from scraping.chrome_profile import chemin_chromedriver, dossier_profil, invalider_cache_chromedriver
+from scraping.network_blocking import (
+    CompteurReseau, activer_journal_performance, appliquer_blocage, decoder_journal_performance, motifs_configures
+)
+
 # ✅ Réduire les logs pour améliorer les performances (sauf sur GitHub Actions)
 import os
 is_github_env = os.getenv('GITHUB_ACTIONS') is not None
@@ -53,21 +70,75 @@ requests_logger.setLevel(wdm_logging.CRITICAL)
 requests_logger.disabled = True
 
 
+# Racine Google Maps par défaut (surchargeable pour pointer vers le serveur de fixtures)
+URL_MAPS = "https://www.google.com/maps"
+
+
 class GoogleMapsScraper:
     """
     Scraper Google Maps pour extraire les informations des artisans
     """
     
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, driver_pool=None, extraction_mode: str = 'snapshot',
+                 nb_onglets: int = 3, places_connues: Optional[set] = None, callback_place_connue=None,
+                 controleur_delais: Optional[ControleurDelais] = None, base_url: str = URL_MAPS,
+                 regulateur: Optional[RegulateurGoogle] = None):
         """
         Initialise le scraper Google Maps
         
         Args:
             headless: Mode headless (True) ou visible (False)
+            driver_pool: DriverPool optionnel (scraping/driver_pool.py) pour réutiliser
+                         un navigateur chaud par thread au lieu d'en lancer un par ville
+            extraction_mode: 'snapshot' (état du panneau lu en un seul execute_script,
+                             repli automatique sur l'extraction classique), 'classique',
+                             'onglets' (URLs des fiches ouvertes directement dans plusieurs onglets),
+                             'rapide' (alias 'fast' : toutes les cartes de la liste lues en un seul
+                             passage, panneau de détail ouvert seulement s'il manque téléphone ou site),
+                             ou 'xhr' (fiches décodées depuis les réponses JSON de recherche capturées
+                             pendant le scroll, panneau de détail en repli pour les fiches non capturées)
+            nb_onglets: Nombre d'onglets utilisés en mode 'onglets'
+            places_connues: Set de clés de fiches déjà en base (whatsapp_database.queries.get_known_place_ids) :
+                            ces fiches ne sont pas rouvertes. Le set est complété au fil du scraping
+                            (peut être partagé entre threads pour éviter les doublons entre villes voisines)
+            callback_place_connue: Si fourni, appelé avec (place_id, info_carte) pour un rafraîchissement
+                                   léger (note/avis lus sur la carte, sans clic) des fiches connues
+            controleur_delais: ControleurDelais (scraping/adaptive.py) à partager entre scrapers pour
+                               garder les latences apprises d'une ville à l'autre (sinon un par scraper)
+            base_url: Racine Google Maps (ex : http://127.0.0.1:8765/maps pour le serveur de fixtures
+                      hors ligne scripts/serveur_fixtures_maps.py)
+            regulateur: RegulateurGoogle (scraping/rate_limit.py) partagé entre workers : débit maximal
+                        de recherches et pause commune dès qu'un worker voit une page de blocage
         """
         self.headless = headless
+        self.driver_pool = driver_pool
+        self.base_url = base_url.rstrip('/')
+        self.extraction_mode = 'rapide' if extraction_mode == 'fast' else extraction_mode
+        self.nb_onglets = max(1, int(nb_onglets))
+        self.places_connues = places_connues if places_connues is not None else set()
+        self.callback_place_connue = callback_place_connue
+        self.nb_places_connues = 0
+        self.nb_scrolls = 0
         self.driver = None
         self.wait = None
+        self.attente = None
+        # ✅ Blocage réseau CDP (tuiles, polices, images, analytics) + bilan des requêtes évitées
+        self.motifs_bloques = motifs_configures()
+        self.compteur_reseau = CompteurReseau()
+        self.stats_reseau: Dict = {}
+        # ✅ Capture des réponses JSON de recherche (mode 'xhr')
+        self.capture_xhr: Optional[CaptureRecherche] = None
+        # ✅ Mémoire de Chrome surveillée : recyclage + reprise au-delà de SCRAPER_MAX_RSS_MB
+        self.surveillance_memoire = SurveillanceMemoire()
+        # ✅ Débit de recherches et disjoncteur anti-blocage partagés entre workers
+        self.regulateur = regulateur
+        self.bloque = False
+        # ✅ Recherche non lancée : attente anti-blocage abandonnée (budget de temps du run épuisé)
+        self.abandonne = False
+        # Position de la tuile en cours (recherche par coordonnées + zoom), None = recherche par ville
+        self.position_recherche: Optional[Dict] = None
+        # ✅ Timeline par étape (persistée par l'appelant dans scraping_timings)
+        self.chrono = Chronometre()
         self.is_running = True  # Par défaut, on est prêt à scraper
         self.scraped_count = 0
         # ✅ Stocker la recherche et la ville pour les utiliser dans les méthodes d'extraction
@@ -78,20 +149,140 @@ class GoogleMapsScraper:
         import os
         self.is_github_actions = os.getenv('GITHUB_ACTIONS') is not None
         
-        # ✅ Multiplicateurs de timeout/delay pour GitHub Actions (plus lent)
+        # ✅ Multiplicateurs de timeout/delay ajustés d'après la latence mesurée (plus de 3x fixe)
         # Ces valeurs n'affectent QUE les timeouts, pas la logique
+        self.controleur_delais = controleur_delais or controleur_par_defaut(self.is_github_actions)
         if self.is_github_actions:
-            self.timeout_multiplier = 3.0  # Timeouts triplés (augmenté de 2.0 à 3.0)
-            self.delay_multiplier = 3.0    # Delays triplés (augmenté de 2.0 à 3.0)
-            logger.info("🔧 Mode GitHub Actions détecté - timeouts/delays triplés")
-            logger.info(f"   ⏱️ Timeout multiplier: {self.timeout_multiplier}x")
-            logger.info(f"   ⏱️ Delay multiplier: {self.delay_multiplier}x")
+            logger.info("🔧 Mode GitHub Actions détecté - timeouts/delays adaptatifs")
+            logger.info(f"   ⏱️ Multiplicateur de départ: {self.timeout_multiplier:.2f}x")
+    
+    @property
+    def timeout_multiplier(self) -> float:
+        """Multiplicateur des timeouts (ajusté en continu par le ControleurDelais)"""
+        return self.controleur_delais.multiplicateur
+    
+    @property
+    def delay_multiplier(self) -> float:
+        """Multiplicateur des délais (même valeur que les timeouts)"""
+        return self.controleur_delais.multiplicateur
+        
+    def _setup_driver(self, conserver_compteurs: bool = False):
+        """
+        Configure et lance Chrome avec Selenium (ou emprunte un navigateur du pool)
+        
+        Args:
+            conserver_compteurs: Garder le bilan réseau et les compteurs d'attente en cours
+                                 (recyclage au milieu d'un scraping)
+        """
+        if self.driver_pool is not None:
+            self.driver = self.driver_pool.acquerir(self._creer_driver)
+        else:
+            self.driver = self._creer_driver()
+        
+        if not self.driver:
+            return False
+        
+        # Timeout plus long pour les pages lentes
+        self.wait = WebDriverWait(self.driver, 20)
+        # Attentes sur conditions DOM (remplacent les time.sleep fixes)
+        ancienne_attente = self.attente if conserver_compteurs else None
+        self.attente = MoteurAttente(self.driver, observateur=self.controleur_delais.observer)
+        if ancienne_attente is not None:
+            self.attente.nb_attentes = ancienne_attente.nb_attentes
+            self.attente.nb_timeouts = ancienne_attente.nb_timeouts
+            self.attente.historique = ancienne_attente.historique
+        # Vider le journal réseau laissé par la tâche précédente (navigateur du pool)
+        self._lire_journal_performance(compter=False)
+        if not conserver_compteurs:
+            self.compteur_reseau.reinitialiser()
+        return True
+    
+    def _lire_journal_performance(self, compter: bool = True) -> List[Dict]:
+        """
+        Vide le journal de performance Chrome (événements CDP Network.*)
+        
+        À appeler régulièrement : Chrome garde les entrées en mémoire tant qu'elles ne sont pas lues.
+        
+        Args:
+            compter: Alimenter le compteur réseau (False pour simplement purger)
+        
+        Returns:
+            Messages CDP décodés {'method': ..., 'params': ...}
+        """
+        if not self.driver or not self._journal_actif():
+            return []
+        try:
+            messages = decoder_journal_performance(self.driver.get_log('performance'))
+        except Exception as e:
+            logger.debug(f"Journal de performance indisponible: {e}")
+            return []
+        if compter:
+            for message in messages:
+                self.compteur_reseau.traiter(message)
+            if self.capture_xhr is not None:
+                self.capture_xhr.traiter(messages)
+        return messages
+    
+    def _journal_actif(self) -> bool:
+        """Le journal de performance sert au bilan du blocage réseau et à la capture XHR"""
+        return bool(self.motifs_bloques) or self.extraction_mode == 'xhr'
+    
+    def _liberer_driver(self, sain: bool = True):
+        """Rend le navigateur au pool, ou le ferme s'il n'y a pas de pool"""
+        if not self.driver:
+            return
+        if self.driver_pool is not None:
+            self.driver_pool.liberer(self.driver, sain=sain)
         else:
-            self.timeout_multiplier = 1.0  # Pas de changement local
-            self.delay_multiplier = 1.0    # Pas de changement local
+            self.driver.quit()
+        self.driver = None
+    
+    def _signaler_si_bloque(self) -> bool:
+        """
+        Vérifie si Google affiche une page de blocage (unusual traffic / captcha)
+        
+        Si oui, le régulateur partagé est prévenu : tous les workers se mettent en pause.
+        """
+        try:
+            url = self.driver.current_url
+            texte = self.driver.execute_script(
+                "return (document.body ? document.body.innerText : '').slice(0, 3000);"
+            )
+        except Exception:
+            return False
+        if not est_page_blocage(url, texte):
+            return False
+        logger.error("   ❌ Google Maps a détecté l'automatisation (CAPTCHA/blocage)")
+        self.bloque = True
+        if self.regulateur is not None:
+            self.regulateur.signaler_blocage(f"{self.current_recherche} à {self.current_ville}")
+        return True
+    
+    def _recycler_navigateur(self) -> bool:
+        """Ferme le navigateur devenu trop gros et en lance un neuf (même pool, même réglages)"""
+        self.surveillance_memoire.nb_recyclages += 1
+        logger.info(f"♻️ Recyclage du navigateur ({self.surveillance_memoire.derniere_mesure_mo:.0f} Mo)...")
+        # Compter ce que l'ancien navigateur a encore dans son journal avant de le fermer
+        self._lire_journal_performance()
+        try:
+            self._liberer_driver(sain=False)
+        except Exception as e:
+            logger.debug(f"Erreur fermeture navigateur à recycler: {e}")
+        self.driver = None
+        # Le bilan réseau de la ville continue sur le nouveau navigateur
+        if not self._setup_driver(conserver_compteurs=True):
+            logger.error("❌ Impossible de relancer un navigateur après recyclage")
+            return False
+        if self.capture_xhr is not None:
+            self.capture_xhr.driver = self.driver
+        return True
+    
+    def _creer_driver(self):
+        """Configure et lance Chrome avec Selenium - VERSION ULTRA-ROBUSTE
         
-    def _setup_driver(self):
-        """Configure et lance Chrome avec Selenium - VERSION ULTRA-ROBUSTE"""
+        Returns:
+            Driver Chrome prêt, ou None si le lancement a échoué
+        """
         chrome_options = Options()
         
         # Anti-détection
@@ -151,70 +342,94 @@ class GoogleMapsScraper:
             chrome_options.add_argument('--headless=new')
             chrome_options.add_argument('--window-size=1920,1080')
         
+        # ✅ Journal réseau pour mesurer les requêtes bloquées (et capturer les réponses de recherche)
+        if self._journal_actif():
+            activer_journal_performance(chrome_options)
+        
+        # ✅ Profil persistant par worker : cookies de consentement gardés d'une session à l'autre
+        profil = dossier_profil(self.driver_pool.numero_worker() if self.driver_pool is not None else 'solo')
+        if profil:
+            chrome_options.add_argument(f'--user-data-dir={profil}')
+        
         try:
-            import platform
-            import os
-            
-            # ✅ Sur Linux (GitHub Actions), utiliser le ChromeDriver installé directement
-            # Sur Windows/Mac, utiliser ChromeDriverManager
-            if platform.system() == 'Linux' and os.path.exists('/usr/local/bin/chromedriver'):
-                # GitHub Actions : utiliser le ChromeDriver installé par le workflow
-                service = Service('/usr/local/bin/chromedriver')
-            elif platform.system() == 'Linux':
-                # Linux mais pas de ChromeDriver dans /usr/local/bin, essayer /usr/bin
-                if os.path.exists('/usr/bin/chromedriver'):
-                    service = Service('/usr/bin/chromedriver')
-                else:
-                    # Fallback : utiliser ChromeDriverManager
-                    service = Service(ChromeDriverManager().install())
-            else:
-                # Windows/Mac : utiliser ChromeDriverManager
-                # ✅ ChromeDriverManager détecte automatiquement la version de Chrome installée
-                # et télécharge la version compatible. Si le cache contient une ancienne version,
-                # ChromeDriverManager la détectera et téléchargera automatiquement la bonne version.
-                # Pas besoin de vider le cache manuellement - ChromeDriverManager gère cela.
-                try:
-                    driver_path = ChromeDriverManager().install()
-                    service = Service(driver_path)
-                except Exception as e:
-                    # Fallback : essayer sans cache
-                    logger.warning(f"⚠️ Erreur ChromeDriverManager: {e}, nouvelle tentative...")
-                    try:
-                        # Forcer le téléchargement en vidant le cache si possible
-                        import shutil
-                        cache_path = os.path.join(os.path.expanduser("~"), ".wdm", "drivers", "chromedriver")
-                        if os.path.exists(cache_path):
-                            try:
-                                # Supprimer seulement les anciennes versions (114.x)
-                                for item in os.listdir(cache_path):
-                                    item_path = os.path.join(cache_path, item)
-                                    if os.path.isdir(item_path) and item.startswith("114"):
-                                        try:
-                                            shutil.rmtree(item_path)
-                                        except:
-                                            pass
-                            except:
-                                pass
-                        driver_path = ChromeDriverManager().install()
-                        service = Service(driver_path)
-                    except Exception as e2:
-                        logger.error(f"❌ Erreur critique ChromeDriver: {e2}")
-                        raise
+            # ✅ Chemin du ChromeDriver résolu une fois puis mis en cache (mémoire + disque)
+            service = Service(chemin_chromedriver(self._resoudre_chromedriver))
             
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            try:
+                driver = webdriver.Chrome(service=service, options=chrome_options)
+            except Exception as e:
+                if not profil:
+                    raise
+                # Profil verrouillé par une autre instance Chrome : lancer sans profil persistant
+                logger.warning(f"⚠️ Profil Chrome indisponible ({str(e)[:80]}), lancement sans profil...")
+                chrome_options.arguments.remove(f'--user-data-dir={profil}')
+                driver = webdriver.Chrome(service=service, options=chrome_options)
             
             # Exécuter JS pour cacher webdriver
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            
+            # ✅ Bloquer tuiles/polices/images/analytics au niveau réseau
+            if appliquer_blocage(driver, self.motifs_bloques):
+                logger.info(f"🚫 Blocage réseau CDP actif ({len(self.motifs_bloques)} motifs)")
             
-            # Timeout plus long pour les pages lentes
-            self.wait = WebDriverWait(self.driver, 20)
             logger.info("✅ Chrome driver initialisé")
-            return True
+            return driver
         except Exception as e:
             logger.error(f"❌ Erreur initialisation Chrome: {e}")
             import traceback
             logger.error(traceback.format_exc())
-            return False
+            # Driver en cache incompatible (Chrome mis à jour) : re-résoudre au prochain lancement
+            if 'session not created' in str(e).lower() or 'version' in str(e).lower():
+                invalider_cache_chromedriver()
+            return None
+    
+    def _resoudre_chromedriver(self) -> str:
+        """Résolution complète du chemin ChromeDriver (appelée seulement si rien n'est en cache)"""
+        import platform
+        import os
+        
+        # ✅ Sur Linux (GitHub Actions), utiliser le ChromeDriver installé directement
+        # Sur Windows/Mac, utiliser ChromeDriverManager
+        if platform.system() == 'Linux' and os.path.exists('/usr/local/bin/chromedriver'):
+            # GitHub Actions : utiliser le ChromeDriver installé par le workflow
+            return '/usr/local/bin/chromedriver'
+        elif platform.system() == 'Linux':
+            # Linux mais pas de ChromeDriver dans /usr/local/bin, essayer /usr/bin
+            if os.path.exists('/usr/bin/chromedriver'):
+                return '/usr/bin/chromedriver'
+            # Fallback : utiliser ChromeDriverManager
+            return ChromeDriverManager().install()
+        
+        # Windows/Mac : utiliser ChromeDriverManager
+        # ✅ ChromeDriverManager détecte automatiquement la version de Chrome installée
+        # et télécharge la version compatible. Si le cache contient une ancienne version,
+        # ChromeDriverManager la détectera et téléchargera automatiquement la bonne version.
+        # Pas besoin de vider le cache manuellement - ChromeDriverManager gère cela.
+        try:
+            return ChromeDriverManager().install()
+        except Exception as e:
+            # Fallback : essayer sans cache
+            logger.warning(f"⚠️ Erreur ChromeDriverManager: {e}, nouvelle tentative...")
+            try:
+                # Forcer le téléchargement en vidant le cache si possible
+                import shutil
+                cache_path = os.path.join(os.path.expanduser("~"), ".wdm", "drivers", "chromedriver")
+                if os.path.exists(cache_path):
+                    try:
+                        # Supprimer seulement les anciennes versions (114.x)
+                        for item in os.listdir(cache_path):
+                            item_path = os.path.join(cache_path, item)
+                            if os.path.isdir(item_path) and item.startswith("114"):
+                                try:
+                                    shutil.rmtree(item_path)
+                                except:
+                                    pass
+                    except:
+                        pass
+                return ChromeDriverManager().install()
+            except Exception as e2:
+                logger.error(f"❌ Erreur critique ChromeDriver: {e2}")
+                raise
     
     def _normaliser_telephone(self, tel: str) -> Optional[str]:
         """
@@ -318,31 +533,124 @@ class GoogleMapsScraper:
             logger.debug(f"Erreur extraction nb_avis: {e}")
         return None
     
-    def _scroller_panneau_lateral(self, max_scrolls: int = 50, selector: str = 'div[role="feed"]'):  # ✅ Augmenté de 15 à 50 par défaut
+    def _scroller_page(self, max_scrolls: int, objectif: Optional[int] = None, patience: int = 3) -> int:
+        """
+        Repli quand aucun panneau scrollable n'est trouvé : scroll de la page entière
+        
+        Mêmes règles d'arrêt que le scroll du panneau (objectif, fin de liste, patience) ; chaque scroll
+        attend l'arrivée de nouvelles cartes au lieu d'un délai fixe.
+        
+        Returns:
+            Nombre de scrolls réellement effectués
+        """
+        return self._boucle_scroll("window.scrollTo(0, document.body.scrollHeight);", None,
+                                   max_scrolls, objectif, patience, "scrolls de page")
+    
+    def _boucle_scroll(self, script_scroll: str, panneau, max_scrolls: int, objectif: Optional[int],
+                       patience: int, libelle: str) -> int:
+        """
+        Boucle de scroll commune (panneau latéral ou page entière)
+        
+        - objectif : compté sur les fiches uniques hors places connues (celles qui restent à extraire)
+        - patience : compté sur les fiches uniques toutes confondues ; une liste qui ne montre que des
+          fiches déjà connues continue donc de défiler tant qu'elle grandit
+        
+        Args:
+            script_scroll: JS qui fait défiler (`panneau` = arguments[0])
+        """
+        nb_liens_lus = 0  # Liens déjà examinés (les nouvelles cartes s'ajoutent en fin de liste)
+        cles_vues = set()
+        cles_nouvelles = set()
+        sans_nouveaute = 0
+        scrolls = 0
+        raison_arret = f"max_scrolls={max_scrolls} atteint"
+        
+        while scrolls < max_scrolls:
+            # Un aller-retour : scroll + hrefs des cartes apparues depuis le dernier tour + marqueur de fin
+            etat = self.driver.execute_script("""
+                var panneau = arguments[0];
+                """ + script_scroll + """
+                var liens = document.querySelectorAll('a[href*="/maps/place/"]');
+                var fin = document.querySelector('span.HlvSq, p.fontBodyMedium > span > span');
+                var texte = fin ? (fin.innerText || '').toLowerCase() : '';
+                return {
+                    nb: liens.length,
+                    nouveaux: Array.from(liens).slice(arguments[1]).map(function(a) { return a.href; }),
+                    fin: texte.indexOf('fin de la liste') !== -1 || texte.indexOf('end of the list') !== -1
+                };
+            """, panneau, nb_liens_lus) or {}
+            
+            nb_vues_avant = len(cles_vues)
+            for href in etat.get('nouveaux') or []:
+                cle = cle_fiche(href)
+                if not cle:
+                    continue
+                cles_vues.add(cle)
+                if cle not in self.places_connues:
+                    cles_nouvelles.add(cle)
+            nb_liens_lus = max(nb_liens_lus, etat.get('nb') or 0)
+            
+            if objectif and len(cles_nouvelles) >= objectif:
+                raison_arret = f"objectif atteint ({len(cles_nouvelles)}/{objectif} fiches nouvelles)"
+                break
+            if etat.get('fin'):
+                raison_arret = "fin de la liste affichée"
+                break
+            
+            if scrolls > 0 and len(cles_vues) == nb_vues_avant:
+                sans_nouveaute += 1
+                if sans_nouveaute >= patience:
+                    raison_arret = f"{patience} scrolls sans nouvelle fiche"
+                    break
+            else:
+                sans_nouveaute = 0
+            
+            # ✅ Attendre que de nouvelles cartes arrivent (ou la fin de liste) au lieu d'un délai fixe
+            self.attente.attendre_liste_grandit(nb_liens_lus, timeout=3.0 * self.timeout_multiplier)
+            scrolls += 1
+            # Mode xhr : lire les réponses de recherche tant que Chrome garde leur corps
+            if self.capture_xhr is not None:
+                self._lire_journal_performance()
+        
+        logger.info(f"📜 {scrolls} {libelle} ({raison_arret}) - {len(cles_vues)} fiches chargées, "
+                    f"{len(cles_nouvelles)} nouvelles")
+        return scrolls
+    
+    def _scroller_panneau_lateral(self, max_scrolls: int = 50, selector: str = 'div[role="feed"]',
+                                  objectif: Optional[int] = None, patience: int = 3) -> int:  # ✅ Augmenté de 15 à 50 par défaut
         """
         Scroll le panneau latéral pour charger plus de résultats
         
+        S'arrête dès que :
+        - `objectif` fiches uniques (hors places connues) sont chargées,
+        - le marqueur "fin de la liste" est affiché,
+        - ou `patience` scrolls consécutifs n'ont chargé aucune fiche de plus (connues comprises).
+        Le repli par scroll de page (aucun panneau scrollable) suit les mêmes règles.
+        
         Args:
             max_scrolls: Nombre maximum de scrolls à effectuer
             selector: Sélecteur CSS du panneau (par défaut 'div[role="feed"]')
+            objectif: Nombre de fiches nouvelles suffisant (ex: max_results), None = pas de limite
+            patience: Nombre de scrolls sans nouveauté avant d'abandonner
+        
+        Returns:
+            Nombre de scrolls réellement effectués
         """
+        scrolls = 0
         try:
             # Trouver le panneau de résultats avec le sélecteur fourni
             # Essayer plusieurs sélecteurs si celui fourni ne fonctionne pas
-            selecteurs_essai = [selector, 'div[role="feed"]', 'div[role="main"]', 'div[jsaction]']
-            panneau = None
-            selector_utilise = None
-            
-            for sel in selecteurs_essai:
-                try:
-                    panneau = WebDriverWait(self.driver, 10).until(  # Timeout augmenté à 10s
-                        EC.presence_of_element_located((By.CSS_SELECTOR, sel))
-                    )
-                    logger.info(f"   📜 Panneau trouvé pour scroll avec: {sel}")
-                    selector_utilise = sel
-                    break
-                except:
-                    continue
+            # (ordre appris : le sélecteur qui trouve le panneau d'habitude passe en premier)
+            selecteurs_essai = [selector] + [s for s in ['div[role="feed"]', 'div[role="main"]', 'div[jsaction]']
+                                             if s != selector]
+            selector_utilise, panneau = stats_selecteurs().essayer(
+                'panneau_scroll', selecteurs_essai,
+                lambda sel: WebDriverWait(self.driver, 10).until(  # Timeout augmenté à 10s
+                    EC.presence_of_element_located((By.CSS_SELECTOR, sel))
+                )
+            )
+            if panneau:
+                logger.info(f"   📜 Panneau trouvé pour scroll avec: {selector_utilise}")
             
             if not panneau:
                 logger.warning("⚠️ Panneau principal non trouvé, tentative avec méthode alternative...")
@@ -414,44 +722,12 @@ class GoogleMapsScraper:
                     else:
                         logger.warning("   ⚠️ Aucun sous-élément scrollable trouvé, utilisation du scroll de page")
                         # Si aucun sous-élément scrollable, scroller la page entière
-                        last_height = self.driver.execute_script("return document.body.scrollHeight")
-                        scrolls = 0
-                        
-                        while scrolls < max_scrolls:
-                            # Scroller la page
-                            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                            time.sleep(0.5)  # ✅ OPTIMISATION MAX
-                            
-                            new_height = self.driver.execute_script("return document.body.scrollHeight")
-                            if new_height == last_height:
-                                logger.info(f"✅ Fin du scroll de page (hauteur stable après {scrolls} scrolls)")
-                                break
-                            
-                            last_height = new_height
-                            scrolls += 1
-                            time.sleep(random.uniform(0.5, 1))  # ✅ OPTIMISATION
-                        
-                        logger.info(f"📜 {scrolls} scrolls de page effectués")
-                        return
+                        return self._scroller_page(max_scrolls, objectif, patience)
                 except Exception as e:
                     logger.warning(f"   ⚠️ Erreur recherche sous-élément: {e}")
                     # Fallback : scroll de page
                     logger.info("   📜 Utilisation du scroll de page comme fallback")
-                    last_height = self.driver.execute_script("return document.body.scrollHeight")
-                    scrolls = 0
-                    
-                    while scrolls < max_scrolls:
-                        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                        time.sleep(2)
-                        new_height = self.driver.execute_script("return document.body.scrollHeight")
-                        if new_height == last_height:
-                            break
-                        last_height = new_height
-                        scrolls += 1
-                        time.sleep(random.uniform(0.5, 1))  # ✅ OPTIMISATION
-                    
-                    logger.info(f"📜 {scrolls} scrolls de page effectués")
-                    return
+                    return self._scroller_page(max_scrolls, objectif, patience)
             
             # ✅ DEBUG : Afficher le HTML après scroll initial
             try:
@@ -461,35 +737,8 @@ class GoogleMapsScraper:
                 pass
             
             # Le panneau est scrollable, utiliser la méthode normale
-            last_height = 0
-            scrolls = 0
-            
-            while scrolls < max_scrolls:
-                # Scroll vers le bas
-                self.driver.execute_script(
-                    "arguments[0].scrollTop = arguments[0].scrollHeight", panneau
-                )
-                
-                # ✅ OPTIMISATION MAX : Délai minimal entre scrolls
-                time.sleep(0.5)  # Réduit à 0.5s (minimum)
-                
-                # Vérifier si on a atteint la fin
-                new_height = self.driver.execute_script(
-                    "return arguments[0].scrollHeight", panneau
-                )
-                
-                if new_height == last_height:
-                    # Plus de nouveaux résultats
-                    logger.info(f"✅ Fin du scroll (hauteur stable après {scrolls} scrolls)")
-                    break
-                
-                last_height = new_height
-                scrolls += 1
-                
-                # ✅ OPTIMISATION MAX : Pause minimale entre scrolls
-                time.sleep(random.uniform(0.2, 0.4))  # Réduit à 0.2-0.4s (minimum)
-            
-            logger.info(f"📜 {scrolls} scrolls effectués")
+            scrolls = self._boucle_scroll("panneau.scrollTop = panneau.scrollHeight;", panneau,
+                                          max_scrolls, objectif, patience, "scrolls effectués")
             
             # ✅ DEBUG : Afficher le HTML après scroll complet
             try:
@@ -504,6 +753,7 @@ class GoogleMapsScraper:
             logger.error(f"❌ Erreur lors du scroll: {e}")
             import traceback
             logger.debug(traceback.format_exc())
+        return scrolls
     
     def _attendre_chargement_complet(self, timeout: int = 30) -> bool:
         """
@@ -571,9 +821,8 @@ class GoogleMapsScraper:
             if not element_found:
                 logger.warning("   ⚠️ Aucun élément JS détecté, mais continuation...")
             
-            # 5. Attendre que le DOM se stabilise (plus de changements)
-            # ✅ Optimisation : Réduire le délai de stabilisation
-            time.sleep(0.5)  # Réduit de 1s à 0.5s
+            # 5. Attendre que le panneau principal existe (plutôt qu'un délai de stabilisation fixe)
+            self.attente.attendre(PANNEAU_RESULTATS_PRESENT, timeout=2.0 * self.timeout_multiplier, nom='panneau_resultats')
             
             # 6. Vérifier que la page n'est plus en train de charger
             try:
@@ -654,7 +903,8 @@ class GoogleMapsScraper:
                             if btn.is_displayed() and btn.is_enabled():
                                 logger.info(f"   ✅ Bouton consentement trouvé, clic...")
                                 btn.click()
-                                time.sleep(0.5)  # ✅ OPTIMISATION MAX  # ✅ OPTIMISATION MAX : Réduit de 5s à 2s
+                                # ✅ Attendre la redirection vers Maps plutôt qu'un délai fixe
+                                self.attente.attendre(HORS_CONSENTEMENT, timeout=5.0 * self.timeout_multiplier, nom='consentement')
                                 
                                 # Vérifier qu'on est maintenant sur Google Maps
                                 new_url = self.driver.current_url.lower()
@@ -676,7 +926,8 @@ class GoogleMapsScraper:
                     continue
             
             if tentative < max_tentatives:
-                time.sleep(2)
+                # La redirection peut encore arriver : rendre la main dès que la page n'est plus le consentement
+                self.attente.attendre(HORS_CONSENTEMENT, timeout=2.0 * self.timeout_multiplier, nom='consentement')
                 continue
         
         logger.error("   ❌ Impossible d'accepter le consentement après 3 tentatives")
@@ -712,7 +963,6 @@ class GoogleMapsScraper:
                             elem.click()
                             popups_fermes += 1
                             logger.info(f"   ✅ Popup fermé ({selecteur[:30]}...)")
-                            time.sleep(0.5)
                     except:
                         pass
             except:
@@ -720,7 +970,8 @@ class GoogleMapsScraper:
         
         if popups_fermes > 0:
             logger.info(f"   ✅ {popups_fermes} popup(s) fermé(s)")
-            time.sleep(1)  # Laisser l'UI se stabiliser
+            # Laisser l'UI se stabiliser : attendre que le panneau principal soit de nouveau là
+            self.attente.attendre(PANNEAU_RESULTATS_PRESENT, timeout=2.0 * self.timeout_multiplier, nom='popups')
     
     def _trouver_barre_recherche_robuste(self):
         """
@@ -750,7 +1001,6 @@ class GoogleMapsScraper:
                 """)
             )
             logger.info("   ✅ Barre de recherche détectée dans le DOM (créée par JS)")
-            time.sleep(1)  # Petite pause pour stabilisation
         except TimeoutException:
             logger.warning("   ⚠️ Timeout attente barre de recherche, mais on continue...")
         
@@ -838,6 +1088,9 @@ class GoogleMapsScraper:
         ]
         
         # Essayer chaque méthode (avec timeout plus long car JS peut être lent)
+        # Ordre appris : la méthode qui a réussi aux runs précédents est essayée en premier
+        stats = stats_selecteurs()
+        methodes = stats.ordonner('barre_recherche', methodes, cle=lambda m: m['nom'])
         for idx, methode in enumerate(methodes, 1):
             try:
                 logger.info(f"   🔍 Tentative {idx}/10: {methode['nom']}...")
@@ -856,16 +1109,20 @@ class GoogleMapsScraper:
                             lambda d: search_box.is_displayed() and search_box.is_enabled()
                         )
                         logger.info(f"   ✅ SUCCÈS avec méthode: {methode['nom']}")
+                        stats.succes('barre_recherche', methode['nom'])
                         return search_box, methode['nom']
                     except:
                         logger.debug(f"   ⚠️ Élément trouvé mais pas encore interactif: {methode['nom']}")
+                        stats.echec('barre_recherche', methode['nom'])
                         continue
                 
             except TimeoutException:
                 logger.debug(f"   ⏱️  Timeout pour: {methode['nom']}")
+                stats.echec('barre_recherche', methode['nom'])
                 continue
             except Exception as e:
                 logger.debug(f"   ❌ Erreur pour: {methode['nom']} - {str(e)[:50]}")
+                stats.echec('barre_recherche', methode['nom'])
                 continue
         
         # Méthode 11 : JavaScript en dernier recours
@@ -934,6 +1191,97 @@ class GoogleMapsScraper:
         return None, None
     
     def _rechercher_etablissements(self, recherche: str, ville: str) -> tuple[bool, Optional[str]]:
+        """
+        Recherche sur Google Maps, du chemin le plus rapide au plus robuste :
+        1. Navigateur chaud (consentement déjà passé) : URL /maps/search/ directe, sans consentement ni popups
+        2. URL directe avec gestion complète (consentement, popups, panneau, relance)
+        3. Barre de recherche (saisie + Entrée) en dernier recours
+        
+        Returns:
+            (succès, sélecteur du panneau de résultats)
+        """
+        if self._navigateur_chaud():
+            with self.chrono.etape(instrumentation.ETAPE_RECHERCHE_RAPIDE):
+                ok, selector = self._rechercher_rapide(recherche, ville)
+            if ok:
+                return True, selector
+            logger.info("   ↩️ Chemin rapide en échec, recherche complète...")
+        
+        ok, selector = self._rechercher_par_url(recherche, ville)
+        if ok:
+            self._marquer_navigateur_chaud()
+            return True, selector
+        
+        logger.warning("   ⚠️ URL directe en échec, repli sur la barre de recherche...")
+        ok, selector = self._rechercher_par_barre(recherche, ville)
+        if ok:
+            self._marquer_navigateur_chaud()
+        return ok, selector
+    
+    def _navigateur_chaud(self) -> bool:
+        """True si ce navigateur a déjà réussi une recherche (consentement accepté, Maps chargé)"""
+        if not self.driver:
+            return False
+        if getattr(self.driver, '_maps_pret', False):
+            return True
+        return self.driver_pool is not None and self.driver_pool.est_chaud(self.driver)
+    
+    def _marquer_navigateur_chaud(self):
+        """Mémorise sur le driver lui-même que Maps est prêt (survit au passage par le pool)"""
+        try:
+            self.driver._maps_pret = True
+        except Exception:
+            pass
+    
+    def _url_recherche(self, recherche: str, ville: str) -> str:
+        """URL de recherche : par nom de ville, ou centrée sur la position d'une tuile (tile_planner)"""
+        if self.position_recherche:
+            return url_recherche_position(self.base_url, recherche, self.position_recherche)
+        return f"{self.base_url}/search/{quote(f'{recherche} {ville}')}"
+    
+    def _rechercher_rapide(self, recherche: str, ville: str) -> tuple[bool, Optional[str]]:
+        """
+        Chemin rapide : URL de recherche directe dans un navigateur déjà prêt
+        
+        Pas de consentement, pas de popups, pas d'attente de chargement complet :
+        on rend la main dès que des résultats sont dans le DOM.
+        """
+        url = self._url_recherche(recherche, ville)
+        logger.info(f"   ⚡ Recherche rapide (navigateur chaud): {url}")
+        try:
+            self.driver.get(url)
+            if self._est_page_consentement():
+                logger.info("   🍪 Consentement réapparu, chemin complet nécessaire")
+                return False, None
+            if self.attente.attendre_resultats(timeout=10 * self.timeout_multiplier):
+                return True, 'div[role="feed"]'
+        except Exception as e:
+            logger.debug(f"   Erreur recherche rapide: {e}")
+        return False, None
+    
+    def _rechercher_par_barre(self, recherche: str, ville: str) -> tuple[bool, Optional[str]]:
+        """Dernier recours : saisir la recherche dans la barre de Google Maps"""
+        from selenium.webdriver.common.keys import Keys
+        
+        try:
+            if self.base_url not in (self.driver.current_url or ''):
+                self.driver.get(self.base_url)
+                if self._est_page_consentement():
+                    self._accepter_consentement()
+            search_box, methode = self._trouver_barre_recherche_robuste()
+            if not search_box:
+                return False, None
+            search_box.clear()
+            search_box.send_keys(f"{recherche} {ville}")
+            search_box.send_keys(Keys.ENTER)
+            if self.attente.attendre_resultats(timeout=20 * self.timeout_multiplier):
+                logger.info(f"   ✅ Recherche via la barre ({methode})")
+                return True, 'div[role="feed"]'
+        except Exception as e:
+            logger.error(f"   ❌ Erreur recherche par barre: {e}")
+        return False, None
+    
+    def _rechercher_par_url(self, recherche: str, ville: str) -> tuple[bool, Optional[str]]:
         """
         Effectue une recherche sur Google Maps - MÉTHODE URL DIRECTE
         Utilise directement https://www.google.com/maps/search/{REQUÊTE}
@@ -954,23 +1302,25 @@ class GoogleMapsScraper:
             
             try:
                 # ✅ MÉTHODE URL DIRECTE (pas de barre de recherche à trouver !)
-                query = f"{recherche} {ville}"
-                url = f"https://www.google.com/maps/search/{quote(query)}"
+                url = self._url_recherche(recherche, ville)
                 
                 logger.info(f"   📍 URL directe: {url}")
                 
                 # ÉTAPE 1 : Ouvrir directement l'URL de recherche
                 self.driver.get(url)
                 logger.info("   ⏳ Chargement de la page de résultats...")
-                time.sleep(2)  # ✅ OPTIMISATION MAX : Réduit de 5s à 2s
+                # ✅ Rendre la main dès que le document est prêt (au lieu d'un délai fixe)
+                self.attente.attendre_document(timeout=10.0 * self.timeout_multiplier)
                 
                 # ✅ ÉTAPE 1.5 : Vérifier et accepter le consentement Google si nécessaire
                 if self._est_page_consentement():
                     logger.info("   🍪 Page de consentement détectée, acceptation...")
-                    if not self._accepter_consentement():
+                    with self.chrono.etape(instrumentation.ETAPE_CONSENTEMENT):
+                        consentement_ok = self._accepter_consentement()
+                    if not consentement_ok:
                         logger.error("   ❌ Échec acceptation consentement")
                         if tentative < max_tentatives:
-                            time.sleep(1)  # ✅ OPTIMISATION MAX : Réduit de 3s à 1s
+                            self.attente.attendre_document(timeout=1.0 * self.timeout_multiplier)
                             continue
                         return False, None
                     
@@ -983,7 +1333,6 @@ class GoogleMapsScraper:
                 # ÉTAPE 2 : Fermer les popups (cookies, géolocalisation, etc.)
                 logger.info("   🗑️  Fermeture des popups...")
                 self._fermer_tous_popups()
-                time.sleep(1)
                 
                 # ÉTAPE 3 : Attendre que le panneau de résultats soit chargé
                 # ✅ Logs de debug supprimés pour améliorer les performances
@@ -1023,26 +1372,24 @@ class GoogleMapsScraper:
                     if "search" not in current_url.lower():
                         logger.info("   ⚠️ URL ne contient pas 'search' - Page vide détectée, relance de la recherche...")
                         # Relancer la recherche avec l'URL complète
-                        url_recherche = f"https://www.google.com/maps/search/{quote(query)}"
+                        url_recherche = self._url_recherche(recherche, ville)
                         logger.info(f"   🔄 Relance recherche: {url_recherche}")
                         self.driver.get(url_recherche)
-                        time.sleep(2)  # ✅ OPTIMISATION MAX : Réduit de 5s à 2s
+                        self.attente.attendre_document(timeout=10.0 * self.timeout_multiplier)
                         
                         # Vérifier à nouveau si on est sur consentement (peut réapparaître)
                         if self._est_page_consentement():
                             logger.info("   🍪 Consentement réapparu, nouvelle acceptation...")
-                            if not self._accepter_consentement():
+                            with self.chrono.etape(instrumentation.ETAPE_CONSENTEMENT):
+                                consentement_ok = self._accepter_consentement()
+                            if not consentement_ok:
                                 logger.warning("   ⚠️ Échec acceptation consentement après relance")
                             else:
-                                time.sleep(1)  # ✅ OPTIMISATION MAX : Réduit de 3s à 1s
                                 self._attendre_chargement_complet(timeout=30)
                                 self._fermer_tous_popups()
-                                time.sleep(1)
                         
-                        # ✅ Attendre plus longtemps sur GitHub Actions avant de chercher le panneau
-                        if self.is_github_actions:
-                            logger.info("   ⏳ GitHub Actions: attente supplémentaire avant recherche panneau...")
-                            time.sleep(int(5 * self.delay_multiplier))
+                        # ✅ L'attente du panneau ci-dessous (timeouts × multiplicateur) couvre la lenteur
+                        # de GitHub Actions : plus de pause fixe supplémentaire
                         
                         # Réessayer de trouver le panneau après relance
                         for selector, timeout in selecteurs_panneau:
@@ -1093,8 +1440,11 @@ class GoogleMapsScraper:
                     self._debug_panneau_resultats()
                     return False, None
                 else:
+                    # Résultats arrivés en retard : pas besoin de recharger la recherche
+                    if self.attente.attendre_resultats(timeout=1.0 * self.timeout_multiplier):
+                        logger.info("   ✅ Résultats apparus, pas de nouvelle tentative")
+                        return True, None
                     logger.info("   🔄 Nouvelle tentative...")
-                    time.sleep(1)  # ✅ OPTIMISATION MAX : Réduit de 3s à 1s
                     continue
                 
             except Exception as e:
@@ -1102,7 +1452,7 @@ class GoogleMapsScraper:
                 import traceback
                 logger.debug(traceback.format_exc())
                 if tentative < max_tentatives:
-                    time.sleep(1)  # ✅ OPTIMISATION MAX : Réduit de 3s à 1s
+                    self.attente.attendre_document(timeout=1.0 * self.timeout_multiplier)
                     continue
                 return False, None
         
@@ -2031,6 +2381,56 @@ class GoogleMapsScraper:
             logger.error(f"  ❌ Erreur extraction détail [{index}/{total}]: {e}")
             return None
     
+    def _extraire_donnees_panneau_snapshot(self, element, index: int, total: int) -> Optional[Dict]:
+        """
+        Ouvre le panneau de détail et lit TOUT son état en un seul execute_script
+        
+        Returns:
+            Dict info (même format que _extraire_donnees_depuis_panneau) ou None si rien d'exploitable
+        """
+        try:
+            # Un seul aller-retour : titre du panneau actuel + scroll + capture href/aria-label + clic
+            debut_clic = time.time()
+            ancien_titre, href, nom_carte = self.driver.execute_script("""
+                var e = arguments[0];
+                var hs = document.querySelectorAll('div[role="main"] h1');
+                var ancien = hs.length ? (hs[hs.length - 1].innerText || '').trim() : '';
+                e.scrollIntoView({block: 'center'});
+                var r = [ancien, e.href || e.getAttribute('href'), e.getAttribute('aria-label')];
+                e.click();
+                return r;
+            """, element)
+        except StaleElementReferenceException:
+            logger.debug(f"  [{index}] Élément stale (snapshot), repli sur l'extraction classique")
+            return None
+        
+        self.chrono.enregistrer(instrumentation.ETAPE_CLIC, time.time() - debut_clic, index=index)
+        
+        # Attendre que le panneau affiche cette fiche (timeout dur = ancien délai fixe + marge)
+        if not self.attente.attendre_panneau_detail(ancien_titre, nom_carte, timeout=5.0 * self.timeout_multiplier):
+            logger.debug(f"  [{index}] Panneau non confirmé après {self.attente.derniere_duree:.1f}s, lecture quand même")
+        self.chrono.enregistrer(instrumentation.ETAPE_ATTENTE, self.attente.derniere_duree, index=index)
+        
+        with self.chrono.etape(instrumentation.ETAPE_EXTRACTION, index=index):
+            try:
+                etat = self.driver.execute_script(PANNEAU_JS, nom_carte)
+            except Exception as e:
+                logger.debug(f"  [{index}] Erreur lecture état panneau: {e}")
+                return None
+            
+            info = parser_etat_panneau(etat, self._normaliser_telephone, nom_attendu=nom_carte, url_carte=href)
+        if not (info.get('nom') and (info.get('telephone') or info.get('adresse') or info.get('site_web'))):
+            logger.debug(f"  [{index}] Snapshot incomplet (panneau trouvé: {(etat or {}).get('panneau_trouve')})")
+            return None
+        
+        log_parts = [f"[{index}/{total}] {info['nom']}"]
+        log_parts.append(f"📞 {info['telephone']}" if info.get('telephone') else "❌ Pas de téléphone")
+        log_parts.append("🌐 Oui" if info.get('site_web') else "❌ Pas de site")
+        if info.get('note'):
+            log_parts.append(f"⭐ {info['note']}/5")
+        logger.info(" ".join(log_parts))
+        return info
+    
     def _extraire_donnees_depuis_panneau(self, element, index: int, total: int) -> Optional[Dict]:
         """
         Extrait les données depuis un élément du panneau latéral (plus rapide)
@@ -2043,6 +2443,13 @@ class GoogleMapsScraper:
         Returns:
             Dict avec les données ou None
         """
+        # ✅ Mode snapshot : un seul aller-retour WebDriver pour lire le panneau
+        if self.extraction_mode in ('snapshot', 'onglets', 'rapide', 'xhr'):
+            info = self._extraire_donnees_panneau_snapshot(element, index, total)
+            if info:
+                return info
+            logger.debug(f"  [{index}] Repli sur l'extraction classique")
+        
         info = {
             'nom': None,
             'google_maps_url': None,  # ✅ AJOUTÉ: URL directe vers la fiche Google Maps
@@ -2077,13 +2484,14 @@ class GoogleMapsScraper:
         if index == 1:
             try:
                 # Cliquer d'abord pour ouvrir le panneau
+                ancien_titre = self.attente.titre_panneau()
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-                time.sleep(0.3)
                 try:
                     element.click()
                 except:
                     self.driver.execute_script("arguments[0].click();", element)
-                time.sleep(1.0)  # Attendre que le panneau s'ouvre
+                # Attendre que le panneau s'ouvre
+                self.attente.attendre_panneau_detail(ancien_titre, None, timeout=3.0 * self.timeout_multiplier)
                 
                 # ✅ Debug désactivé pour améliorer les performances
                 # self._debug_structure_panneau_detail(index)
@@ -2154,8 +2562,8 @@ class GoogleMapsScraper:
             
             # ✅ FIX CRITIQUE : NE PAS fermer le panneau précédent - cela cause StaleElementReferenceException
             # Google Maps gère automatiquement la fermeture/ouverture des panneaux quand on clique sur un nouvel élément
-            # On attend juste un peu pour que le DOM se stabilise
-            time.sleep(0.3 * self.delay_multiplier)
+            # On mémorise le titre du panneau actuel pour détecter l'ouverture du nouveau
+            ancien_titre = self.attente.titre_panneau()
             
             # ✅ DEBUG : Afficher l'élément avant clic
             try:
@@ -2179,17 +2587,16 @@ class GoogleMapsScraper:
                     # Si l'élément est stale, le re-trouver
                     logger.warning(f"  [{index}] ⚠️ Élément stale, re-recherche de l'élément...")
                     try:
-                        # Re-trouver tous les établissements
-                        etablissements_elems = self.driver.find_elements(By.CSS_SELECTOR, 'a[href*="/maps/place/"]')
-                        if len(etablissements_elems) >= index:
-                            element = etablissements_elems[index - 1]  # index est 1-based
+                        # Re-trouver l'établissement par son href unique (pas de re-lecture de toute la liste)
+                        element_frais = self._relocaliser_etablissement(info.get('google_maps_url'))
+                        if element_frais is not None:
+                            element = element_frais
                             # Scroll jusqu'à l'élément
                             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-                            time.sleep(0.3 * self.delay_multiplier)
                             element.click()
                             logger.info(f"  [{index}] ✅ Clic réussi (élément re-trouvé)")
                         else:
-                            logger.error(f"  [{index}] ❌ Impossible de re-trouver l'élément (index {index} > {len(etablissements_elems)})")
+                            logger.error(f"  [{index}] ❌ Impossible de re-trouver l'élément par son href")
                             raise
                     except Exception as e2:
                         logger.error(f"  [{index}] ❌ Erreur re-trouver élément: {e2}")
@@ -2198,25 +2605,22 @@ class GoogleMapsScraper:
                     # Si clic normal échoue, utiliser JavaScript
                     try:
                         self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-                        time.sleep(0.3 * self.delay_multiplier)
                         self.driver.execute_script("arguments[0].click();", element)
                         logger.info(f"  [{index}] ✅ Clic réussi (méthode JavaScript)")
                     except StaleElementReferenceException:
                         # Si toujours stale avec JavaScript, re-trouver l'élément
                         logger.warning(f"  [{index}] ⚠️ Élément stale même avec JavaScript, re-recherche...")
-                        etablissements_elems = self.driver.find_elements(By.CSS_SELECTOR, 'a[href*="/maps/place/"]')
-                        if len(etablissements_elems) >= index:
-                            element = etablissements_elems[index - 1]
+                        element_frais = self._relocaliser_etablissement(info.get('google_maps_url'))
+                        if element_frais is not None:
+                            element = element_frais
                             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-                            time.sleep(0.3 * self.delay_multiplier)
                             self.driver.execute_script("arguments[0].click();", element)
                             logger.info(f"  [{index}] ✅ Clic réussi (JavaScript + élément re-trouvé)")
                         else:
                             raise
                 
-                # ✅ Optimisation : Réduire le délai après clic pour gagner du temps
-                delay_after_click = 2.0 * self.delay_multiplier  # 2.0s local, 6.0s sur GitHub Actions (réduit de 3.0s)
-                time.sleep(delay_after_click)
+                # ✅ Attendre que le panneau affiche la fiche cliquée (au lieu de 2.0s fixes, 6.0s sur GitHub Actions)
+                self.attente.attendre_panneau_detail(ancien_titre, nom, timeout=5.0 * self.timeout_multiplier)
                 
                 # ✅ Attendre que le panneau de détail soit complètement chargé
                 # Essayer de détecter quand le contenu est prêt (présence de texte ou d'éléments spécifiques)
@@ -2225,9 +2629,6 @@ class GoogleMapsScraper:
                         lambda d: len(d.find_elements(By.CSS_SELECTOR, 'div[role="complementary"]')) > 0 or
                                   len(d.find_elements(By.CSS_SELECTOR, 'div[jsaction*="pane"]')) > 0
                     )
-                    # Attendre un peu plus pour que le contenu se charge (réduit)
-                    time.sleep(0.5 * self.delay_multiplier)
-                    
                     # ✅ Logs de debug supprimés pour améliorer les performances
                 except:
                     pass  # Si timeout, continuer quand même
@@ -2343,7 +2744,7 @@ class GoogleMapsScraper:
                             # ✅ Si aucun panneau ne correspond (score 0), attendre un peu plus et réessayer
                             if best_score == 0:
                                 logger.info(f"  [{index}] ⏳ Attente supplémentaire pour chargement du panneau...")
-                                time.sleep(2.0 * self.delay_multiplier)
+                                self.attente.attendre_panneau_detail(ancien_titre, nom_check_10, timeout=2.0 * self.timeout_multiplier)
                                 # Réessayer de trouver le panneau
                                 panneaux_detail_retry = self.driver.find_elements(By.CSS_SELECTOR, 
                                     'div[role="complementary"], '
@@ -2394,80 +2795,67 @@ class GoogleMapsScraper:
                 # Téléphone
                 try:
                     logger.info(f"  [{index}] 🔍 Recherche du téléphone dans le panneau de détail...")
-                    # ✅ FIX : Chercher directement avec les bons sélecteurs (plusieurs variantes)
-                    # Priorité 1 : aria-label avec "Numéro de téléphone" (le plus fiable)
-                    tel_buttons = search_context.find_elements(By.CSS_SELECTOR, 
-                        'button[aria-label*="Numéro de téléphone"], '
-                        'button[aria-label*="phone"], '
-                        'button[data-item-id*="phone"], '
-                        'a[href^="tel:"]'
-                    )
-                    logger.info(f"  [{index}] 📞 Téléphone (panneau): {len(tel_buttons)} boutons/liens trouvés")
-                    for tel_btn in tel_buttons:
-                        try:
-                            aria_label = tel_btn.get_attribute('aria-label')
-                            logger.debug(f"  [{index}] aria-label (panneau): {aria_label}")
-                            if aria_label and 'Numéro de téléphone' in aria_label:
-                                # Pattern plus robuste : "+33 6 73 87 88 61" ou "06 73 87 88 61"
-                                # Chercher d'abord le format international +33
-                                tel_match = re.search(r'\+33\s*([1-9]\s*(?:\d{2}\s*){4})|0\s*[1-9](?:\s*\d{2}){4}', aria_label)
-                                if tel_match:
-                                    tel_brut = tel_match.group(0).replace(' ', '').replace('+33', '0')
-                                    # S'assurer qu'on a bien 10 chiffres
-                                    tel_clean = ''.join(filter(str.isdigit, tel_brut))
-                                    if len(tel_clean) == 10 and tel_clean.startswith('0'):
-                                        tel_normalise = self._normaliser_telephone(tel_clean)
-                                        if tel_normalise:
-                                            info['telephone'] = tel_normalise
-                                            logger.info(f"  [{index}] ✅ Téléphone trouvé et stocké: {info['telephone']}")
-                                            break
-                                        else:
-                                            logger.warning(f"  [{index}] ⚠️ Téléphone trouvé mais normalisation échouée: {tel_clean}")
-                                    else:
-                                        logger.debug(f"  [{index}] Téléphone invalide (longueur: {len(tel_clean)}): {tel_clean}")
-                                else:
-                                    # Essayer un pattern plus permissif
-                                    tel_match2 = re.search(r'(\+33|0)[\s\-\.]?([1-9][\s\-\.]?\d{2}[\s\-\.]?\d{2}[\s\-\.]?\d{2}[\s\-\.]?\d{2})', aria_label)
-                                    if tel_match2:
-                                        tel_brut = tel_match2.group(0).replace(' ', '').replace('-', '').replace('.', '').replace('+33', '0')
-                                        tel_clean = ''.join(filter(str.isdigit, tel_brut))
+                    
+                    def _tel_depuis_texte(texte: str) -> Optional[str]:
+                        tel_match = re.search(r'(\+33|0)[\s\-\.]?([1-9][\s\-\.]?\d{2}[\s\-\.]?\d{2}[\s\-\.]?\d{2}[\s\-\.]?\d{2})', texte)
+                        if not tel_match:
+                            return None
+                        tel_brut = tel_match.group(0).replace(' ', '').replace('-', '').replace('.', '').replace('+33', '0')
+                        tel_clean = ''.join(filter(str.isdigit, tel_brut))
+                        if len(tel_clean) == 10 and tel_clean.startswith('0'):
+                            return self._normaliser_telephone(tel_clean)
+                        return None
+                    
+                    # Stratégie aria-label "Numéro de téléphone" (historiquement la plus fiable)
+                    def _tel_aria_label() -> Optional[str]:
+                        tel_buttons = search_context.find_elements(By.CSS_SELECTOR, 
+                            'button[aria-label*="Numéro de téléphone"], '
+                            'button[aria-label*="phone"], '
+                            'button[data-item-id*="phone"], '
+                            'a[href^="tel:"]'
+                        )
+                        logger.info(f"  [{index}] 📞 Téléphone (panneau): {len(tel_buttons)} boutons/liens trouvés")
+                        for tel_btn in tel_buttons:
+                            try:
+                                aria_label = tel_btn.get_attribute('aria-label')
+                                logger.debug(f"  [{index}] aria-label (panneau): {aria_label}")
+                                if aria_label and 'Numéro de téléphone' in aria_label:
+                                    # Pattern plus robuste : "+33 6 73 87 88 61" ou "06 73 87 88 61"
+                                    tel_match = re.search(r'\+33\s*([1-9]\s*(?:\d{2}\s*){4})|0\s*[1-9](?:\s*\d{2}){4}', aria_label)
+                                    if tel_match:
+                                        tel_clean = ''.join(filter(str.isdigit, tel_match.group(0).replace(' ', '').replace('+33', '0')))
                                         if len(tel_clean) == 10 and tel_clean.startswith('0'):
                                             tel_normalise = self._normaliser_telephone(tel_clean)
                                             if tel_normalise:
-                                                info['telephone'] = tel_normalise
-                                                logger.info(f"  [{index}] ✅ Téléphone trouvé (pattern 2) et stocké: {info['telephone']}")
-                                                break
-                                    logger.debug(f"  [{index}] Regex ne match pas (panneau): {aria_label[:100]}")
-                        except Exception as e:
-                            logger.debug(f"  Erreur extraction téléphone aria-label (panneau): {e}")
-                            continue
+                                                return tel_normalise
+                                            logger.warning(f"  [{index}] ⚠️ Téléphone trouvé mais normalisation échouée: {tel_clean}")
+                                        else:
+                                            logger.debug(f"  [{index}] Téléphone invalide (longueur: {len(tel_clean)}): {tel_clean}")
+                                    else:
+                                        # Essayer un pattern plus permissif
+                                        tel_normalise = _tel_depuis_texte(aria_label)
+                                        if tel_normalise:
+                                            return tel_normalise
+                                        logger.debug(f"  [{index}] Regex ne match pas (panneau): {aria_label[:100]}")
+                            except Exception as e:
+                                logger.debug(f"  Erreur extraction téléphone aria-label (panneau): {e}")
+                        return None
                     
-                    # Priorité 2 : button[data-item-id*="phone"] si pas trouvé
-                    if not info.get('telephone'):
+                    # Stratégie button[data-item-id*="phone"] (texte ou aria-label)
+                    def _tel_data_item_id() -> Optional[str]:
                         tel_buttons_data = search_context.find_elements(By.CSS_SELECTOR, 'button[data-item-id*="phone"]')
                         logger.info(f"  [{index}] 📞 Téléphone (data-item-id): {len(tel_buttons_data)} boutons trouvés")
                         for tel_btn in tel_buttons_data:
                             try:
-                                # Essayer d'extraire depuis le texte ou aria-label
-                                tel_text = tel_btn.text.strip()
-                                aria_label = tel_btn.get_attribute('aria-label') or ''
-                                
-                                # Chercher un numéro dans le texte ou aria-label
-                                tel_match = re.search(r'(\+33|0)[\s\-\.]?([1-9][\s\-\.]?\d{2}[\s\-\.]?\d{2}[\s\-\.]?\d{2}[\s\-\.]?\d{2})', tel_text + ' ' + aria_label)
-                                if tel_match:
-                                    tel_brut = tel_match.group(0).replace(' ', '').replace('-', '').replace('.', '').replace('+33', '0')
-                                    tel_clean = ''.join(filter(str.isdigit, tel_brut))
-                                    if len(tel_clean) == 10 and tel_clean.startswith('0'):
-                                        tel_normalise = self._normaliser_telephone(tel_clean)
-                                        if tel_normalise:
-                                            info['telephone'] = tel_normalise
-                                            logger.info(f"  [{index}] ✅ Téléphone trouvé via data-item-id: {info['telephone']}")
-                                            break
+                                tel_normalise = _tel_depuis_texte(tel_btn.text.strip() + ' ' + (tel_btn.get_attribute('aria-label') or ''))
+                                if tel_normalise:
+                                    return tel_normalise
                             except:
                                 continue
+                        return None
                     
-                    # Priorité 3 : href tel: si pas trouvé
-                    if not info.get('telephone'):
+                    # Stratégie href tel:
+                    def _tel_href() -> Optional[str]:
                         tel_links = search_context.find_elements(By.CSS_SELECTOR, 'a[href^="tel:"]')
                         logger.info(f"  [{index}] 📞 Téléphone (href tel:): {len(tel_links)} liens trouvés")
                         for tel_link in tel_links:
@@ -2477,13 +2865,22 @@ class GoogleMapsScraper:
                                     tel_brut = href.replace('tel:', '').replace(' ', '').replace('+33', '0')
                                     tel_normalise = self._normaliser_telephone(tel_brut)
                                     if tel_normalise:
-                                        info['telephone'] = tel_normalise
-                                        logger.info(f"  [{index}] ✅ Téléphone trouvé via href (panneau): {info['telephone']}")
-                                        break
-                                    else:
-                                        logger.warning(f"  [{index}] ⚠️ Téléphone href trouvé mais normalisation échouée: {tel_brut}")
+                                        return tel_normalise
+                                    logger.warning(f"  [{index}] ⚠️ Téléphone href trouvé mais normalisation échouée: {tel_brut}")
                             except:
                                 continue
+                        return None
+                    
+                    # ✅ Ordre appris : la stratégie qui trouve le téléphone d'habitude est essayée en premier
+                    strategie_tel, telephone = stats_selecteurs().essayer(
+                        'telephone_panneau',
+                        [('aria_label', _tel_aria_label), ('data_item_id', _tel_data_item_id), ('href_tel', _tel_href)],
+                        lambda strategie: strategie[1](),
+                        cle=lambda strategie: strategie[0]
+                    )
+                    if telephone:
+                        info['telephone'] = telephone
+                        logger.info(f"  [{index}] ✅ Téléphone trouvé ({strategie_tel[0]}): {info['telephone']}")
                 except Exception as e:
                     logger.error(f"  ❌ Erreur extraction téléphone (panneau): {e}")
                 
@@ -3035,22 +3432,19 @@ class GoogleMapsScraper:
                 logger.warning(f"  [{index}] ⚠️ Nom manquant, tentative récupération depuis élément...")
                 try:
                     # Essayer plusieurs sélecteurs
+                    def _nom_depuis_selecteur(selector: str) -> Optional[str]:
+                        for nom_elem in element.find_elements(By.CSS_SELECTOR, selector):
+                            texte_clean = nom_elem.text.strip().replace('🏅', '').replace('📌', '').replace('', '').strip()
+                            if texte_clean and texte_clean.lower() not in ['résultats', 'results', 'sponsorisé', 'sponsored', 'pereira', ''] and len(texte_clean) > 3:
+                                return texte_clean
+                        return None
+                    
                     selecteurs = ['div[class*="fontHeadline"]', 'h1', 'h2', 'h3', 'span[class*="fontHeadline"]']
-                    for selector in selecteurs:
-                        try:
-                            nom_elems = element.find_elements(By.CSS_SELECTOR, selector)
-                            for nom_elem in nom_elems:
-                                texte = nom_elem.text.strip()
-                                texte_clean = texte.replace('🏅', '').replace('📌', '').replace('', '').strip()
-                                if texte_clean and texte_clean.lower() not in ['résultats', 'results', 'sponsorisé', 'sponsored', 'pereira', ''] and len(texte_clean) > 3:
-                                    info['nom'] = texte_clean
-                                    logger.info(f"  [{index}] ✅ Nom récupéré depuis élément ({selector}): {info['nom']}")
-                                    nom_final = info['nom']
-                                    break
-                            if nom_final:
-                                break
-                        except:
-                            continue
+                    selector, nom_trouve = stats_selecteurs().essayer('nom_element', selecteurs, _nom_depuis_selecteur)
+                    if nom_trouve:
+                        info['nom'] = nom_trouve
+                        logger.info(f"  [{index}] ✅ Nom récupéré depuis élément ({selector}): {info['nom']}")
+                        nom_final = info['nom']
                 except Exception as e:
                     logger.debug(f"  [{index}] Erreur récupération nom depuis élément: {e}")
             
@@ -3116,7 +3510,310 @@ class GoogleMapsScraper:
                 return info
             return None
     
-    def scraper(self, recherche: str, ville: str, max_results: int = 100, progress_callback=None) -> List[Dict]:
+    def _snapshot_etablissements(self, elements) -> List[Dict]:
+        """
+        Lit en un seul execute_script le href /maps/place/ de chaque résultat
+        
+        Args:
+            elements: WebElements trouvés dans la liste (liens ou conteneurs de carte)
+        
+        Returns:
+            Liste de {'href': str ou None, 'element': WebElement}, sans doublons de fiche
+        """
+        try:
+            hrefs = self.driver.execute_script("""
+                return arguments[0].map(function(e) {
+                    if (e.href && e.href.indexOf('/maps/place/') !== -1) { return e.href; }
+                    var a = e.querySelector ? e.querySelector('a[href*="/maps/place/"]') : null;
+                    return a ? a.href : null;
+                });
+            """, list(elements)) or []
+        except Exception as e:
+            logger.debug(f"Erreur snapshot des hrefs: {e}")
+            hrefs = [None] * len(elements)
+        
+        etablissements = []
+        cles_vues = set()
+        for element, href in zip(elements, hrefs):
+            cle = cle_fiche(href)
+            if cle:
+                if cle in cles_vues:
+                    continue
+                cles_vues.add(cle)
+            etablissements.append({'href': href if cle else None, 'element': element})
+        return etablissements
+    
+    def _relocaliser_etablissement(self, href: Optional[str]):
+        """
+        Retrouve la carte d'un établissement par son href unique (un seul aller-retour)
+        
+        Returns:
+            WebElement frais, ou None si introuvable
+        """
+        if not href:
+            return None
+        try:
+            return self.driver.execute_script("""
+                var h = arguments[0];
+                var e = document.querySelector('a[href="' + CSS.escape(h) + '"]');
+                if (e) { return e; }
+                var liens = document.querySelectorAll('a[href*="/maps/place/"]');
+                for (var i = 0; i < liens.length; i++) {
+                    if (liens[i].href === h) { return liens[i]; }
+                }
+                return null;
+            """, href)
+        except Exception as e:
+            logger.debug(f"Erreur relocalisation {href[:60]}: {e}")
+            return None
+    
+    def _memoriser_place(self, info: Dict):
+        """Ajoute la fiche extraite aux places connues (une ville voisine ne la rouvrira pas)"""
+        cle = cle_fiche(info.get('google_maps_url'))
+        if cle:
+            self.places_connues.add(cle)
+    
+    def _traiter_places_connues(self, etablissements: List[Dict]) -> List[Dict]:
+        """
+        Retire du snapshot les fiches déjà connues, avant tout clic
+        
+        Si callback_place_connue est fourni, la note et le nombre d'avis sont lus sur la carte
+        de résultat (un execute_script, pas d'ouverture du panneau) pour un rafraîchissement léger.
+        
+        Returns:
+            Les établissements restant à extraire
+        """
+        if not self.places_connues:
+            return etablissements
+        
+        nouveaux = []
+        for etablissement in etablissements:
+            cle = cle_fiche(etablissement['href'])
+            if not cle or cle not in self.places_connues:
+                nouveaux.append(etablissement)
+                continue
+            self.nb_places_connues += 1
+            if self.callback_place_connue:
+                try:
+                    notes, avis = self.driver.execute_script("""
+                        var e = arguments[0];
+                        var carte = e.closest('div[role="article"]') || e.parentElement || e;
+                        return [
+                            Array.from(carte.querySelectorAll('span[role="img"]')).map(function(s) { return s.getAttribute('aria-label') || ''; }),
+                            Array.from(carte.querySelectorAll('span')).map(function(s) { return s.innerText || ''; }).filter(function(t) { return t.indexOf('(') !== -1; })
+                        ];
+                    """, etablissement['element'])
+                    note, nb_avis = extraire_note_avis(notes or [], avis or [])
+                    self.callback_place_connue(cle, {'google_maps_url': etablissement['href'], 'note': note, 'nb_avis': nb_avis})
+                except Exception as e:
+                    logger.debug(f"Erreur rafraîchissement fiche connue: {e}")
+        
+        if self.nb_places_connues:
+            logger.info(f"   ⏭️ {self.nb_places_connues} fiches déjà connues ignorées, {len(nouveaux)} nouvelles")
+        return nouveaux
+    
+    def _iterer_etablissements(self, etablissements: List[Dict]):
+        """
+        Parcourt le snapshot en re-localisant chaque carte par son href (évite les éléments stale)
+        
+        Yields:
+            (établissement du snapshot, WebElement)
+        """
+        for etablissement in etablissements:
+            element = etablissement['element']
+            if etablissement['href']:
+                element_frais = self._relocaliser_etablissement(etablissement['href'])
+                if element_frais is not None:
+                    element = element_frais
+                else:
+                    logger.debug(f"  [{etablissement['index']}] Carte introuvable par href, "
+                                 f"utilisation de l'élément original")
+            yield etablissement, element
+    
+    def _lire_fiche_onglet(self, href: str, ancien_titre: Optional[str], index: int, total: int) -> Optional[Dict]:
+        """Lit la fiche chargée dans l'onglet courant (mode 'onglets')"""
+        nom_url = nom_depuis_url(href)
+        self.attente.attendre_panneau_detail(ancien_titre, nom_url, timeout=10.0 * self.timeout_multiplier)
+        self.chrono.enregistrer(instrumentation.ETAPE_ATTENTE, self.attente.derniere_duree, index=index)
+        with self.chrono.etape(instrumentation.ETAPE_EXTRACTION, index=index):
+            try:
+                etat = self.driver.execute_script(PANNEAU_JS, nom_url)
+            except Exception as e:
+                logger.debug(f"  [{index}] Erreur lecture onglet: {e}")
+                return None
+            info = parser_etat_panneau(etat, self._normaliser_telephone, nom_attendu=nom_url, url_carte=href)
+        if not (info.get('nom') or info.get('telephone') or info.get('site_web') or info.get('adresse')):
+            logger.debug(f"  [{index}/{total}] Fiche vide (onglet)")
+            return None
+        log_parts = [f"[{index}/{total}] {info['nom']}"]
+        log_parts.append(f"📞 {info['telephone']}" if info.get('telephone') else "❌ Pas de téléphone")
+        log_parts.append("🌐 Site web" if info.get('site_web') else "❌ Pas de site")
+        logger.info(f"  ✅ {' | '.join(log_parts)} (onglet)")
+        return info
+    
+    def _extraire_par_onglets(self, etablissements: List[Dict], total: int, progress_callback=None) -> Iterator[Dict]:
+        """
+        Mode 'onglets' : visite directement les URLs /maps/place/ réparties sur K onglets
+        
+        Les onglets sont servis à tour de rôle : pendant qu'on lit la fiche d'un onglet,
+        les autres continuent de charger la leur. L'onglet de la liste de résultats n'est pas touché.
+        
+        Args:
+            etablissements: Snapshot ({'href', 'element', 'index'}) - seuls ceux avec href sont visités
+            total: Nombre total d'établissements (pour progress_callback)
+            progress_callback: Même contrat que scraper() : (index, total, info)
+        
+        Yields:
+            Infos extraites, au fil de la lecture des onglets
+        """
+        a_visiter = [(e['index'], e['href']) for e in etablissements if e['href']]
+        if not a_visiter:
+            return
+        
+        onglet_liste = self.driver.current_window_handle
+        onglets = []  # [handle, (index, href) en cours, dernier titre (None : onglet neuf)]
+        try:
+            # Ouvrir K onglets et lancer le premier chargement dans chacun (navigation non bloquante)
+            for _ in range(min(self.nb_onglets, len(a_visiter))):
+                self.driver.switch_to.new_window('tab')
+                appliquer_blocage(self.driver, self.motifs_bloques)
+                tache = a_visiter.pop(0)
+                self.driver.execute_script("window.location.href = arguments[0];", tache[1])
+                onglets.append([self.driver.current_window_handle, tache, None])
+            logger.info(f"   🗂️ Mode onglets: {len(onglets)} onglets ouverts")
+            
+            # Tourniquet : lire l'onglet prêt, lui donner la fiche suivante, passer au suivant
+            while onglets and self.is_running:
+                for onglet in list(onglets):
+                    if not self.is_running:
+                        break
+                    handle, (index, href), ancien_titre = onglet
+                    self.driver.switch_to.window(handle)
+                    info = self._lire_fiche_onglet(href, ancien_titre, index, total)
+                    onglet[2] = self.attente.titre_panneau()
+                    
+                    if info:
+                        self._memoriser_place(info)
+                        self.scraped_count += 1
+                        if progress_callback:
+                            progress_callback(index, total, info)
+                        yield info
+                    
+                    if a_visiter:
+                        onglet[1] = a_visiter.pop(0)
+                        self.driver.execute_script("window.location.href = arguments[0];", onglet[1][1])
+                    else:
+                        self.driver.close()
+                        onglets.remove(onglet)
+        finally:
+            # Fermer les onglets restants et revenir sur la liste de résultats
+            for handle, _, _ in onglets:
+                try:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+                except Exception:
+                    pass
+            try:
+                self.driver.switch_to.window(onglet_liste)
+            except Exception as e:
+                logger.debug(f"Erreur retour onglet liste: {e}")
+    
+    def _extraire_par_cartes(self, etablissements: List[Dict], total: int, progress_callback=None):
+        """
+        Mode 'rapide' : lit toutes les cartes de la liste en un seul execute_script, sans clic
+        
+        Une carte qui donne déjà téléphone ET site web est gardée telle quelle ; les autres
+        doivent passer par le panneau de détail.
+        
+        Args:
+            etablissements: Snapshot ({'href', 'element', 'index'})
+            total: Nombre total d'établissements (pour progress_callback)
+            progress_callback: Même contrat que scraper() : (index, total, info)
+        
+        Returns:
+            (infos complètes, établissements à ouvrir, {href: info de carte} pour compléter le panneau)
+        """
+        with self.chrono.etape(instrumentation.ETAPE_CARTES):
+            try:
+                etats = self.driver.execute_script(CARTES_JS, [e['element'] for e in etablissements]) or []
+            except Exception as e:
+                logger.warning(f"⚠️ Lecture groupée des cartes impossible ({str(e)[:60]}), ouverture de toutes les fiches")
+                return [], etablissements, {}
+        
+        completes = []
+        a_ouvrir = []
+        infos_cartes = {}
+        for etablissement, etat in zip(etablissements, etats):
+            info = parser_carte(etat, self._normaliser_telephone) if etat else None
+            if not info or not info.get('google_maps_url'):
+                a_ouvrir.append(etablissement)
+                continue
+            if info.get('telephone') and info.get('site_web'):
+                completes.append(info)
+                self._memoriser_place(info)
+                self.scraped_count += 1
+                if progress_callback:
+                    progress_callback(etablissement['index'], total, info)
+            else:
+                infos_cartes[etablissement['href'] or info['google_maps_url']] = info
+                a_ouvrir.append(etablissement)
+        
+        logger.info(f"   ⚡ Mode rapide: {len(completes)} fiches complètes depuis la liste, "
+                    f"{len(a_ouvrir)} à ouvrir (téléphone ou site manquant)")
+        return completes, a_ouvrir, infos_cartes
+    
+    def _reprendre_apres_recyclage(self, restants: List[Dict], total: int, recherche: str, ville: str,
+                                   progress_callback=None) -> Iterator[Dict]:
+        """
+        Point de reprise mémoire : recycle le navigateur puis visite directement les fiches restantes
+        
+        Pas de nouvelle recherche ni de nouveau scroll : les hrefs du snapshot suffisent pour
+        ouvrir chaque fiche restante par son URL /maps/place/.
+        
+        Args:
+            restants: Établissements du snapshot pas encore visités ({'href', 'element', 'index'})
+        
+        Yields:
+            Infos extraites (même format que iter_scrape())
+        """
+        a_visiter = [(e['index'], e['href']) for e in restants if e['href']]
+        logger.info(f"   💾 Point de reprise: fiche {restants[0]['index']}/{total}, "
+                    f"{len(a_visiter)} fiches à reprendre par URL")
+        if len(a_visiter) < len(restants):
+            logger.warning(f"   ⚠️ {len(restants) - len(a_visiter)} fiches sans URL abandonnées au recyclage")
+        if not self._recycler_navigateur():
+            return
+        
+        verifier_consentement = True
+        for n, (index, href) in enumerate(a_visiter):
+            if not self.is_running:
+                break
+            if n and n % 5 == 0 and self.surveillance_memoire.depasse(self.driver):
+                if not self._recycler_navigateur():
+                    return
+                verifier_consentement = True
+            try:
+                self.driver.get(href)
+                if verifier_consentement:
+                    verifier_consentement = False
+                    if self._est_page_consentement() and self._accepter_consentement():
+                        self.driver.get(href)
+                info = self._lire_fiche_onglet(href, None, index, total)
+            except Exception as e:
+                logger.error(f"  ❌ Erreur reprise [{index}/{total}]: {e}")
+                continue
+            if not info:
+                continue
+            info['recherche'] = recherche
+            info['ville_recherche'] = ville
+            self._memoriser_place(info)
+            self.scraped_count += 1
+            if progress_callback:
+                progress_callback(index, total, info)
+            yield info
+    
+    def scraper(self, recherche: str, ville: str, max_results: int = 100, progress_callback=None,
+                position: Optional[Dict] = None) -> List[Dict]:
         """
         Scrape Google Maps pour une recherche donnée
         
@@ -3125,10 +3822,30 @@ class GoogleMapsScraper:
             ville: Ville de recherche (ex: "Paris", "Lyon")
             max_results: Nombre max de résultats à extraire
             progress_callback: Fonction appelée à chaque établissement (index, total, info)
+            position: Centre et zoom d'une tuile (voir iter_scrape)
         
         Returns:
             Liste de dicts avec les infos de chaque établissement
         """
+        return list(self.iter_scrape(recherche, ville, max_results, progress_callback, position))
+    
+    def iter_scrape(self, recherche: str, ville: str, max_results: int = 100,
+                    progress_callback=None, position: Optional[Dict] = None) -> Iterator[Dict]:
+        """
+        Version streaming de scraper() : produit chaque établissement dès qu'il est extrait
+        
+        Rien n'est accumulé : l'appelant peut consommer dans son propre thread (sauvegarde JSON,
+        base de données...) et la mémoire reste stable sur les grandes villes. Une itération
+        interrompue (break) laisse le driver ouvert : appeler quit() ou stop() comme après scraper().
+        
+        Args:
+            Mêmes arguments que scraper(), plus :
+            position: {'latitude', 'longitude', 'zoom'} d'une tuile (scraping/tile_planner.py) :
+                      recherche du métier centrée sur ces coordonnées au lieu de "<métier> <ville>"
+        
+        Yields:
+            Dict d'infos de chaque établissement (même format que scraper())
+        """
         logger.info(f"🚀 Démarrage scraping: {recherche} à {ville} (max: {max_results})")
         logger.info(f"   🌍 Environnement: {'GitHub Actions' if self.is_github_actions else 'Local'}")
         logger.info(f"   ⏱️ Multiplicateurs: timeout={self.timeout_multiplier}x, delay={self.delay_multiplier}x")
@@ -3136,25 +3853,49 @@ class GoogleMapsScraper:
         # ✅ Stocker la recherche et la ville pour les utiliser dans les méthodes d'extraction
         self.current_recherche = recherche
         self.current_ville = ville
+        self.position_recherche = position
+        self.nb_places_connues = 0
+        self.nb_scrolls = 0
+        self.bloque = False
+        self.abandonne = False
+        self.chrono = Chronometre(environnement='github_actions' if self.is_github_actions else 'local')
         
-        if not self._setup_driver():
+        with self.chrono.etape(instrumentation.ETAPE_SETUP_DRIVER):
+            driver_ok = self._setup_driver()
+        if not driver_ok:
             logger.error("❌ Échec initialisation driver")
             self.is_running = False
-            return []
+            return
         
         logger.info("✅ Driver initialisé avec succès")
         
+        self.capture_xhr = None
+        if self.extraction_mode == 'xhr':
+            self.capture_xhr = CaptureRecherche(self.driver, self._normaliser_telephone)
+            try:
+                self.driver.execute_cdp_cmd('Network.enable', {})
+            except Exception as e:
+                logger.warning(f"⚠️ Capture XHR indisponible ({str(e)[:60]}), extraction DOM uniquement")
+                self.capture_xhr = None
+        
         # S'assurer que is_running est True avant de commencer
         self.is_running = True
-        resultats = []
         
         try:
             # Recherche - récupérer le sélecteur qui a fonctionné
             logger.info("🔍 Étape 1: Recherche des établissements...")
-            recherche_ok, selector_panneau = self._rechercher_etablissements(recherche, ville)
+            if self.regulateur is not None:
+                # Attendre la fin d'une pause anti-blocage éventuelle, puis un jeton de débit
+                if not self.regulateur.avant_requete():
+                    self.abandonne = True
+                    logger.warning("⏰ Budget de temps épuisé pendant la pause anti-blocage : recherche abandonnée")
+                    return
+            with self.chrono.etape(instrumentation.ETAPE_RECHERCHE):
+                recherche_ok, selector_panneau = self._rechercher_etablissements(recherche, ville)
             if not recherche_ok:
+                self._signaler_si_bloque()
                 logger.error("❌ Échec de la recherche")
-                return []
+                return
             
             logger.info(f"✅ Recherche réussie, sélecteur: {selector_panneau}")
             
@@ -3163,44 +3904,35 @@ class GoogleMapsScraper:
                 selector_panneau = 'div[role="feed"]'
             
             # Scroller pour charger plus de résultats
-            logger.info(f"📜 Étape 2: Scroll du panneau (max_scrolls=50, selector={selector_panneau})...")
-            self._scroller_panneau_lateral(max_scrolls=50, selector=selector_panneau)  # ✅ Augmenté de 15 à 50 pour charger plus de résultats
-            logger.info("✅ Scroll terminé")
+            logger.info(f"📜 Étape 2: Scroll du panneau (max_scrolls=50, objectif={max_results}, selector={selector_panneau})...")
+            with self.chrono.etape(instrumentation.ETAPE_SCROLL):
+                # ✅ Arrêt dès que max_results fiches nouvelles sont chargées, à la fin de liste, ou sans progrès
+                self.nb_scrolls = self._scroller_panneau_lateral(max_scrolls=50, selector=selector_panneau,
+                                                                 objectif=max_results)
+            logger.info(f"✅ Scroll terminé ({self.nb_scrolls} scrolls)")
             
             # ✅ FIX : Chercher DIRECTEMENT les établissements dans toute la page
             # Ne pas chercher dans un panneau spécifique qui peut ne pas contenir les résultats
             
-            # ✅ NOUVEAU : Attendre explicitement que les résultats se chargent
-            try:
-                WebDriverWait(self.driver, 30).until(
-                    lambda d: len(d.find_elements(By.CSS_SELECTOR, 'a[href*="/maps/place/"]')) > 0 or
-                              len(d.find_elements(By.CSS_SELECTOR, 'div[role="article"]')) > 0
-                )
-            except TimeoutException:
-                pass  # ✅ Réduire les logs
+            # ✅ Attendre que les résultats soient présents (rend la main dès qu'ils le sont)
+            resultats_presents = self.attente.attendre_resultats(timeout=30 * self.timeout_multiplier)
             
-            # Attendre un peu plus pour que tous les résultats se chargent
-            time.sleep(2)
+            # ✅ Résultats absents : vérifier si Google Maps a bloqué (CAPTCHA / unusual traffic)
+            if not resultats_presents and self._signaler_si_bloque():
+                return
+            if self.regulateur is not None:
+                # Pas de page de blocage : referme le disjoncteur si ce worker faisait la sonde
+                self.regulateur.signaler_succes()
             
-            # ✅ Attendre un peu plus longtemps sur GitHub Actions pour que les résultats se chargent
-            if self.is_github_actions:
-                logger.info("   ⏳ GitHub Actions détecté, attente supplémentaire pour le chargement...")
-                time.sleep(int(10 * self.delay_multiplier))  # Augmenté de 5 à 10
-                
-                # ✅ Vérifier si Google Maps a bloqué avec un CAPTCHA ou une page d'erreur
-                current_url = self.driver.current_url
-                page_text = self.driver.page_source.lower()
-                
-                if 'sorry' in page_text or 'captcha' in page_text or 'unusual traffic' in page_text:
-                    logger.error("   ❌ Google Maps a détecté l'automatisation (CAPTCHA/blocage)")
-                    return []
+            # ✅ Sur GitHub Actions : vérifications si les résultats ne sont pas arrivés
+            if self.is_github_actions and not resultats_presents:
+                logger.info("   ⏳ GitHub Actions détecté, résultats absents après attente...")
                 
                 # ✅ Faire un scroll pour déclencher le chargement des résultats
                 try:
                     self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-                    time.sleep(2 * self.delay_multiplier)
+                    self.attente.attendre_resultats(timeout=2 * self.delay_multiplier)
                     self.driver.execute_script("window.scrollTo(0, 0);")
-                    time.sleep(1 * self.delay_multiplier)
                 except:
                     pass
             
@@ -3218,15 +3950,14 @@ class GoogleMapsScraper:
                 # Attendre encore un peu et réessayer
                 if self.is_github_actions:
                     logger.info("   ⏳ Attente supplémentaire (GitHub Actions)...")
-                    time.sleep(int(15 * self.delay_multiplier))  # Augmenté de 10 à 15
+                    self.attente.attendre_resultats(timeout=int(15 * self.delay_multiplier))
                     
                     # ✅ Essayer de scroller dans le panneau de résultats
                     try:
                         panneau = self.driver.find_element(By.CSS_SELECTOR, 'div[role="main"]')
                         self.driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight/2;", panneau)
-                        time.sleep(3 * self.delay_multiplier)
+                        self.attente.attendre_resultats(timeout=3 * self.delay_multiplier)
                         self.driver.execute_script("arguments[0].scrollTop = 0;", panneau)
-                        time.sleep(1 * self.delay_multiplier)
                     except:
                         pass
                     
@@ -3246,6 +3977,9 @@ class GoogleMapsScraper:
                             ('div[role="button"][data-value]', None),
                         ]
                         
+                        stats = stats_selecteurs()
+                        alt_selectors = stats.ordonner('conteneurs_alternatifs', alt_selectors, cle=lambda t: t[0])
+                        
                         for container_selector, child_selector in alt_selectors:
                             try:
                                 containers = self.driver.find_elements(By.CSS_SELECTOR, container_selector)
@@ -3257,8 +3991,11 @@ class GoogleMapsScraper:
                                     
                                     if len(etablissements_elems) > 0:
                                         logger.info(f"   📍 {len(etablissements_elems)} éléments trouvés avec {container_selector}")
+                                        stats.succes('conteneurs_alternatifs', container_selector)
                                         break
+                                stats.echec('conteneurs_alternatifs', container_selector)
                             except:
+                                stats.echec('conteneurs_alternatifs', container_selector)
                                 continue
                     except:
                         pass
@@ -3271,74 +4008,121 @@ class GoogleMapsScraper:
                     self._debug_etablissements_manquants(panneau_debug)
                 except:
                     self._debug_etablissements_manquants(None)
-                return []  # Retourner vide si aucun établissement trouvé
-            
-            # Limiter au max_results
-            etablissements_elems = etablissements_elems[:max_results]
+                return  # Rien à produire si aucun établissement trouvé
+            
+            # ✅ Snapshot unique de la liste : un href (clé unique) par établissement, doublons retirés
+            etablissements = self._snapshot_etablissements(etablissements_elems)
+            # ✅ Ne pas rouvrir les fiches déjà en base (ou déjà vues dans une ville voisine)
+            etablissements = self._traiter_places_connues(etablissements)[:max_results]
+            total = len(etablissements)
+            logger.info(f"   📋 {total} établissements uniques à traiter")
+            # Index de progression fixé une fois : chaque mode rapporte celui de l'établissement
+            for i, etablissement in enumerate(etablissements, 1):
+                etablissement['index'] = i
+            
+            # ✅ Mode onglets : les fiches avec href sont visitées directement ; le reste passe par le clic
+            if self.extraction_mode == 'onglets':
+                yield from self._extraire_par_onglets(etablissements, total, progress_callback)
+                etablissements = [e for e in etablissements if not e['href']]
+            
+            # ✅ Mode rapide : une seule lecture des cartes, panneau seulement si téléphone ou site manque
+            infos_cartes = {}
+            if self.extraction_mode == 'rapide':
+                completes, etablissements, infos_cartes = self._extraire_par_cartes(etablissements, total, progress_callback)
+                for info in completes:
+                    info['recherche'] = recherche
+                    info['ville_recherche'] = ville
+                    yield info
+            
+            # ✅ Mode xhr : fiches déjà décodées depuis les réponses de recherche, DOM pour le reste
+            if self.capture_xhr is not None:
+                self._lire_journal_performance()
+                restants = []
+                for etablissement in etablissements:
+                    info = self.capture_xhr.fiche(etablissement['href'])
+                    if not info:
+                        restants.append(etablissement)
+                        continue
+                    info['recherche'] = recherche
+                    info['ville_recherche'] = ville
+                    self._memoriser_place(info)
+                    self.scraped_count += 1
+                    if progress_callback:
+                        progress_callback(etablissement['index'], total, info)
+                    yield info
+                logger.info(f"   📡 Capture XHR: {len(etablissements) - len(restants)} fiches depuis "
+                            f"{self.capture_xhr.nb_reponses} réponses JSON, {len(restants)} via le DOM")
+                etablissements = restants
             
             # Extraire les données pour chaque établissement
-            for i, elem in enumerate(etablissements_elems, 1):
+            for n, (etablissement, elem) in enumerate(self._iterer_etablissements(etablissements)):
+                i = etablissement['index']
                 if not self.is_running:
                     logger.info("⏹️ Scraping arrêté par l'utilisateur")
                     break
                 
+                # Purger régulièrement le journal réseau (sinon il grossit en mémoire)
+                if n and n % 10 == 0:
+                    self._lire_journal_performance()
+                
+                # ✅ Navigateur trop gros : point de reprise, recyclage, puis fiches restantes par URL
+                if n and n % 5 == 0 and self.surveillance_memoire.depasse(self.driver):
+                    yield from self._reprendre_apres_recyclage(etablissements[n:], total,
+                                                               recherche, ville, progress_callback)
+                    break
+                
                 try:
-                    # ✅ FIX CRITIQUE : Re-trouver l'élément à chaque itération pour éviter StaleElementReferenceException
-                    # L'élément peut devenir stale après avoir fermé le panneau précédent
-                    try:
-                        # Re-trouver tous les établissements pour avoir des éléments frais
-                        etablissements_elems_fresh = self.driver.find_elements(By.CSS_SELECTOR, 'a[href*="/maps/place/"]')
-                        if len(etablissements_elems_fresh) >= i:
-                            elem = etablissements_elems_fresh[i - 1]  # i est 1-based
-                        else:
-                            logger.warning(f"  [{i}] ⚠️ Impossible de re-trouver l'élément (index {i} > {len(etablissements_elems_fresh)})")
-                    except Exception as e_refresh:
-                        logger.debug(f"  [{i}] Erreur re-trouver élément: {e_refresh}, utilisation élément original")
-                    
                     # ✅ FIX : Essayer plusieurs méthodes d'extraction avec fallback
                     info = None
                     
                     # Méthode 1 : Essayer d'abord avec panneau latéral (qui clique automatiquement)
                     # C'est la méthode la plus fiable pour obtenir téléphone et site web
                     try:
-                        info = self._extraire_donnees_depuis_panneau(elem, i, len(etablissements_elems))
+                        with self.chrono.etape(instrumentation.ETAPE_ETABLISSEMENT, index=i):
+                            info = self._extraire_donnees_depuis_panneau(elem, i, total)
                         
                         # ✅ Réduire les logs - seulement logger les erreurs importantes
                         # Les logs détaillés sont maintenant dans Streamlit via le fichier JSON
                         
                         if not info:
-                            logger.debug(f"  [{i}/{len(etablissements_elems)}] Panneau: aucune donnée, essai élément...")
+                            logger.debug(f"  [{i}/{total}] Panneau: aucune donnée, essai élément...")
                         elif not info.get('nom'):
-                            logger.debug(f"  [{i}/{len(etablissements_elems)}] Panneau: pas de nom, essai élément...")
+                            logger.debug(f"  [{i}/{total}] Panneau: pas de nom, essai élément...")
                             # Si échec, essayer extraction directe depuis élément
                             try:
-                                info = self._extraire_donnees_depuis_element(elem, i, len(etablissements_elems))
+                                info = self._extraire_donnees_depuis_element(elem, i, total)
                             except Exception as e2:
-                                logger.debug(f"  [{i}/{len(etablissements_elems)}] Erreur élément: {e2}")
+                                logger.debug(f"  [{i}/{total}] Erreur élément: {e2}")
                     except Exception as e1:
-                        logger.debug(f"  [{i}/{len(etablissements_elems)}] Erreur panneau: {e1}")
+                        logger.debug(f"  [{i}/{total}] Erreur panneau: {e1}")
                         # Si échec, essayer extraction directe depuis élément
                         try:
-                            info = self._extraire_donnees_depuis_element(elem, i, len(etablissements_elems))
+                            info = self._extraire_donnees_depuis_element(elem, i, total)
                         except Exception as e2:
-                            logger.debug(f"  [{i}/{len(etablissements_elems)}] Erreur élément: {e2}")
+                            logger.debug(f"  [{i}/{total}] Erreur élément: {e2}")
                             
                             # Méthode 3 : Si c'est un lien, essayer clic direct puis extraction depuis page détail
                             if elem.tag_name == 'a' and elem.get_attribute('href') and '/maps/place/' in elem.get_attribute('href'):
                                 try:
                                     self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", elem)
-                                    time.sleep(0.2)
                                     elem.click()
-                                    time.sleep(0.8)
-                                    info = self._extraire_donnees_depuis_detail_page(i, len(etablissements_elems))
+                                    self.attente.attendre_document(timeout=3.0 * self.timeout_multiplier)
+                                    info = self._extraire_donnees_depuis_detail_page(i, total)
                                 except Exception as e3:
-                                    logger.debug(f"  [{i}/{len(etablissements_elems)}] Erreur clic direct: {e3}")
+                                    logger.debug(f"  [{i}/{total}] Erreur clic direct: {e3}")
                     
                     # ✅ FIX CRITIQUE : Accepter les données même si le nom est None, tant qu'on a d'autres données
                     if info and (info.get('nom') or info.get('telephone') or info.get('site_web') or info.get('adresse')):
                         info['recherche'] = recherche
                         info['ville_recherche'] = ville
                         
+                        # Mode rapide : compléter avec ce que la carte donnait déjà (catégorie, note...)
+                        carte = infos_cartes.get(etablissement['href']) if infos_cartes else None
+                        if carte:
+                            for cle, valeur in carte.items():
+                                if valeur is not None and info.get(cle) is None:
+                                    info[cle] = valeur
+                        
                         # ✅ FIX AMÉLIORÉ : Capturer l'URL Google Maps avec plusieurs méthodes
                         if not info.get('google_maps_url'):
                             # Méthode 1: Depuis le href de l'élément
@@ -3383,39 +4167,53 @@ class GoogleMapsScraper:
                             except Exception as e:
                                 logger.debug(f"  [{i}] Erreur parent: {e}")
                         
-                        resultats.append(info)
+                        self._memoriser_place(info)
                         self.scraped_count += 1
                         
                         if progress_callback:
-                            progress_callback(i, len(etablissements_elems), info)
+                            progress_callback(i, total, info)
+                        yield info
                     else:
-                        logger.warning(f"  ⚠️ [{i}/{len(etablissements_elems)}] Aucune donnée extraite (toutes les données sont None)")
+                        logger.warning(f"  ⚠️ [{i}/{total}] Aucune donnée extraite (toutes les données sont None)")
                     
-                    # ✅ OPTIMISATION MAX : Pause minimale entre établissements
-                    time.sleep(random.uniform(0.05, 0.15))  # Réduit à 0.05-0.15s pour gagner du temps
+                    # Pas de pause entre établissements : le clic suivant attend déjà son panneau
+                    # (attendre_panneau_detail)
                     
                 except StaleElementReferenceException:
-                    logger.warning(f"  ⚠️ Élément stale [{i}/{len(etablissements_elems)}], skip")
+                    logger.warning(f"  ⚠️ Élément stale [{i}/{total}], skip")
                     continue
                 except Exception as e:
-                    logger.error(f"  ❌ Erreur établissement [{i}/{len(etablissements_elems)}]: {e}")
+                    logger.error(f"  ❌ Erreur établissement [{i}/{total}]: {e}")
                     continue
             
             # ✅ Réduire les logs - seulement logger les erreurs importantes
-            return resultats
+            if self.attente and self.attente.nb_attentes:
+                logger.info(f"⏱️ Attentes DOM: {self.attente.nb_attentes} ({self.attente.nb_timeouts} timeouts)")
+            self.chrono.enregistrer(instrumentation.ETAPE_TOTAL, time.time() - self.chrono.debut)
+            self.chrono.log_resume()
+            self.controleur_delais.log_resume(prefixe=f"{recherche} à {ville} - ")
+            if self.surveillance_memoire.pic_mo:
+                logger.info(f"🧠 Mémoire navigateur: pic {self.surveillance_memoire.pic_mo:.0f} Mo, "
+                            f"{self.surveillance_memoire.nb_recyclages} recyclages")
+            self._lire_journal_performance()
+            self.stats_reseau = self.compteur_reseau.resume()
+            self.compteur_reseau.log_resume(prefixe=f"{recherche} à {ville} - ")
+            stats_selecteurs().sauvegarder()
             
         except Exception as e:
             logger.error(f"❌ Erreur lors du scraping: {e}")
             import traceback
             logger.error(traceback.format_exc())
-            return resultats
         
         finally:
+            if self.regulateur is not None:
+                # Sonde terminée sans verdict (timeout, erreur navigateur) : rendre la place à un autre worker
+                self.regulateur.liberer_sonde()
             # Ne pas fermer le driver automatiquement (sera fermé par stop() ou à la fin)
             if not self.is_running:
                 if self.driver:
                     try:
-                        self.driver.quit()
+                        self._liberer_driver(sain=False)
                         logger.info("🔒 Chrome driver fermé")
                     except:
                         pass
@@ -3426,17 +4224,16 @@ class GoogleMapsScraper:
         # ✅ Réduire les logs lors de l'arrêt pour éviter de flooder le terminal
         if self.driver:
             try:
-                self.driver.quit()
+                self._liberer_driver(sain=False)
             except:
                 pass
         # Ne pas logger pour éviter de flooder le terminal
     
     def quit(self):
-        """Ferme le driver Chrome proprement"""
+        """Ferme le driver Chrome proprement (ou le rend au pool pour la ville suivante)"""
         if self.driver:
             try:
-                self.driver.quit()
-                self.driver = None
+                self._liberer_driver(sain=True)
             except Exception as e:
                 logger.debug(f"Erreur fermeture driver: {e}")
     
@@ -0,0 +1,79 @@
+"""
+Chronométrage par étape d'un scraping Google Maps
+Chaque session (une recherche dans une ville) produit une timeline d'étapes :
+setup du driver, consentement, recherche, scroll, puis clic / attente / extraction par établissement.
+La timeline est ensuite persistée dans la table scraping_timings (whatsapp_database).
+"""
+import time
+import uuid
+import logging
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Étapes standard (noms utilisés dans scraping_timings.etape)
+ETAPE_SETUP_DRIVER = 'setup_driver'
+ETAPE_CONSENTEMENT = 'consentement'
+ETAPE_RECHERCHE = 'recherche'
+ETAPE_RECHERCHE_RAPIDE = 'recherche_rapide'
+ETAPE_SCROLL = 'scroll'
+ETAPE_CLIC = 'clic'
+ETAPE_ATTENTE = 'attente_panneau'
+ETAPE_EXTRACTION = 'extraction'
+ETAPE_CARTES = 'lecture_cartes'
+ETAPE_ETABLISSEMENT = 'etablissement'
+ETAPE_TOTAL = 'total'
+
+
+class Chronometre:
+    """
+    Timeline d'une session de scraping
+
+    Usage :
+        with chrono.etape('recherche'):
+            ...
+        chrono.enregistrer('attente_panneau', 1.2, index=3)
+    """
+
+    def __init__(self, session_id: Optional[str] = None, environnement: str = 'local'):
+        self.session_id = session_id or uuid.uuid4().hex[:12]
+        self.environnement = environnement
+        self.debut = time.time()
+        self.mesures: List[Dict] = []
+
+    @contextmanager
+    def etape(self, nom: str, index: Optional[int] = None):
+        """Mesure la durée du bloc (même si une exception est levée)"""
+        debut = time.time()
+        try:
+            yield
+        finally:
+            self._ajouter(nom, debut, time.time() - debut, index)
+
+    def enregistrer(self, nom: str, duree: float, index: Optional[int] = None):
+        """Enregistre une durée déjà mesurée (ex : MoteurAttente.derniere_duree)"""
+        self._ajouter(nom, time.time() - duree, duree, index)
+
+    def _ajouter(self, nom: str, debut: float, duree: float, index: Optional[int]):
+        self.mesures.append({
+            'etape': nom,
+            'debut_offset': round(debut - self.debut, 3),
+            'duree': round(duree, 3),
+            'index_etablissement': index,
+        })
+
+    def totaux(self) -> Dict[str, float]:
+        """Durée cumulée par étape (secondes)"""
+        totaux: Dict[str, float] = {}
+        for mesure in self.mesures:
+            totaux[mesure['etape']] = totaux.get(mesure['etape'], 0.0) + mesure['duree']
+        return totaux
+
+    def log_resume(self):
+        """Log des 5 étapes les plus coûteuses de la session"""
+        totaux = sorted(self.totaux().items(), key=lambda x: x[1], reverse=True)
+        if totaux:
+            resume = ', '.join(f"{nom}={duree:.1f}s" for nom, duree in totaux[:5])
+            logger.info(f"⏱️ Timeline [{self.session_id}]: {resume}")
+
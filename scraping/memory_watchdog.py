@@ -0,0 +1,123 @@
+"""
+Surveillance mémoire du navigateur (Chrome + chromedriver)
+Sur les longs runs GitHub Actions, Maps fait grossir la mémoire de Chrome (nœuds DOM jamais libérés).
+On mesure le RSS de tout l'arbre de processus lancé par chromedriver ; au-delà d'un seuil,
+le scraper recycle son navigateur et reprend à la fiche suivante.
+"""
+import os
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import psutil
+except ImportError:  # Optionnel : repli sur /proc (Linux, runners GitHub Actions)
+    psutil = None
+
+# Seuil par défaut (Mo) pour un navigateur, surchargeable via SCRAPER_MAX_RSS_MB (0 = désactivé)
+SEUIL_DEFAUT_MO = 1500
+
+
+def seuil_configure() -> int:
+    try:
+        return int(os.environ.get('SCRAPER_MAX_RSS_MB', SEUIL_DEFAUT_MO))
+    except ValueError:
+        return SEUIL_DEFAUT_MO
+
+
+def _enfants_proc(pid: int, table: Dict[int, List[int]]) -> List[int]:
+    pids = [pid]
+    for enfant in table.get(pid, []):
+        pids.extend(_enfants_proc(enfant, table))
+    return pids
+
+
+def _rss_proc(racine: int) -> Optional[int]:
+    """RSS (octets) de l'arbre de processus via /proc"""
+    if not os.path.isdir('/proc'):
+        return None
+    table: Dict[int, List[int]] = {}
+    rss_par_pid: Dict[int, int] = {}
+    taille_page = os.sysconf('SC_PAGE_SIZE')
+    for nom in os.listdir('/proc'):
+        if not nom.isdigit():
+            continue
+        try:
+            with open(f'/proc/{nom}/stat', 'r') as f:
+                champs = f.read().rsplit(')', 1)[1].split()
+            # Après le nom : état, ppid, ... ; rss (en pages) est le 24e champ de stat
+            ppid = int(champs[1])
+            table.setdefault(ppid, []).append(int(nom))
+            rss_par_pid[int(nom)] = int(champs[21]) * taille_page
+        except (OSError, IndexError, ValueError):
+            continue
+    if racine not in rss_par_pid:
+        return None
+    return sum(rss_par_pid.get(pid, 0) for pid in _enfants_proc(racine, table))
+
+
+def rss_arbre(pid: int) -> Optional[int]:
+    """
+    Mémoire résidente (octets) d'un processus et de tous ses descendants
+
+    Returns:
+        RSS total, ou None si le processus est introuvable / la mesure indisponible
+    """
+    if psutil is not None:
+        try:
+            processus = psutil.Process(pid)
+            return sum(p.memory_info().rss for p in [processus] + processus.children(recursive=True))
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+    return _rss_proc(pid)
+
+
+def pid_chromedriver(driver) -> Optional[int]:
+    """PID du chromedriver (racine de l'arbre : chromedriver -> chrome -> renderers)"""
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+class SurveillanceMemoire:
+    """
+    Compare la mémoire de l'arbre chromedriver/Chrome d'un driver à un seuil
+
+    Usage :
+        if surveillance.depasse(driver):
+            ... recycler le navigateur ...
+    """
+
+    def __init__(self, seuil_mo: Optional[int] = None):
+        self.seuil_mo = seuil_configure() if seuil_mo is None else seuil_mo
+        self.derniere_mesure_mo = 0.0
+        self.pic_mo = 0.0
+        self.nb_recyclages = 0
+
+    @property
+    def active(self) -> bool:
+        return self.seuil_mo > 0
+
+    def mesurer(self, driver) -> Optional[float]:
+        """RSS actuel (Mo) du navigateur, None si non mesurable"""
+        pid = pid_chromedriver(driver)
+        if pid is None:
+            return None
+        rss = rss_arbre(pid)
+        if rss is None:
+            return None
+        self.derniere_mesure_mo = rss / (1024 * 1024)
+        self.pic_mo = max(self.pic_mo, self.derniere_mesure_mo)
+        return self.derniere_mesure_mo
+
+    def depasse(self, driver) -> bool:
+        """True si le navigateur dépasse le seuil (toujours False si désactivé ou non mesurable)"""
+        if not self.active or driver is None:
+            return False
+        mesure = self.mesurer(driver)
+        if mesure is None or mesure < self.seuil_mo:
+            return False
+        logger.warning(f"🧠 Mémoire navigateur {mesure:.0f} Mo > seuil {self.seuil_mo} Mo")
+        return True
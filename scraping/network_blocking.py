@@ -0,0 +1,180 @@
+"""
+Blocage réseau via le Chrome DevTools Protocol (CDP)
+Les options --disable-images / blink-settings ne suffisent pas : tuiles de carte, polices,
+miniatures Street View et balises analytics sont quand même téléchargées à chaque recherche.
+On les bloque au niveau réseau (Network.setBlockedURLs) et on compte ce qui a été évité
+grâce au journal de performance de Chrome (goog:loggingPrefs).
+"""
+import os
+import json
+import logging
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Motifs bloqués par défaut (syntaxe Network.setBlockedURLs : '*' = joker)
+# ⚠️ Ne jamais bloquer /maps/search, /search?tbm=map ni /maps/preview/place : ce sont les données
+MOTIFS_BLOQUES_DEFAUT = [
+    # Tuiles de carte (raster et vectorielles) et imagerie satellite
+    '*/maps/vt*',
+    '*/kh/v=*',
+    '*://khms*.google.com/*',
+    '*://mts*.google.com/*',
+    '*://maps.googleapis.com/maps/vt*',
+    '*/maps/rpc/vt*',
+    # Street View et photos d'établissements
+    '*://streetviewpixels-pa.googleapis.com/*',
+    '*://geo*.ggpht.com/*',
+    '*://lh3.googleusercontent.com/*',
+    '*://lh4.googleusercontent.com/*',
+    '*://lh5.googleusercontent.com/*',
+    '*://lh6.googleusercontent.com/*',
+    # Polices
+    '*://fonts.gstatic.com/*',
+    '*.woff2*',
+    '*.woff?*',
+    '*.ttf*',
+    # Images et médias
+    '*.png*',
+    '*.jpg*',
+    '*.jpeg*',
+    '*.gif*',
+    '*.webp*',
+    '*.mp4*',
+    # Analytics / télémétrie
+    '*://www.google-analytics.com/*',
+    '*://www.googletagmanager.com/*',
+    '*://play.google.com/log*',
+    '*/gen_204*',
+    '*://csi.gstatic.com/*',
+    '*://adservice.google.com/*',
+]
+
+# Taille moyenne estimée d'une ressource bloquée, par type CDP (octets)
+# (une requête bloquée n'a pas de réponse : on ne peut qu'estimer ce qu'elle aurait coûté)
+TAILLE_MOYENNE_PAR_TYPE = {
+    'Image': 30000,
+    'Font': 45000,
+    'Media': 200000,
+    'Fetch': 15000,
+    'XHR': 15000,
+    'Ping': 500,
+    'Script': 40000,
+    'Stylesheet': 10000,
+    'Other': 10000,
+}
+
+
+def motifs_configures() -> List[str]:
+    """
+    Motifs à bloquer selon l'environnement
+
+    Variables d'environnement :
+        SCRAPER_NETWORK_BLOCKING=0 : désactiver complètement le blocage
+        SCRAPER_BLOCKED_URLS : motifs supplémentaires séparés par des virgules
+        SCRAPER_ALLOWED_URLS : motifs par défaut à retirer (séparés par des virgules)
+    """
+    if os.environ.get('SCRAPER_NETWORK_BLOCKING', '1').strip().lower() in ('0', 'false', 'non', 'no'):
+        return []
+    motifs = list(MOTIFS_BLOQUES_DEFAUT)
+    autorises = {m.strip() for m in os.environ.get('SCRAPER_ALLOWED_URLS', '').split(',') if m.strip()}
+    motifs = [m for m in motifs if m not in autorises]
+    for motif in os.environ.get('SCRAPER_BLOCKED_URLS', '').split(','):
+        if motif.strip() and motif.strip() not in motifs:
+            motifs.append(motif.strip())
+    return motifs
+
+
+def activer_journal_performance(chrome_options):
+    """Active le journal de performance (événements Network.*) sur les options Chrome"""
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    chrome_options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+
+
+def appliquer_blocage(driver, motifs: Optional[Iterable[str]] = None) -> bool:
+    """
+    Active le blocage CDP sur l'onglet courant du driver
+
+    À rappeler pour chaque nouvel onglet (le blocage est attaché à la session CDP de l'onglet).
+
+    Returns:
+        True si le blocage est actif
+    """
+    motifs = list(motifs) if motifs is not None else motifs_configures()
+    if not motifs:
+        return False
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': motifs})
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ Blocage réseau CDP indisponible: {e}")
+        return False
+
+
+class CompteurReseau:
+    """
+    Compteur des requêtes chargées / bloquées, alimenté par le journal de performance
+
+    Les requêtes bloquées par setBlockedURLs apparaissent comme Network.loadingFailed
+    avec blockedReason = 'inspector'.
+    """
+
+    def __init__(self):
+        self.requetes_chargees = 0
+        self.octets_charges = 0
+        self.requetes_bloquees = 0
+        self.octets_evites_estimes = 0
+        self.bloquees_par_type: Dict[str, int] = {}
+
+    def reinitialiser(self):
+        self.__init__()
+
+    def traiter(self, message: Dict):
+        """Traite un message CDP déjà décodé ({'method': ..., 'params': ...})"""
+        methode = message.get('method')
+        params = message.get('params') or {}
+        if methode == 'Network.loadingFinished':
+            self.requetes_chargees += 1
+            self.octets_charges += int(params.get('encodedDataLength') or 0)
+        elif methode == 'Network.loadingFailed' and params.get('blockedReason') == 'inspector':
+            type_ressource = params.get('type') or 'Other'
+            self.requetes_bloquees += 1
+            self.octets_evites_estimes += TAILLE_MOYENNE_PAR_TYPE.get(type_ressource, TAILLE_MOYENNE_PAR_TYPE['Other'])
+            self.bloquees_par_type[type_ressource] = self.bloquees_par_type.get(type_ressource, 0) + 1
+
+    def resume(self) -> Dict:
+        return {
+            'requetes_chargees': self.requetes_chargees,
+            'octets_charges': self.octets_charges,
+            'requetes_bloquees': self.requetes_bloquees,
+            'octets_evites_estimes': self.octets_evites_estimes,
+            'bloquees_par_type': dict(self.bloquees_par_type),
+        }
+
+    def log_resume(self, prefixe: str = ''):
+        """Log du bilan réseau d'un scraping"""
+        if not (self.requetes_chargees or self.requetes_bloquees):
+            return
+        logger.info(
+            f"🌐 {prefixe}Réseau: {self.requetes_chargees} requêtes chargées ({self.octets_charges / 1e6:.1f} Mo), "
+            f"{self.requetes_bloquees} bloquées (~{self.octets_evites_estimes / 1e6:.1f} Mo évités)"
+        )
+
+
+def decoder_journal_performance(entrees: List[Dict]) -> List[Dict]:
+    """
+    Décode les entrées brutes de driver.get_log('performance')
+
+    Returns:
+        Liste de messages CDP {'method': ..., 'params': ...}
+    """
+    messages = []
+    for entree in entrees or []:
+        try:
+            message = json.loads(entree.get('message', '{}')).get('message', {})
+        except (ValueError, AttributeError):
+            continue
+        if message.get('method'):
+            messages.append(message)
+    return messages
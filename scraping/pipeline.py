@@ -0,0 +1,125 @@
+"""
+Pipeline de post-traitement par étapes reliées par des files
+Les threads navigateur ne font que déposer les fiches extraites ; chaque étape suivante
+(normalisation/enrichissement, dédoublonnage, persistance) a ses propres workers et sa file bornée.
+Chaque étape mesure son débit et son temps de travail, pour voir laquelle limite le run.
+"""
+import time
+import queue
+import threading
+import logging
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_FIN = object()  # Sentinelle de fin (une par worker)
+
+
+class Etape:
+    """
+    Une étape : `fonction(item)` retourne l'item pour l'étape suivante, ou None pour l'écarter
+    """
+
+    def __init__(self, nom: str, fonction: Callable, nb_workers: int = 1, taille_file: int = 500):
+        self.nom = nom
+        self.fonction = fonction
+        self.nb_workers = max(1, nb_workers)
+        self.file: queue.Queue = queue.Queue(maxsize=taille_file)
+        self.suivante: Optional['Etape'] = None
+        self.nb_entrees = 0
+        self.nb_sorties = 0
+        self.nb_ecartes = 0
+        self.nb_erreurs = 0
+        self.temps_travail = 0.0
+        self.debut: Optional[float] = None
+        self.fin: Optional[float] = None
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+    def demarrer(self):
+        self.debut = time.time()
+        for i in range(self.nb_workers):
+            thread = threading.Thread(target=self._travailler, name=f'etape-{self.nom}-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _travailler(self):
+        while True:
+            item = self.file.get()
+            if item is _FIN:
+                break
+            debut = time.time()
+            try:
+                resultat = self.fonction(item)
+                erreur = False
+            except Exception as e:
+                resultat = None
+                erreur = True
+                logger.warning(f"⚠️ Étape {self.nom}: {e}")
+            with self._lock:
+                self.nb_entrees += 1
+                self.temps_travail += time.time() - debut
+                if erreur:
+                    self.nb_erreurs += 1
+                elif resultat is None:
+                    self.nb_ecartes += 1
+                else:
+                    self.nb_sorties += 1
+            if resultat is not None and self.suivante is not None:
+                self.suivante.file.put(resultat)
+
+    def arreter(self):
+        """Termine les items en file puis arrête les workers"""
+        for _ in self._threads:
+            self.file.put(_FIN)
+        for thread in self._threads:
+            thread.join()
+        self.fin = time.time()
+
+    def resume(self) -> Dict:
+        duree = ((self.fin or time.time()) - self.debut) if self.debut else 0.0
+        return {
+            'etape': self.nom,
+            'workers': self.nb_workers,
+            'entrees': self.nb_entrees,
+            'sorties': self.nb_sorties,
+            'ecartes': self.nb_ecartes,
+            'erreurs': self.nb_erreurs,
+            'en_file': self.file.qsize(),
+            'debit_par_min': round(self.nb_entrees * 60 / duree, 1) if duree else 0.0,
+            # Part du temps où les workers travaillent : proche de 100% = étape goulot
+            'occupation_pct': round(100 * self.temps_travail / (duree * self.nb_workers), 1) if duree else 0.0,
+        }
+
+
+class Pipeline:
+    """
+    Étapes chaînées dans l'ordre
+
+    Usage :
+        pipeline = Pipeline([Etape('normalisation', preparer, 4), Etape('persistance', ecrire)])
+        pipeline.deposer(info)      # depuis un thread navigateur
+        pipeline.fermer()           # vide chaque étape dans l'ordre
+    """
+
+    def __init__(self, etapes: List[Etape]):
+        self.etapes = etapes
+        for etape, suivante in zip(etapes, etapes[1:]):
+            etape.suivante = suivante
+        for etape in etapes:
+            etape.demarrer()
+
+    def deposer(self, item):
+        """Entrée du pipeline (bloque si la première file est pleine)"""
+        self.etapes[0].file.put(item)
+
+    def en_attente(self) -> Dict[str, int]:
+        return {etape.nom: etape.file.qsize() for etape in self.etapes}
+
+    def fermer(self):
+        """Arrête les étapes une par une : chacune a tout transmis avant que la suivante ne s'arrête"""
+        for etape in self.etapes:
+            etape.arreter()
+
+    def resume(self) -> List[Dict]:
+        return [etape.resume() for etape in self.etapes]
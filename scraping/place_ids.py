@@ -0,0 +1,55 @@
+"""
+Identifiants stables des fiches Google Maps
+Une URL /maps/place/ contient, dans son bloc data=, l'identifiant de la fiche :
+  - !19sChIJ...            -> Place ID (API Places)
+  - !1s0x47e6...:0x1a2b... -> Feature ID (identifiant interne Maps)
+Ces identifiants servent de clé unique (itération de la liste, dédoublonnage, places déjà connues).
+"""
+import re
+from typing import Optional
+from urllib.parse import unquote
+
+_RE_PLACE_ID = re.compile(r'!19s(ChIJ[A-Za-z0-9_\-]+)')
+_RE_FEATURE_ID = re.compile(r'!1s(0x[0-9a-fA-F]+:0x[0-9a-fA-F]+)')
+_RE_CID = re.compile(r'[?&]cid=(\d+)')
+
+
+def extraire_place_id(url: Optional[str]) -> Optional[str]:
+    """
+    Extrait l'identifiant stable d'une fiche depuis son URL Google Maps
+
+    Args:
+        url: URL /maps/place/... (href d'une carte de résultat ou google_maps_url en base)
+
+    Returns:
+        'ChIJ...' ou '0x...:0x...' ou 'cid:<n>', ou None si l'URL n'en contient pas
+    """
+    if not url:
+        return None
+    url = unquote(url)
+    for pattern in (_RE_PLACE_ID, _RE_FEATURE_ID):
+        match = pattern.search(url)
+        if match:
+            return match.group(1).lower() if pattern is _RE_FEATURE_ID else match.group(1)
+    match = _RE_CID.search(url)
+    if match:
+        return f"cid:{match.group(1)}"
+    return None
+
+
+def extraire_feature_id(url: Optional[str]) -> Optional[str]:
+    """Feature ID '0x...:0x...' seul (présent même quand l'URL n'a pas de !19sChIJ)"""
+    match = _RE_FEATURE_ID.search(unquote(url)) if url else None
+    return match.group(1).lower() if match else None
+
+
+def cle_fiche(url: Optional[str]) -> Optional[str]:
+    """
+    Clé unique d'une fiche : place ID si disponible, sinon l'URL sans paramètres de requête
+    """
+    place_id = extraire_place_id(url)
+    if place_id:
+        return place_id
+    if not url or '/maps/place/' not in url:
+        return None
+    return url.split('?')[0]
@@ -0,0 +1,240 @@
+"""
+Limitation de débit partagée entre workers et disjoncteur anti-blocage Google
+- SeauJetons : débit maximal de recherches Google Maps pour tout le processus (tous threads confondus)
+- Disjoncteur : dès qu'un worker voit une page "unusual traffic"/captcha, tous les workers s'arrêtent
+  (pause exponentielle), puis un seul worker sonde avant que les autres ne reprennent, avec un
+  décalage aléatoire pour ne pas repartir tous en même temps.
+"""
+import os
+import time
+import random
+import threading
+import logging
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Textes d'une page de blocage Google (comparés en minuscules)
+MARQUEURS_BLOCAGE = ('unusual traffic', 'trafic inhabituel', 'captcha', "not a robot", 'pas un robot')
+
+
+def est_page_blocage(url: Optional[str], texte: Optional[str]) -> bool:
+    """True si l'URL / le texte visible correspondent à une page de blocage Google"""
+    if url and '/sorry/' in url:
+        return True
+    texte = (texte or '').lower()
+    return any(marqueur in texte for marqueur in MARQUEURS_BLOCAGE)
+
+
+class SeauJetons:
+    """Seau à jetons thread-safe : au plus `debit_par_minute` acquisitions par minute (rafales <= capacité)"""
+
+    def __init__(self, debit_par_minute: float, capacite: Optional[float] = None):
+        self.debit = debit_par_minute / 60.0
+        self.capacite = capacite if capacite is not None else max(1.0, debit_par_minute / 10.0)
+        self._jetons = self.capacite
+        self._dernier = time.time()
+        self._lock = threading.Lock()
+        self.temps_attente_total = 0.0
+
+    def acquerir(self):
+        """Prend un jeton (bloque le temps nécessaire)"""
+        if self.debit <= 0:
+            return
+        while True:
+            with self._lock:
+                maintenant = time.time()
+                self._jetons = min(self.capacite, self._jetons + (maintenant - self._dernier) * self.debit)
+                self._dernier = maintenant
+                if self._jetons >= 1:
+                    self._jetons -= 1
+                    return
+                attente = (1 - self._jetons) / self.debit
+                self.temps_attente_total += attente
+            time.sleep(attente)
+
+
+class Disjoncteur:
+    """
+    Disjoncteur partagé : fermé (normal) -> ouvert (blocage vu, tout le monde attend) -> sonde (un seul essai)
+
+    Le worker qui sort d'attente en premier après la pause fait la sonde ; son résultat
+    (signaler_succes / signaler_blocage) referme ou rouvre le disjoncteur. Seule la sonde peut
+    refermer : un worker dont la recherche était partie avant le blocage ne lève pas la pause commune.
+    Une sonde qui échoue sans blocage (timeout, navigateur planté) rend sa place (liberer_sonde).
+    """
+
+    FERME = 'ferme'
+    OUVERT = 'ouvert'
+    SONDE = 'sonde'
+
+    def __init__(self, pause_base: float = 120.0, pause_max: float = 1800.0, jitter: float = 0.3,
+                 delai_sonde: float = 300.0):
+        """
+        Args:
+            pause_base: Pause après un premier blocage (secondes), doublée à chaque blocage consécutif
+            pause_max: Pause maximale
+            jitter: Décalage aléatoire à la reprise (fraction de la pause, plafonné à 60s)
+            delai_sonde: Sans résultat de la sonde après ce délai, un autre worker peut sonder
+        """
+        self.pause_base = pause_base
+        self.pause_max = pause_max
+        self.jitter = jitter
+        self.delai_sonde = delai_sonde
+        self.etat = self.FERME
+        self.reouverture = 0.0
+        self._debut_sonde = 0.0
+        self._thread_sonde: Optional[int] = None  # ident du thread qui fait la sonde en cours
+        self._cond = threading.Condition()
+        self.nb_blocages = 0
+        self.nb_blocages_consecutifs = 0
+        self.temps_attente_total = 0.0
+
+    def signaler_blocage(self, raison: str = ''):
+        with self._cond:
+            if self.etat == self.OUVERT:
+                return  # Déjà signalé par un autre worker
+            self.nb_blocages += 1
+            self.nb_blocages_consecutifs += 1
+            pause = min(self.pause_max, self.pause_base * 2 ** (self.nb_blocages_consecutifs - 1))
+            self.reouverture = time.time() + pause
+            self.etat = self.OUVERT
+            logger.warning(f"🛑 Blocage Google détecté{f' ({raison})' if raison else ''} : "
+                           f"tous les workers en pause {pause:.0f}s")
+            self._cond.notify_all()
+
+    def signaler_succes(self):
+        """Referme le disjoncteur si l'appelant est la sonde en cours (sans effet sinon)"""
+        with self._cond:
+            if self.etat != self.SONDE or self._thread_sonde != threading.get_ident():
+                return
+            logger.info("✅ Sonde réussie : reprise de tous les workers")
+            self.etat = self.FERME
+            self._thread_sonde = None
+            self.nb_blocages_consecutifs = 0
+            self._cond.notify_all()
+
+    def liberer_sonde(self):
+        """
+        La sonde de l'appelant s'est terminée sans verdict (ni succès ni blocage) : un autre worker
+        peut sonder tout de suite, sans attendre delai_sonde (sans effet si l'appelant n'est pas la sonde)
+        """
+        with self._cond:
+            if self.etat != self.SONDE or self._thread_sonde != threading.get_ident():
+                return
+            logger.info("🔁 Sonde interrompue sans blocage : un autre worker reprend la sonde")
+            self.etat = self.OUVERT
+            self.reouverture = time.time()
+            self._thread_sonde = None
+            self._cond.notify_all()
+
+    def attendre(self, abandon: Optional[Callable[[], bool]] = None) -> Optional[float]:
+        """
+        Bloque tant que le disjoncteur est ouvert (ou qu'une sonde est en cours)
+
+        Args:
+            abandon: Vérifié pendant l'attente ; s'il devient vrai (budget du run épuisé), on cesse d'attendre
+
+        Returns:
+            Secondes passées à attendre, ou None si l'attente a été abandonnée
+        """
+        debut = time.time()
+        sonde = False
+        with self._cond:
+            while True:
+                maintenant = time.time()
+                if self.etat == self.FERME:
+                    break
+                if abandon is not None and abandon():
+                    self.temps_attente_total += maintenant - debut
+                    return None
+                if self.etat == self.OUVERT and maintenant >= self.reouverture:
+                    self.etat = self.SONDE
+                    self._debut_sonde = maintenant
+                    self._thread_sonde = threading.get_ident()
+                    sonde = True
+                    logger.info("🔎 Fin de pause : sonde avant reprise générale")
+                    break
+                if self.etat == self.SONDE and maintenant - self._debut_sonde > self.delai_sonde:
+                    # Sonde sans réponse : ce worker la remplace
+                    self._debut_sonde = maintenant
+                    self._thread_sonde = threading.get_ident()
+                    sonde = True
+                    break
+                if self.etat == self.OUVERT:
+                    delai = self.reouverture - maintenant
+                else:
+                    delai = self.delai_sonde - (maintenant - self._debut_sonde)
+                if abandon is not None:
+                    delai = min(delai, 5.0)  # Revérifier abandon() régulièrement pendant une longue pause
+                self._cond.wait(timeout=max(0.1, delai))
+        attente = time.time() - debut
+        if attente > 0.5 and not sonde:
+            # Reprise étalée : les workers ne repartent pas tous à la même seconde
+            decalage = random.uniform(0, self.jitter * min(attente, 60.0))
+            time.sleep(decalage)
+            attente += decalage
+        if attente > 0.5:
+            with self._cond:
+                self.temps_attente_total += attente
+        return attente
+
+
+class RegulateurGoogle:
+    """Seau à jetons + disjoncteur, à partager entre tous les scrapers d'un run"""
+
+    def __init__(self, seau: SeauJetons, disjoncteur: Disjoncteur, abandon: Optional[Callable[[], bool]] = None):
+        """
+        Args:
+            abandon: Si fourni et vrai (ex : budget de temps du run épuisé), les workers en pause
+                     anti-blocage cessent d'attendre au lieu de bloquer jusqu'à la fin de la pause
+        """
+        self.seau = seau
+        self.disjoncteur = disjoncteur
+        self.abandon = abandon
+
+    def avant_requete(self) -> bool:
+        """
+        À appeler avant chaque recherche Google Maps (attend la fin d'un blocage, puis un jeton)
+
+        Returns:
+            False si l'attente a été abandonnée : ne pas lancer la recherche
+        """
+        if self.disjoncteur.attendre(self.abandon) is None:
+            return False
+        # Attente de jeton bornée (60 / débit secondes) : pas de vérification d'abandon
+        self.seau.acquerir()
+        return True
+
+    def signaler_blocage(self, raison: str = ''):
+        self.disjoncteur.signaler_blocage(raison)
+
+    def signaler_succes(self):
+        self.disjoncteur.signaler_succes()
+
+    def liberer_sonde(self):
+        self.disjoncteur.liberer_sonde()
+
+    def resume(self) -> Dict:
+        return {
+            'blocages': self.disjoncteur.nb_blocages,
+            'attente_blocage_s': round(self.disjoncteur.temps_attente_total, 1),
+            'attente_debit_s': round(self.seau.temps_attente_total, 1),
+        }
+
+
+def regulateur_depuis_env(abandon: Optional[Callable[[], bool]] = None) -> RegulateurGoogle:
+    """
+    Régulateur configuré par variables d'environnement
+
+    Args:
+        abandon: Voir RegulateurGoogle (ex : budget.est_epuise)
+
+    Variables :
+        SCRAPER_REQUESTS_PER_MINUTE : recherches par minute pour tout le processus (défaut 20, 0 = illimité)
+        SCRAPER_BLOCK_PAUSE_S : pause après un premier blocage (défaut 120s, doublée ensuite, max 30 min)
+    """
+    debit = float(os.environ.get('SCRAPER_REQUESTS_PER_MINUTE', '20'))
+    pause = float(os.environ.get('SCRAPER_BLOCK_PAUSE_S', '120'))
+    return RegulateurGoogle(SeauJetons(debit), Disjoncteur(pause_base=pause, pause_max=max(pause, 1800.0)),
+                            abandon=abandon)
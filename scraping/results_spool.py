@@ -0,0 +1,222 @@
+"""
+Spool de résultats en JSONL (une ligne JSON par établissement, en ajout seul)
+Remplace la réécriture complète de scraping_results_github_actions.json à chaque établissement :
+- SpoolResultats : un seul thread écrivain (les workers ne font que déposer dans une file),
+  flush à chaque ligne, fsync par lots
+- LecteurSpool : lecture incrémentale (offset en octets) pour le thread de commit / Streamlit
+- compacter() : reconstruit le JSON habituel ({'results': [...], 'total_results': ...}) à partir du spool
+"""
+import os
+import json
+import time
+import queue
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+_FIN = object()  # Sentinelle d'arrêt du thread écrivain
+
+
+def cle_resultat(r: Dict) -> str:
+    """Clé de dédoublonnage (même règle que l'ancien save_progress)"""
+    return f"{r.get('nom', '')}_{r.get('telephone', '')}_{r.get('ville_recherche', '')}"
+
+
+def chemin_spool(results_file) -> Path:
+    """Spool associé à un fichier de résultats JSON (même nom, extension .jsonl)"""
+    return Path(results_file).with_suffix('.jsonl')
+
+
+class SpoolResultats:
+    """
+    Écrivain unique du spool JSONL
+
+    Usage :
+        spool = SpoolResultats(chemin_spool(results_file), reinitialiser=True)
+        spool.ajouter(info)        # depuis n'importe quel thread, non bloquant
+        spool.fermer()             # vide la file, fsync, arrête le thread
+    """
+
+    def __init__(self, chemin, fsync_lignes: int = 50, fsync_intervalle_s: float = 2.0,
+                 reinitialiser: bool = False):
+        """
+        Args:
+            chemin: Fichier .jsonl
+            fsync_lignes: fsync après ce nombre de lignes écrites...
+            fsync_intervalle_s: ...ou après ce délai (le plus tôt des deux)
+            reinitialiser: Vider le spool existant (nouveau run) au lieu de le prolonger
+        """
+        self.chemin = Path(chemin)
+        self.chemin.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync_lignes = fsync_lignes
+        self.fsync_intervalle_s = fsync_intervalle_s
+        self.nb_ecrits = 0
+        self.nb_doublons = 0
+        self.nb_fsync = 0
+        self._file: queue.Queue = queue.Queue()
+        self._cles = set() if reinitialiser else {cle_resultat(r) for r in lire_spool(self.chemin)}
+        self._fichier = open(self.chemin, 'w' if reinitialiser else 'a', encoding='utf-8')
+        self._thread = threading.Thread(target=self._ecrire, name='spool-resultats', daemon=True)
+        self._thread.start()
+
+    def ajouter(self, resultat: Dict):
+        """Dépose un résultat (écrit par le thread écrivain)"""
+        self._file.put(resultat)
+
+    def _ecrire(self):
+        en_attente = 0
+        dernier_fsync = time.time()
+        while True:
+            try:
+                resultat = self._file.get(timeout=self.fsync_intervalle_s)
+            except queue.Empty:
+                resultat = None
+            if resultat is _FIN:
+                break
+            if resultat is not None:
+                cle = cle_resultat(resultat)
+                if cle in self._cles:
+                    self.nb_doublons += 1
+                else:
+                    self._cles.add(cle)
+                    try:
+                        self._fichier.write(json.dumps(resultat, ensure_ascii=False, default=str) + '\n')
+                        # flush à chaque ligne : visible immédiatement par les lecteurs (pas encore durable)
+                        self._fichier.flush()
+                        self.nb_ecrits += 1
+                        en_attente += 1
+                    except (OSError, TypeError, ValueError) as e:
+                        logger.warning(f"⚠️ Spool: écriture impossible ({e})")
+            if en_attente and (en_attente >= self.fsync_lignes
+                               or time.time() - dernier_fsync >= self.fsync_intervalle_s):
+                self._fsync()
+                en_attente = 0
+                dernier_fsync = time.time()
+        self._fsync()
+
+    def _fsync(self):
+        try:
+            self._fichier.flush()
+            os.fsync(self._fichier.fileno())
+            self.nb_fsync += 1
+        except OSError as e:
+            logger.warning(f"⚠️ Spool: fsync impossible ({e})")
+
+    def fermer(self):
+        """Écrit tout ce qui reste dans la file puis ferme le fichier"""
+        if not self._thread.is_alive():
+            return
+        self._file.put(_FIN)
+        self._thread.join()
+        self._fichier.close()
+
+
+class LecteurSpool:
+    """
+    Lecture incrémentale d'un spool : chaque appel ne lit que les lignes complètes ajoutées depuis le précédent
+    (une ligne en cours d'écriture, sans '\\n' final, est relue au prochain appel)
+    """
+
+    def __init__(self, chemin):
+        self.chemin = Path(chemin)
+        self.offset = 0
+        self.nb_lus = 0
+
+    def lire_nouveaux(self) -> List[Dict]:
+        if not self.chemin.exists():
+            return []
+        if self.chemin.stat().st_size < self.offset:
+            # Spool réinitialisé (nouveau run) : on repart du début
+            self.offset = 0
+        nouveaux = []
+        with open(self.chemin, 'rb') as f:
+            f.seek(self.offset)
+            for ligne in f:
+                if not ligne.endswith(b'\n'):
+                    break
+                self.offset += len(ligne)
+                try:
+                    nouveaux.append(json.loads(ligne))
+                except ValueError:
+                    continue
+        self.nb_lus += len(nouveaux)
+        return nouveaux
+
+
+def lire_spool(chemin) -> List[Dict]:
+    """Tous les résultats complets du spool"""
+    return LecteurSpool(chemin).lire_nouveaux()
+
+
+def compacter(chemin_spool_jsonl, results_file) -> int:
+    """
+    Reconstruit le JSON de résultats ({'timestamp', 'total_results', 'results', 'last_updated'}) depuis le spool
+
+    Écriture atomique (fichier temporaire + os.replace) : un lecteur ne voit jamais un JSON à moitié écrit.
+
+    Returns:
+        Nombre de résultats écrits
+    """
+    results_file = Path(results_file)
+    resultats = []
+    cles = set()
+    for r in lire_spool(chemin_spool_jsonl):
+        cle = cle_resultat(r)
+        if cle not in cles:
+            cles.add(cle)
+            resultats.append(r)
+    timestamp = datetime.now().isoformat()
+    try:
+        with open(results_file, 'r', encoding='utf-8') as f:
+            timestamp = json.load(f).get('timestamp', timestamp)
+    except (OSError, ValueError, AttributeError):
+        pass
+    data = {
+        'timestamp': timestamp,
+        'total_results': len(resultats),
+        'results': resultats,
+        'last_updated': datetime.now().isoformat(),
+    }
+    # Fichier temporaire unique dans le même dossier (os.replace atomique) : deux compactages
+    # simultanés (commit périodique / fin de run) n'écrivent pas dans le même fichier
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=results_file.parent,
+                                     prefix=results_file.name + '.', suffix='.tmp', delete=False) as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    try:
+        os.replace(f.name, results_file)
+    except OSError:
+        os.unlink(f.name)
+        raise
+    return len(resultats)
+
+
+def charger_resultats(results_file) -> List[Dict]:
+    """
+    Résultats d'un run : JSON compacté + lignes du spool pas encore compactées (run en cours / interrompu)
+
+    Un JSON suivi de données en trop (ancien fichier mal fusionné) est lu jusqu'à la fin du premier objet.
+    """
+    results_file = Path(results_file)
+    resultats: List[Dict] = []
+    if results_file.exists():
+        try:
+            with open(results_file, 'r', encoding='utf-8') as f:
+                data, _ = json.JSONDecoder().raw_decode(f.read().lstrip())
+            if isinstance(data, dict):
+                resultats = list(data.get('results', []))
+            elif isinstance(data, list):
+                resultats = data
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Lecture {results_file.name} impossible: {e}")
+    cles = {cle_resultat(r) for r in resultats}
+    for r in lire_spool(chemin_spool(results_file)):
+        cle = cle_resultat(r)
+        if cle not in cles:
+            cles.add(cle)
+            resultats.append(r)
+    return resultats
@@ -0,0 +1,175 @@
+"""
+Budget de temps d'un run et manifeste de continuation
+Le job GitHub Actions est tué à timeout-minutes : les villes restantes étaient perdues.
+BudgetTemps arrête de lancer de nouvelles villes quand il ne reste plus le temps d'en finir une
+(durée estimée par moyenne mobile des villes déjà faites) ; les tâches non terminées sont écrites
+dans un manifeste JSON que le run suivant reprend. SuiviTaches le réécrit à chaque commit périodique,
+pour qu'un job tué sans arrêt propre laisse quand même la liste des villes restantes.
+"""
+import os
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CHEMIN_MANIFESTE = Path('data/continuation_manifest.json')
+
+
+class BudgetTemps:
+    """
+    Usage :
+        budget = BudgetTemps(330 * 60, marge_s=600)
+        if budget.peut_demarrer():
+            ... lancer une ville ...
+            budget.enregistrer_duree(duree)
+    """
+
+    def __init__(self, budget_s: float, marge_s: float = 600.0, duree_initiale_s: float = 300.0,
+                 alpha: float = 0.3):
+        """
+        Args:
+            budget_s: Temps total du run (0 = illimité)
+            marge_s: Réserve pour vider les files, compacter et commiter après la dernière ville
+            duree_initiale_s: Estimation de la durée d'une ville avant toute mesure
+            alpha: Poids de la dernière mesure dans la moyenne mobile
+        """
+        self.budget_s = budget_s
+        self.marge_s = marge_s
+        self.duree_estimee_s = duree_initiale_s
+        self.alpha = alpha
+        self.debut = time.time()
+        self.epuise = False
+
+    @property
+    def actif(self) -> bool:
+        return self.budget_s > 0
+
+    def ecoule(self) -> float:
+        return time.time() - self.debut
+
+    def restant(self) -> float:
+        return self.budget_s - self.ecoule() if self.actif else float('inf')
+
+    def enregistrer_duree(self, duree_s: float):
+        """Durée réelle d'une ville (moyenne mobile exponentielle)"""
+        self.duree_estimee_s = self.alpha * duree_s + (1 - self.alpha) * self.duree_estimee_s
+
+    def peut_demarrer(self) -> bool:
+        """True s'il reste le temps de finir une ville de plus avant la marge de fin"""
+        if not self.actif:
+            return True
+        if not self.epuise and self.restant() - self.marge_s < self.duree_estimee_s:
+            self.epuise = True
+            logger.warning(f"⏰ Budget bientôt atteint ({self.ecoule() / 60:.0f}/{self.budget_s / 60:.0f} min, "
+                           f"~{self.duree_estimee_s / 60:.1f} min par ville) : plus de nouvelles villes")
+        return not self.epuise
+
+    def est_epuise(self) -> bool:
+        """
+        True une fois le budget épuisé, ou dès qu'il ne reste que la marge de fin
+        (vérifié aussi par les workers en attente, quand aucune ville ne se termine pour appeler peut_demarrer)
+        """
+        if self.actif and not self.epuise and self.restant() <= self.marge_s:
+            self.epuise = True
+            logger.warning(f"⏰ Budget atteint ({self.ecoule() / 60:.0f}/{self.budget_s / 60:.0f} min) : "
+                           f"les attentes en cours sont abandonnées")
+        return self.epuise
+
+
+def budget_depuis_env() -> BudgetTemps:
+    """
+    Variables :
+        RUN_BUDGET_MINUTES : durée maximale du run (défaut 0 = illimité ; le workflow la règle sous timeout-minutes)
+        RUN_BUDGET_MARGIN_MINUTES : réserve de fin de run (défaut 10)
+    """
+    budget = float(os.environ.get('RUN_BUDGET_MINUTES', '0'))
+    marge = float(os.environ.get('RUN_BUDGET_MARGIN_MINUTES', '10'))
+    return BudgetTemps(budget * 60, marge * 60)
+
+
+def ecrire_manifeste(taches: List[Dict], raison: str, parametres: Optional[Dict] = None,
+                     chemin: Path = CHEMIN_MANIFESTE):
+    """Écrit les tâches non terminées (écriture atomique)"""
+    chemin.parent.mkdir(parents=True, exist_ok=True)
+    manifeste = {
+        'created_at': datetime.now().isoformat(),
+        'raison': raison,
+        'parametres': parametres or {},
+        'nb_taches': len(taches),
+        'taches': taches,
+    }
+    temporaire = chemin.with_suffix('.json.tmp')
+    with open(temporaire, 'w', encoding='utf-8') as f:
+        json.dump(manifeste, f, ensure_ascii=False, indent=2)
+    os.replace(temporaire, chemin)
+
+
+def lire_manifeste(chemin: Path = CHEMIN_MANIFESTE) -> Optional[Dict]:
+    """Manifeste du run précédent (None si absent ou illisible)"""
+    if not chemin.exists():
+        return None
+    try:
+        with open(chemin, 'r', encoding='utf-8') as f:
+            manifeste = json.load(f)
+        return manifeste if isinstance(manifeste.get('taches'), list) else None
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning(f"⚠️ Manifeste illisible ({chemin}): {e}")
+        return None
+
+
+def supprimer_manifeste(chemin: Path = CHEMIN_MANIFESTE):
+    """Run terminé : plus rien à reprendre"""
+    if chemin.exists():
+        chemin.unlink()
+
+
+class SuiviTaches:
+    """
+    Tâches du run encore à faire (non lancées, en cours ou en échec), pour le manifeste intermédiaire
+
+    Usage :
+        suivi = SuiviTaches(toutes_villes, parametres)
+        suivi.terminer(task)        # ville terminée (depuis la boucle de dispatch)
+        suivi.sauvegarder()         # à chaque commit périodique
+    """
+
+    def __init__(self, taches: List[Dict], parametres: Optional[Dict] = None):
+        self.taches = list(taches)
+        self.parametres = parametres or {}
+        self._terminees = set()
+        self._lock = threading.Lock()
+
+    def terminer(self, tache: Dict):
+        with self._lock:
+            self._terminees.add(id(tache))
+
+    def restantes(self) -> List[Dict]:
+        with self._lock:
+            return [t for t in self.taches if id(t) not in self._terminees]
+
+    def sauvegarder(self, chemin: Path = CHEMIN_MANIFESTE) -> int:
+        """Écrit le manifeste des tâches restantes (le supprime s'il n'en reste aucune) ; retourne leur nombre"""
+        restantes = self.restantes()
+        if restantes:
+            ecrire_manifeste(restantes, 'en_cours', self.parametres, chemin)
+        else:
+            supprimer_manifeste(chemin)
+        return len(restantes)
+
+
+def filtrer_taches_faites(taches: List[Dict], est_faite: Callable[[str, str, str], bool]) -> List[Dict]:
+    """Retire les tâches déjà présentes dans l'historique (est_faite(metier, departement, ville))"""
+    restantes = []
+    for tache in taches:
+        try:
+            faite = est_faite(tache['metier'], tache['departement'], tache['ville'])
+        except Exception:
+            faite = False
+        if not faite:
+            restantes.append(tache)
+    return restantes
@@ -0,0 +1,125 @@
+"""
+Ordre appris des chaînes de sélecteurs de secours
+Le scraper essaie souvent plusieurs stratégies dans un ordre fixe (barre de recherche, panneau
+à scroller, conteneurs alternatifs, nom de l'établissement...). Chaque échec coûte un appel
+WebDriver, parfois un WebDriverWait de 10s. On enregistre quelle stratégie réussit, on garde
+ces statistiques sur disque, et on essaie la gagnante en premier la fois suivante.
+"""
+import json
+import threading
+import logging
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+FICHIER_STATS_DEFAUT = Path(__file__).parent.parent / "data" / "selector_stats.json"
+
+T = TypeVar('T')
+
+
+class StatsSelecteurs:
+    """
+    Compteurs succès/échecs par (chaîne, stratégie), persistés en JSON
+
+    Thread-safe : une seule instance partagée par processus (voir stats_selecteurs()).
+    """
+
+    def __init__(self, fichier: Path = FICHIER_STATS_DEFAUT):
+        self.fichier = Path(fichier)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self._modifie = False
+        self._charger()
+
+    def _charger(self):
+        try:
+            self._stats = json.loads(self.fichier.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self._stats = {}
+
+    def _compteurs(self, chaine: str, strategie: str) -> Dict[str, int]:
+        return self._stats.setdefault(chaine, {}).setdefault(strategie, {'succes': 0, 'echecs': 0})
+
+    def succes(self, chaine: str, strategie: str):
+        """La stratégie a trouvé ce qu'on cherchait"""
+        with self._lock:
+            self._compteurs(chaine, strategie)['succes'] += 1
+            self._modifie = True
+
+    def echec(self, chaine: str, strategie: str):
+        """La stratégie a été essayée sans résultat"""
+        with self._lock:
+            self._compteurs(chaine, strategie)['echecs'] += 1
+            self._modifie = True
+
+    def score(self, chaine: str, strategie: str) -> float:
+        """Taux de succès lissé (une stratégie jamais essayée vaut 0.5)"""
+        c = self._stats.get(chaine, {}).get(strategie)
+        if not c:
+            return 0.5
+        return (c['succes'] + 1) / (c['succes'] + c['echecs'] + 2)
+
+    def ordonner(self, chaine: str, strategies: List[T], cle: Optional[Callable[[T], str]] = None) -> List[T]:
+        """
+        Trie les stratégies par score décroissant (l'ordre d'origine départage les égalités)
+
+        Args:
+            chaine: Nom de la chaîne de secours (ex : 'barre_recherche')
+            strategies: Liste d'origine (sélecteurs, dicts, tuples...)
+            cle: Fonction qui donne le nom stable d'une stratégie (str(x) par défaut)
+        """
+        cle = cle or str
+        with self._lock:
+            return sorted(strategies, key=lambda s: -self.score(chaine, cle(s)))
+
+    def essayer(self, chaine: str, strategies: List[T], fonction: Callable[[T], Optional[object]],
+                cle: Optional[Callable[[T], str]] = None):
+        """
+        Essaie les stratégies dans l'ordre appris et enregistre le résultat
+
+        Args:
+            fonction: Appelée avec chaque stratégie ; un retour "vrai" = succès, None/vide/exception = échec
+
+        Returns:
+            (stratégie gagnante, résultat) ou (None, None)
+        """
+        cle = cle or str
+        for strategie in self.ordonner(chaine, strategies, cle):
+            try:
+                resultat = fonction(strategie)
+            except Exception as e:
+                logger.debug(f"Stratégie {chaine}/{cle(strategie)} en erreur: {str(e)[:60]}")
+                resultat = None
+            if resultat:
+                self.succes(chaine, cle(strategie))
+                return strategie, resultat
+            self.echec(chaine, cle(strategie))
+        return None, None
+
+    def sauvegarder(self):
+        """Écrit les statistiques sur disque (si elles ont changé)"""
+        with self._lock:
+            if not self._modifie:
+                return
+            try:
+                self.fichier.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.fichier.with_suffix('.tmp')
+                tmp.write_text(json.dumps(self._stats, ensure_ascii=False, indent=1), encoding='utf-8')
+                tmp.replace(self.fichier)
+                self._modifie = False
+            except OSError as e:
+                logger.debug(f"Impossible de sauvegarder les stats de sélecteurs: {e}")
+
+
+_instance: Optional[StatsSelecteurs] = None
+_instance_lock = threading.Lock()
+
+
+def stats_selecteurs() -> StatsSelecteurs:
+    """Instance partagée par tout le processus"""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = StatsSelecteurs()
+        return _instance
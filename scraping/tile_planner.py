@@ -0,0 +1,131 @@
+"""
+Planification des recherches par tuiles géographiques
+Chercher un métier dans chaque commune d'un département relance quasiment la même recherche
+pour des petites communes voisines (mêmes établissements, recliqués à chaque fois).
+On regroupe les communes (centres fournis par geo.api.gouv.fr) en tuiles de couverture :
+une seule recherche par tuile, sur une URL coordonnées + zoom, avec un bilan du recouvrement évité.
+"""
+import math
+import logging
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+RAYON_TERRE_KM = 6371.0
+# Demi-largeur (pixels) de la zone de carte visible à côté du panneau de résultats
+DEMI_LARGEUR_CARTE_PX = 500
+ZOOM_MIN = 10
+ZOOM_MAX = 15
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distance orthodromique (haversine)"""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * RAYON_TERRE_KM * math.asin(math.sqrt(a))
+
+
+def zoom_pour_rayon(rayon_km: float, latitude: float) -> int:
+    """Niveau de zoom Maps dont la zone visible couvre environ `rayon_km` autour du centre"""
+    metres_par_pixel = rayon_km * 1000 / DEMI_LARGEUR_CARTE_PX
+    zoom = math.log2(156543.03392 * math.cos(math.radians(latitude)) / metres_par_pixel)
+    return max(ZOOM_MIN, min(ZOOM_MAX, int(zoom)))
+
+
+def _a_coordonnees(commune: Dict) -> bool:
+    return commune.get('latitude') is not None and commune.get('longitude') is not None
+
+
+def planifier_tuiles(communes: List[Dict], rayon_km: float = 5.0) -> List[Dict]:
+    """
+    Regroupe les communes en tuiles (regroupement glouton, communes les plus peuplées d'abord)
+
+    Chaque commune non encore couverte ouvre une tuile qui absorbe toutes les communes
+    non couvertes à moins de `rayon_km` de son centre.
+
+    Args:
+        communes: Dicts de get_communes_from_api ('nom', 'population', 'latitude', 'longitude')
+        rayon_km: Rayon de couverture d'une recherche
+
+    Returns:
+        Tuiles : {'nom', 'latitude', 'longitude', 'zoom', 'rayon_km', 'communes', 'population'}
+        (une commune sans coordonnées donne une tuile sans position : recherche par nom)
+    """
+    restantes = sorted(communes, key=lambda c: c.get('population') or 0, reverse=True)
+    tuiles = []
+    while restantes:
+        graine = restantes.pop(0)
+        if not _a_coordonnees(graine):
+            tuiles.append({'nom': graine['nom'], 'latitude': None, 'longitude': None, 'zoom': None,
+                           'rayon_km': rayon_km, 'communes': [graine], 'population': graine.get('population') or 0})
+            continue
+        membres = [graine]
+        autres = []
+        for commune in restantes:
+            if _a_coordonnees(commune) and distance_km(graine['latitude'], graine['longitude'],
+                                                       commune['latitude'], commune['longitude']) <= rayon_km:
+                membres.append(commune)
+            else:
+                autres.append(commune)
+        restantes = autres
+        tuiles.append({
+            'nom': graine['nom'],
+            'latitude': graine['latitude'],
+            'longitude': graine['longitude'],
+            'zoom': zoom_pour_rayon(rayon_km, graine['latitude']),
+            'rayon_km': rayon_km,
+            'communes': membres,
+            'population': sum(c.get('population') or 0 for c in membres),
+        })
+    return tuiles
+
+
+def _intersection_disques(d: float, r: float) -> float:
+    """Part de l'aire d'un disque de rayon r couverte par un autre disque de même rayon à distance d"""
+    if d >= 2 * r:
+        return 0.0
+    aire = 2 * r * r * math.acos(d / (2 * r)) - (d / 2) * math.sqrt(4 * r * r - d * d)
+    return aire / (math.pi * r * r)
+
+
+def rapport_recouvrement(tuiles: List[Dict]) -> Dict:
+    """
+    Bilan estimé du regroupement
+
+    Le recouvrement d'une commune absorbée est la part de sa zone de recherche (disque de rayon_km)
+    déjà couverte par la recherche de sa tuile : c'est la proportion de résultats qu'on aurait recliqués.
+
+    Returns:
+        {'recherches_avant', 'recherches_apres', 'recherches_evitees', 'reduction_pct', 'recouvrement_moyen_pct'}
+    """
+    avant = sum(len(t['communes']) for t in tuiles)
+    apres = len(tuiles)
+    recouvrements = []
+    for tuile in tuiles:
+        if tuile['latitude'] is None:
+            continue
+        for commune in tuile['communes'][1:]:
+            d = distance_km(tuile['latitude'], tuile['longitude'], commune['latitude'], commune['longitude'])
+            recouvrements.append(_intersection_disques(d, tuile['rayon_km']))
+    return {
+        'recherches_avant': avant,
+        'recherches_apres': apres,
+        'recherches_evitees': avant - apres,
+        'reduction_pct': round(100 * (avant - apres) / avant, 1) if avant else 0.0,
+        'recouvrement_moyen_pct': round(100 * sum(recouvrements) / len(recouvrements), 1) if recouvrements else 0.0,
+    }
+
+
+def position_tuile(tuile: Dict) -> Optional[Dict]:
+    """Position à passer à GoogleMapsScraper.iter_scrape(position=...) (None si pas de coordonnées)"""
+    if tuile.get('latitude') is None:
+        return None
+    return {'latitude': tuile['latitude'], 'longitude': tuile['longitude'], 'zoom': tuile['zoom']}
+
+
+def url_recherche_position(base_url: str, recherche: str, position: Dict) -> str:
+    """URL de recherche centrée sur des coordonnées : <base>/search/<métier>/@lat,lng,<zoom>z"""
+    return (f"{base_url}/search/{quote(recherche)}/"
+            f"@{position['latitude']:.6f},{position['longitude']:.6f},{position['zoom']}z")
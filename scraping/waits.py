@@ -0,0 +1,193 @@
+"""
+Moteur d'attente événementiel pour le scraper Google Maps
+Remplace les time.sleep() fixes : on attend une condition DOM (MutationObserver côté page)
+avec un timeout dur, et on rend la main dès que le contenu est réellement prêt.
+"""
+import time
+import logging
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# ==================== PRÉDICATS (expressions JS, `args` = dict passé depuis Python) ====================
+
+# Le document est chargé
+DOCUMENT_PRET = "document.readyState === 'complete'"
+
+# Des résultats de recherche (cartes ou liens de fiche) sont présents
+RESULTATS_PRESENTS = (
+    "document.querySelector('a[href*=\"/maps/place/\"]') !== null || "
+    "document.querySelector('div[role=\"article\"]') !== null"
+)
+
+# Un panneau de résultats (ou un panneau principal) existe
+PANNEAU_RESULTATS_PRESENT = (
+    "document.querySelector('div[role=\"feed\"]') !== null || "
+    "document.querySelector('div[role=\"main\"]') !== null"
+)
+
+# La page de consentement est terminée (redirigée vers Maps)
+HORS_CONSENTEMENT = (
+    "window.location.href.indexOf('consent.google') === -1 && "
+    "document.querySelector('div[role=\"main\"], div[role=\"feed\"], input#searchboxinput') !== null"
+)
+
+# La barre de recherche a été créée par le JS de Maps
+BARRE_RECHERCHE_PRESENTE = (
+    "document.querySelector('input#searchboxinput, input[aria-label*=\"Rechercher\"], "
+    "input[aria-label*=\"Search\"], input[placeholder*=\"Rechercher\"], input[placeholder*=\"Search\"]') !== null"
+)
+
+# Le panneau de détail affiche la fiche attendue (args.attendu) ou, à défaut, un titre différent de args.ancien
+# (args.ancien null : pas de titre de référence, seule la fiche attendue est acceptée)
+TITRE_PANNEAU_CHANGE = """(function() {
+    var hs = document.querySelectorAll('div[role="main"] h1');
+    var attendu = (args.attendu || '').toLowerCase().slice(0, 10);
+    for (var i = hs.length - 1; i >= 0; i--) {
+        var titre = (hs[i].innerText || '').trim();
+        if (!titre) { continue; }
+        if (attendu && titre.toLowerCase().indexOf(attendu) !== -1) { return true; }
+        if (i !== hs.length - 1) { continue; }
+        if (args.ancien === null ? !attendu : titre !== args.ancien) { return true; }
+    }
+    return false;
+})()"""
+
+# Le nombre de liens de fiches a dépassé args.n, ou la fin de liste est affichée
+LISTE_A_GRANDI = """(function() {
+    if (document.querySelectorAll('a[href*="/maps/place/"]').length > args.n) { return true; }
+    var fin = document.querySelector('span.HlvSq, p.fontBodyMedium > span > span');
+    var texte = fin ? (fin.innerText || '').toLowerCase() : '';
+    return texte.indexOf('fin de la liste') !== -1 || texte.indexOf('end of the list') !== -1;
+})()"""
+
+# Lire le titre actuel du panneau de détail (pour le comparer après un clic)
+TITRE_PANNEAU_JS = """
+var hs = document.querySelectorAll('div[role="main"] h1');
+return hs.length ? (hs[hs.length - 1].innerText || '').trim() : '';
+"""
+
+# Script asynchrone : résout dès que le prédicat est vrai (mutation DOM ou vérification périodique)
+_ATTENTE_ASYNC_JS = """
+var args = arguments[0];
+var timeoutMs = arguments[1];
+var done = arguments[arguments.length - 1];
+function ok() { try { return !!(%s); } catch (e) { return false; } }
+if (ok()) { done(true); return; }
+var fini = false;
+function terminer(valeur) {
+    if (fini) { return; }
+    fini = true;
+    obs.disconnect();
+    clearInterval(intervalle);
+    clearTimeout(minuteur);
+    done(valeur);
+}
+var obs = new MutationObserver(function() { if (ok()) { terminer(true); } });
+obs.observe(document.documentElement || document, {childList: true, subtree: true, attributes: true, characterData: true});
+// Filet de sécurité pour les changements non-DOM (readyState, URL)
+var intervalle = setInterval(function() { if (ok()) { terminer(true); } }, 250);
+var minuteur = setTimeout(function() { terminer(ok()); }, timeoutMs);
+"""
+
+
+class MoteurAttente:
+    """
+    Attentes basées sur des conditions DOM avec timeout dur
+
+    Chaque attente est mesurée : `derniere_duree` et `historique` servent à l'instrumentation
+    et à l'ajustement adaptatif des délais.
+    """
+
+    def __init__(self, driver, observateur: Optional[Callable[[str, float, bool], None]] = None):
+        """
+        Args:
+            driver: Driver Selenium
+            observateur: Appelé après chaque attente avec (nom, durée, succès)
+                         (ex : ControleurDelais.observer pour l'ajustement adaptatif)
+        """
+        self.driver = driver
+        self.observateur = observateur
+        self.derniere_duree = 0.0
+        self.nb_attentes = 0
+        self.nb_timeouts = 0
+        self.historique: Dict[str, list] = {}
+
+    def attendre(self, predicat: str, timeout: float, args: Optional[Dict] = None, nom: str = 'condition') -> bool:
+        """
+        Attend qu'une expression JS devienne vraie
+
+        Args:
+            predicat: Expression JS (peut utiliser `args`)
+            timeout: Timeout dur en secondes
+            args: Dict sérialisable passé au prédicat
+            nom: Nom de l'attente (pour les statistiques)
+
+        Returns:
+            True si la condition est remplie avant le timeout
+        """
+        debut = time.time()
+        args = args or {}
+        timeout = max(0.1, float(timeout))
+        try:
+            self.driver.set_script_timeout(timeout + 5)
+            ok = bool(self.driver.execute_async_script(_ATTENTE_ASYNC_JS % predicat, args, int(timeout * 1000)))
+        except Exception as e:
+            # Navigation pendant l'attente (le script est détruit) : repli sur un sondage côté Python
+            logger.debug(f"   ⏳ Attente '{nom}' interrompue ({str(e)[:60]}), sondage...")
+            ok = self._sonder(predicat, args, debut + timeout)
+
+        self._enregistrer(nom, time.time() - debut, ok)
+        return ok
+
+    def _sonder(self, predicat: str, args: Dict, fin: float, intervalle: float = 0.2) -> bool:
+        """Sondage périodique (repli si le script asynchrone est interrompu par une navigation)"""
+        script = "var args = arguments[0]; try { return !!(%s); } catch (e) { return false; }" % predicat
+        while True:
+            try:
+                if self.driver.execute_script(script, args):
+                    return True
+            except Exception:
+                pass
+            if time.time() >= fin:
+                return False
+            time.sleep(intervalle)
+
+    def _enregistrer(self, nom: str, duree: float, ok: bool):
+        self.derniere_duree = duree
+        self.nb_attentes += 1
+        if not ok:
+            self.nb_timeouts += 1
+            logger.debug(f"   ⏱️ Timeout attente '{nom}' ({duree:.1f}s)")
+        self.historique.setdefault(nom, []).append(duree)
+        if self.observateur:
+            try:
+                self.observateur(nom, duree, ok)
+            except Exception as e:
+                logger.debug(f"Erreur observateur d'attente: {e}")
+
+    def titre_panneau(self) -> str:
+        """Titre actuel du panneau de détail ('' si aucun)"""
+        try:
+            return self.driver.execute_script(TITRE_PANNEAU_JS) or ''
+        except Exception:
+            return ''
+
+    def attendre_document(self, timeout: float) -> bool:
+        return self.attendre(DOCUMENT_PRET, timeout, nom='document')
+
+    def attendre_resultats(self, timeout: float) -> bool:
+        return self.attendre(RESULTATS_PRESENTS, timeout, nom='resultats')
+
+    def attendre_panneau_detail(self, ancien_titre: Optional[str], nom_attendu: Optional[str], timeout: float) -> bool:
+        """
+        Attend que le panneau de détail affiche une nouvelle fiche (titre changé)
+
+        ancien_titre=None : titre d'avant inconnu, on attend le nom attendu (n'importe quel titre sans nom attendu)
+        """
+        return self.attendre(TITRE_PANNEAU_CHANGE, timeout,
+                             {'ancien': ancien_titre, 'attendu': nom_attendu or ''}, nom='panneau_detail')
+
+    def attendre_liste_grandit(self, nb_actuel: int, timeout: float) -> bool:
+        """Attend que de nouvelles cartes soient chargées après un scroll (ou la fin de liste)"""
+        return self.attendre(LISTE_A_GRANDI, timeout, {'n': nb_actuel}, nom='scroll')
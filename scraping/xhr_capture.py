@@ -0,0 +1,241 @@
+"""
+Capture des réponses JSON internes de la recherche Google Maps
+La liste de résultats est alimentée par des requêtes XHR (/search?tbm=map...) dont la réponse
+contient déjà, sous forme structurée, nom, téléphone, adresse, note, avis et site web de chaque fiche.
+On lit ces réponses via le journal de performance Chrome (Network.responseReceived / loadingFinished)
+et CDP Network.getResponseBody, puis on les décode dans le même format que l'extraction DOM.
+
+Le format n'est pas documenté : les positions ci-dessous sont celles observées dans les réponses
+actuelles. Tout champ introuvable reste à None et l'extraction DOM sert de repli.
+
+Vérification hors ligne sur des réponses enregistrées (voir SCRAPER_XHR_DUMP) :
+    python -m scraping.xhr_capture data/xhr_captures/*.json
+Réponses anonymisées de référence : tests/fixtures/xhr (tests/test_xhr_capture.py)
+"""
+import os
+import re
+import json
+import time
+import logging
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import quote_plus
+
+from scraping.dom_snapshot import completer_localisation, est_site_valide, nettoyer_adresse, nettoyer_nom
+from scraping.place_ids import cle_fiche, extraire_feature_id
+
+logger = logging.getLogger(__name__)
+
+# URLs des réponses de recherche (liste de résultats, pages suivantes au scroll)
+_RE_URL_RECHERCHE = re.compile(r'/search\?tbm=map|/maps/search/\?|/maps/preview/search')
+
+# Dossier où enregistrer les réponses brutes si SCRAPER_XHR_DUMP est défini (pour constituer des fixtures)
+DOSSIER_CAPTURES = Path(__file__).parent.parent / "data" / "xhr_captures"
+
+_PREFIXE_ANTI_XSSI = ")]}'"
+
+
+def est_url_recherche(url: Optional[str]) -> bool:
+    return bool(url) and _RE_URL_RECHERCHE.search(url) is not None
+
+
+def _chemin(donnees, *indices):
+    """donnees[i][j]... sans lever d'exception (None si un niveau manque)"""
+    for i in indices:
+        try:
+            donnees = donnees[i]
+        except (IndexError, KeyError, TypeError):
+            return None
+    return donnees
+
+
+def charger_json_maps(texte: str):
+    """
+    Décode le corps d'une réponse de recherche Maps
+
+    Formes rencontrées :
+        )]}'\\n[...]
+        {"c":0,"d":")]}'\\n[...]"}/*""*/
+    """
+    texte = (texte or '').strip()
+    if texte.endswith('/*""*/'):
+        texte = texte[:-len('/*""*/')]
+    if texte.startswith('{'):
+        try:
+            texte = json.loads(texte).get('d') or ''
+        except (ValueError, AttributeError):
+            return None
+    texte = texte.strip()
+    if texte.startswith(_PREFIXE_ANTI_XSSI):
+        texte = texte[len(_PREFIXE_ANTI_XSSI):]
+    try:
+        return json.loads(texte)
+    except ValueError:
+        return None
+
+
+def _iterer_fiches(donnees):
+    """Trouve les tableaux "fiche" (nom en [11], identifiant 0x..:0x.. en [10]) où qu'ils soient"""
+    pile = [donnees]
+    while pile:
+        noeud = pile.pop()
+        if not isinstance(noeud, list):
+            continue
+        if (len(noeud) > 11 and isinstance(noeud[11], str) and isinstance(noeud[10], str)
+                and noeud[10].startswith('0x')):
+            yield noeud
+            continue
+        pile.extend(reversed(noeud))
+
+
+def decoder_fiche(fiche: List, normaliser_telephone: Optional[Callable[[str], Optional[str]]] = None) -> Dict:
+    """
+    Construit le dict `info` (même format que parser_etat_panneau) depuis un tableau fiche
+
+    Args:
+        normaliser_telephone: GoogleMapsScraper._normaliser_telephone (sinon 10 chiffres bruts)
+    """
+    info = {
+        'nom': None,
+        'google_maps_url': None,
+        'telephone': None,
+        'site_web': None,
+        'adresse': None,
+        'code_postal': None,
+        'ville': None,
+        'note': None,
+        'nb_avis': None
+    }
+    info['nom'] = nettoyer_nom(_chemin(fiche, 11))
+
+    identifiant = _chemin(fiche, 10)
+    place_id = _chemin(fiche, 78)
+    lat, lng = _chemin(fiche, 9, 2), _chemin(fiche, 9, 3)
+    if info['nom'] and identifiant:
+        data = f"!4m5!3m4!1s{identifiant}"
+        if lat is not None and lng is not None:
+            data += f"!8m2!3d{lat}!4d{lng}"
+        if isinstance(place_id, str) and place_id.startswith('ChIJ'):
+            data += f"!19s{place_id}"
+        info['google_maps_url'] = f"https://www.google.com/maps/place/{quote_plus(info['nom'])}/data={data}"
+
+    telephone = _chemin(fiche, 178, 0, 0) or _chemin(fiche, 3, 0)
+    if isinstance(telephone, str):
+        tel_clean = ''.join(filter(str.isdigit, telephone.replace('+33', '0')))
+        if len(tel_clean) == 10 and tel_clean.startswith('0'):
+            info['telephone'] = normaliser_telephone(tel_clean) if normaliser_telephone else tel_clean
+
+    site = _chemin(fiche, 7, 0)
+    if isinstance(site, str) and est_site_valide(site):
+        info['site_web'] = site
+
+    adresse = _chemin(fiche, 39) or _chemin(fiche, 18)
+    if isinstance(adresse, str) and adresse:
+        info['adresse'] = nettoyer_adresse(adresse)
+        completer_localisation(info)
+
+    note = _chemin(fiche, 4, 7)
+    if isinstance(note, (int, float)):
+        info['note'] = float(note)
+    nb_avis = _chemin(fiche, 4, 8)
+    if isinstance(nb_avis, int):
+        info['nb_avis'] = nb_avis
+    elif info['note']:
+        info['nb_avis'] = 0
+
+    categories = _chemin(fiche, 13)
+    if isinstance(categories, list) and categories and isinstance(categories[0], str):
+        info['categorie'] = categories[0]
+
+    return info
+
+
+def decoder_reponse(texte: str, normaliser_telephone: Optional[Callable[[str], Optional[str]]] = None) -> List[Dict]:
+    """Toutes les fiches d'une réponse de recherche (fiches sans nom ni URL ignorées)"""
+    donnees = charger_json_maps(texte)
+    if donnees is None:
+        return []
+    fiches = []
+    for fiche in _iterer_fiches(donnees):
+        info = decoder_fiche(fiche, normaliser_telephone)
+        if info['nom'] and info['google_maps_url']:
+            fiches.append(info)
+    return fiches
+
+
+class CaptureRecherche:
+    """
+    Accumule les fiches décodées depuis les réponses XHR de recherche
+
+    Alimentée avec les messages du journal de performance (GoogleMapsScraper._lire_journal_performance) ;
+    les corps sont lus avec Network.getResponseBody dès que la réponse est terminée.
+    """
+
+    def __init__(self, driver, normaliser_telephone: Optional[Callable[[str], Optional[str]]] = None):
+        self.driver = driver
+        self.normaliser_telephone = normaliser_telephone
+        self.fiches: Dict[str, Dict] = {}
+        # Feature ID -> clé : un href de carte sans !19sChIJ retrouve la fiche capturée avec son place ID
+        self._alias: Dict[str, str] = {}
+        self._requetes_en_cours: Dict[str, str] = {}
+        self.nb_reponses = 0
+        self.nb_erreurs = 0
+        self.dump = os.environ.get('SCRAPER_XHR_DUMP', '').strip().lower() in ('1', 'true', 'oui', 'yes')
+
+    def traiter(self, messages: List[Dict]):
+        """Traite des messages CDP décodés ({'method': ..., 'params': ...})"""
+        for message in messages:
+            methode = message.get('method')
+            params = message.get('params') or {}
+            if methode == 'Network.responseReceived':
+                url = (params.get('response') or {}).get('url')
+                if est_url_recherche(url):
+                    self._requetes_en_cours[params.get('requestId')] = url
+            elif methode == 'Network.loadingFinished':
+                url = self._requetes_en_cours.pop(params.get('requestId'), None)
+                if url:
+                    self._lire_corps(params.get('requestId'), url)
+
+    def _lire_corps(self, request_id: str, url: str):
+        try:
+            corps = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        except Exception as e:
+            # Corps déjà purgé par Chrome (navigation) : la fiche passera par le DOM
+            self.nb_erreurs += 1
+            logger.debug(f"Corps XHR indisponible ({url[:60]}): {str(e)[:60]}")
+            return
+        texte = corps.get('body') or ''
+        self.nb_reponses += 1
+        if self.dump:
+            self._enregistrer(texte)
+        for info in decoder_reponse(texte, self.normaliser_telephone):
+            cle = cle_fiche(info['google_maps_url'])
+            if cle and cle not in self.fiches:
+                self.fiches[cle] = info
+                feature_id = extraire_feature_id(info['google_maps_url'])
+                if feature_id and feature_id != cle:
+                    self._alias[feature_id] = cle
+
+    def _enregistrer(self, texte: str):
+        try:
+            DOSSIER_CAPTURES.mkdir(parents=True, exist_ok=True)
+            (DOSSIER_CAPTURES / f"recherche_{int(time.time() * 1000)}.json").write_text(texte, encoding='utf-8')
+        except OSError as e:
+            logger.debug(f"Impossible d'enregistrer la réponse XHR: {e}")
+
+    def fiche(self, href: Optional[str]) -> Optional[Dict]:
+        """Fiche capturée correspondant au href d'une carte (même clé que cle_fiche), ou None"""
+        cle = cle_fiche(href)
+        if cle and cle not in self.fiches:
+            cle = self._alias.get(extraire_feature_id(href))
+        return dict(self.fiches[cle]) if cle and cle in self.fiches else None
+
+
+if __name__ == '__main__':
+    import sys
+    for chemin in sys.argv[1:]:
+        fiches = decoder_reponse(Path(chemin).read_text(encoding='utf-8'))
+        print(f"{chemin}: {len(fiches)} fiches")
+        for info in fiches:
+            print(f"   {info['nom']} | {info['telephone'] or '-'} | {info['site_web'] or '-'} | "
+                  f"{info['note'] or '-'} ({info['nb_avis'] or 0}) | {info['adresse'] or '-'}")
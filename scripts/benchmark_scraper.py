@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark de bout en bout du scraper contre le serveur de fixtures Maps (hors ligne)
+
+Lance GoogleMapsScraper en headless sur scripts/serveur_fixtures_maps.py et rapporte, par mode
+d'extraction : établissements/minute, appels WebDriver par établissement et temps par étape
+(timeline du Chronometre). Les données servies étant déterministes, deux runs sont comparables.
+
+Usage :
+    python scripts/benchmark_scraper.py --modes snapshot rapide xhr --nb 60 --max-results 40
+    python scripts/benchmark_scraper.py --url http://127.0.0.1:8765/maps   # serveur déjà lancé
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+# Pas de profil persistant ni de blocage réseau : chaque run part du même état
+os.environ.setdefault('SCRAPER_PROFILE_DIR', 'none')
+os.environ.setdefault('SCRAPER_NETWORK_BLOCKING', '0')
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from scraping.google_maps_scraper import GoogleMapsScraper
+from serveur_fixtures_maps import demarrer_serveur, url_base
+
+
+class CompteurAppels:
+    """Compte les commandes WebDriver (chaque WebDriver.execute = un aller-retour HTTP vers chromedriver)"""
+
+    def __init__(self):
+        self.nb = 0
+        self._lock = threading.Lock()
+        self._execute_original = None
+
+    def installer(self):
+        compteur = self
+        self._execute_original = original = WebDriver.execute
+
+        def execute(driver, *args, **kwargs):
+            with compteur._lock:
+                compteur.nb += 1
+            return original(driver, *args, **kwargs)
+
+        WebDriver.execute = execute
+
+    def retirer(self):
+        if self._execute_original:
+            WebDriver.execute = self._execute_original
+
+
+def mesurer(mode: str, base_url: str, recherche: str, ville: str, max_results: int, compteur: CompteurAppels) -> dict:
+    """Un scraping complet dans un navigateur neuf ; retourne les métriques du run"""
+    scraper = GoogleMapsScraper(headless=True, extraction_mode=mode, base_url=base_url)
+    appels_avant = compteur.nb
+    debut = time.time()
+    try:
+        resultats = scraper.scraper(recherche, ville, max_results=max_results)
+    finally:
+        scraper.quit()
+    duree = time.time() - debut
+    appels = compteur.nb - appels_avant
+    nb = len(resultats)
+    return {
+        'mode': mode,
+        'etablissements': nb,
+        'duree_s': round(duree, 2),
+        'etablissements_par_minute': round(nb * 60 / duree, 1) if duree else 0.0,
+        'appels_webdriver': appels,
+        'appels_par_etablissement': round(appels / nb, 1) if nb else None,
+        'avec_telephone': sum(1 for r in resultats if r.get('telephone')),
+        'avec_site': sum(1 for r in resultats if r.get('site_web')),
+        'etapes_s': {nom: round(d, 2) for nom, d in sorted(scraper.chrono.totaux().items(), key=lambda x: -x[1])},
+    }
+
+
+def afficher(mesure: dict):
+    print(f"\n📊 Mode {mesure['mode']}: {mesure['etablissements']} établissements en {mesure['duree_s']}s")
+    print(f"   ⚡ {mesure['etablissements_par_minute']} établissements/min")
+    print(f"   🔁 {mesure['appels_webdriver']} appels WebDriver ({mesure['appels_par_etablissement']} / établissement)")
+    print(f"   📞 {mesure['avec_telephone']} avec téléphone, 🌐 {mesure['avec_site']} avec site")
+    for nom, duree in mesure['etapes_s'].items():
+        print(f"   ⏱️ {nom:<20} {duree:>8.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du scraper Google Maps sur fixtures locales")
+    parser.add_argument('--modes', nargs='+', default=['snapshot'],
+                        help="Modes d'extraction à comparer (snapshot, classique, onglets, rapide, xhr)")
+    parser.add_argument('--recherche', default='plombier')
+    parser.add_argument('--ville', default='Paris')
+    parser.add_argument('--max-results', type=int, default=40)
+    parser.add_argument('--repetitions', type=int, default=1)
+    parser.add_argument('--nb', type=int, default=60, help="Établissements servis par le serveur embarqué")
+    parser.add_argument('--latence-ms', type=int, default=300, help="Latence simulée du serveur embarqué")
+    parser.add_argument('--url', help="Racine d'un serveur de fixtures déjà lancé (sinon serveur embarqué)")
+    parser.add_argument('--json', help="Fichier où écrire les mesures")
+    args = parser.parse_args()
+
+    serveur = None
+    if args.url:
+        base_url = args.url
+    else:
+        serveur = demarrer_serveur(0, args.nb, args.latence_ms)
+        base_url = url_base(serveur)
+    print(f"🗺️ Fixtures: {base_url}")
+
+    compteur = CompteurAppels()
+    compteur.installer()
+    mesures = []
+    try:
+        for mode in args.modes:
+            for repetition in range(1, args.repetitions + 1):
+                print(f"\n🚀 {mode} (run {repetition}/{args.repetitions})...")
+                mesure = mesurer(mode, base_url, args.recherche, args.ville, args.max_results, compteur)
+                mesure['repetition'] = repetition
+                mesures.append(mesure)
+                afficher(mesure)
+    finally:
+        compteur.retirer()
+        if serveur:
+            serveur.shutdown()
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'date': datetime.now().isoformat(), 'base_url': base_url, 'args': vars(args),
+                       'mesures': mesures}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Mesures écrites dans {args.json}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
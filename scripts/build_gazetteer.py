@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Génère data/communes_fr.tsv.gz (gazetteer hors ligne, voir whatsapp_database/gazetteer.py)
+
+Une seule requête geo.api.gouv.fr pour toutes les communes (nom, INSEE, codes postaux, département,
+population, centre), écrite en TSV gzip trié par code INSEE (~35 000 lignes, quelques centaines de Ko).
+
+Usage :
+    python scripts/build_gazetteer.py                      # télécharge depuis geo.api.gouv.fr
+    python scripts/build_gazetteer.py --depuis-json communes.json   # réponse API déjà téléchargée
+    python scripts/build_gazetteer.py --si-absent           # ne fait rien si le fichier existe déjà
+"""
+import sys
+import gzip
+import json
+import argparse
+from pathlib import Path
+from typing import Optional
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from whatsapp_database.gazetteer import CHEMIN_GAZETTEER
+
+URL_COMMUNES = "https://geo.api.gouv.fr/communes"
+CHAMPS = "nom,code,codesPostaux,codeDepartement,population,centre"
+
+
+def telecharger() -> tuple:
+    """Communes de geo.api.gouv.fr et date des données (en-tête Last-Modified, None si absent)"""
+    import requests
+    response = requests.get(URL_COMMUNES, params={"fields": CHAMPS, "format": "json"}, timeout=120)
+    response.raise_for_status()
+    return response.json(), response.headers.get('Last-Modified')
+
+
+def ligne_commune(c: dict) -> str:
+    coordonnees = (c.get('centre') or {}).get('coordinates') or [None, None]
+    champs = [
+        c.get('code', ''),
+        c.get('nom', ''),
+        ','.join(c.get('codesPostaux') or []),
+        c.get('codeDepartement', ''),
+        str(c.get('population') or 0),
+        f"{coordonnees[1]:.5f}" if coordonnees[1] is not None else '',
+        f"{coordonnees[0]:.5f}" if coordonnees[0] is not None else '',
+    ]
+    # Les noms de communes ne contiennent ni tabulation ni saut de ligne, mais on protège le format
+    return '\t'.join(str(v).replace('\t', ' ').replace('\n', ' ') for v in champs)
+
+
+def ecrire(communes: list, chemin: Path, source: str, date_source: Optional[str] = None):
+    communes = sorted((c for c in communes if c.get('code') and c.get('nom')), key=lambda c: c['code'])
+    # Pas d'horodatage de génération : seule la date des données source (si connue) est gardée,
+    # pour qu'une régénération sur les mêmes données donne le même fichier
+    metadonnees = {
+        'source': source,
+        'nb_communes': len(communes),
+        'complet': True,
+    }
+    if date_source:
+        metadonnees['date_source'] = date_source
+    chemin.parent.mkdir(parents=True, exist_ok=True)
+    temporaire = chemin.with_suffix('.tmp')
+    # mtime=0 et sans nom de fichier dans l'en-tête gzip : fichier identique octet pour octet
+    # si les données n'ont pas changé (diff git propre)
+    with open(temporaire, 'wb') as brut:
+        with gzip.GzipFile(filename='', fileobj=brut, mode='wb', mtime=0) as gz:
+            gz.write(('#' + json.dumps(metadonnees, ensure_ascii=False) + '\n').encode('utf-8'))
+            for c in communes:
+                gz.write((ligne_commune(c) + '\n').encode('utf-8'))
+    temporaire.replace(chemin)
+    return len(communes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère le gazetteer hors ligne des communes françaises")
+    parser.add_argument('--depuis-json', help="Réponse JSON de geo.api.gouv.fr/communes déjà téléchargée")
+    parser.add_argument('--sortie', default=str(CHEMIN_GAZETTEER))
+    parser.add_argument('--si-absent', action='store_true', help="Ne rien faire si le fichier existe")
+    args = parser.parse_args()
+
+    sortie = Path(args.sortie)
+    if args.si_absent and sortie.exists():
+        print(f"ℹ️ {sortie} existe déjà")
+        return 0
+
+    date_source = None
+    if args.depuis_json:
+        with open(args.depuis_json, 'r', encoding='utf-8') as f:
+            communes = json.load(f)
+        source = f"fichier {Path(args.depuis_json).name}"
+    else:
+        print(f"📡 Téléchargement des communes depuis {URL_COMMUNES}...")
+        communes, date_source = telecharger()
+        source = URL_COMMUNES
+
+    nb = ecrire(communes, sortie, source, date_source)
+    print(f"✅ {nb} communes écrites dans {sortie} ({sortie.stat().st_size / 1024:.0f} Ko)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,21 +9,47 @@ import os
 import subprocess
 import threading
 import time
+from collections import namedtuple
 from pathlib import Path
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 # Ajouter le répertoire parent au path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scraping.google_maps_scraper import GoogleMapsScraper
+from scraping.driver_pool import DriverPool
+from scraping.adaptive import controleur_par_defaut
+from scraping.rate_limit import regulateur_depuis_env
+from scraping.tile_planner import planifier_tuiles, position_tuile, rapport_recouvrement
+from scraping.results_spool import SpoolResultats, LecteurSpool, chemin_spool, compacter, charger_resultats
+from scraping.pipeline import Etape, Pipeline
+from scraping.place_ids import cle_fiche
+from scraping.run_budget import (
+    CHEMIN_MANIFESTE, SuiviTaches, budget_depuis_env, ecrire_manifeste, filtrer_taches_faites, lire_manifeste,
+    supprimer_manifeste
+)
 import requests
-from whatsapp_database.queries import ajouter_artisan, mark_scraping_done
+from whatsapp_database.queries import (
+    CHAMPS_COMPLETABLES, ajouter_artisan, generate_name_addr_hash, is_already_scraped, mark_scraping_done,
+    get_known_place_ids, save_scraping_timings
+)
 from whatsapp_database.models import init_database
+from whatsapp_database.ingestion import IngestionArtisans
+from whatsapp_database.gazetteer import chercher_commune, communes_du_departement
 
 # Variable globale pour contrôler le thread de commit périodique
 stop_periodic_commit = threading.Event()
 last_commit_count = 0
+# ✅ Spool JSONL des résultats (écrivain unique), compacté dans le JSON avant chaque commit
+spool_resultats = None
+# ✅ Écrivain SQLite unique (transactions groupées), alimenté par l'étape de persistance
+ingestion_bdd = None
+# ✅ Post-traitement hors des threads navigateur : normalisation -> dédoublonnage -> persistance
+# (None = save_callback synchrone)
+pipeline_post = None
+# ✅ Villes restantes, réécrites dans le manifeste à chaque commit périodique (None une fois le manifeste final écrit)
+suivi_taches = None
 
 
 def git_commit_and_push(message: str) -> bool:
@@ -37,6 +63,16 @@ def git_commit_and_push(message: str) -> bool:
         results_file = Path('data/scraping_results_github_actions.json')
         status_file = Path('data/github_actions_status.json')
 
+        if suivi_taches is not None:
+            # ✅ Manifeste intermédiaire : un job tué avant la fin laisse la liste des villes à reprendre
+            nb_restantes = suivi_taches.sauvegarder()
+            print(f"📝 Manifeste: {nb_restantes} villes restantes")
+
+        fichier_spool = chemin_spool(results_file)
+        if fichier_spool.exists():
+            # ✅ Reporter les lignes du spool dans le JSON (format attendu par Streamlit / le workflow)
+            compacter(fichier_spool, results_file)
+
         if not results_file.exists():
             print("⚠️ Pas de fichier de résultats à commiter")
             return False
@@ -62,7 +98,14 @@ def git_commit_and_push(message: str) -> bool:
 
         # Ajouter les fichiers
         print("📁 git add...")
-        add_result = subprocess.run(['git', 'add', str(results_file), str(status_file)],
+        fichiers = [str(results_file), str(status_file)] + ([str(fichier_spool)] if fichier_spool.exists() else [])
+        if CHEMIN_MANIFESTE.exists():
+            fichiers.append(str(CHEMIN_MANIFESTE))
+        else:
+            # Run terminé : retirer le manifeste du run précédent s'il avait été commité
+            subprocess.run(['git', 'rm', '--cached', '--ignore-unmatch', '-q', str(CHEMIN_MANIFESTE)],
+                           capture_output=True, text=True, check=False)
+        add_result = subprocess.run(['git', 'add'] + fichiers,
                       capture_output=True, text=True, check=False)
         if add_result.returncode != 0:
             print(f"⚠️ git add stderr: {add_result.stderr}")
@@ -131,14 +174,14 @@ def periodic_commit_thread(interval_minutes: int = 10):
         print("🔄 Thread de commit périodique arrêté (avant premier check)")
         return
 
+    # ✅ Lecture incrémentale du spool : seules les lignes ajoutées depuis le dernier check sont lues
+    lecteur = LecteurSpool(chemin_spool(Path('data/scraping_results_github_actions.json')))
     while True:
         try:
             # Lire le nombre actuel de résultats
-            results_file = Path('data/scraping_results_github_actions.json')
-            if results_file.exists():
-                with open(results_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    current_count = data.get('total_results', 0)
+            lecteur.lire_nouveaux()
+            if lecteur.chemin.exists():
+                current_count = lecteur.nb_lus
 
                 # Ne commiter que s'il y a de nouveaux résultats
                 if current_count > last_commit_count:
@@ -169,7 +212,10 @@ def periodic_commit_thread(interval_minutes: int = 10):
 
 
 def get_communes_from_api(dept, min_pop, max_pop):
-    """Récupère les communes d'un département depuis l'API data.gouv.fr"""
+    """Récupère les communes d'un département (gazetteer local, sinon API data.gouv.fr)"""
+    communes_locales = communes_du_departement(dept, min_pop, max_pop)
+    if communes_locales is not None:
+        return communes_locales
     try:
         url = f"https://geo.api.gouv.fr/departements/{dept}/communes"
         params = {
@@ -197,140 +243,208 @@ def get_communes_from_api(dept, min_pop, max_pop):
         print(f"Erreur API communes: {e}")
     return []
 
-def save_callback(artisan_data):
-    """Callback pour sauvegarder directement dans la BDD à chaque établissement trouvé"""
-    try:
-        # Vérifier que artisan_data contient au moins une donnée valide
-        if not artisan_data:
-            print("⚠️ save_callback: artisan_data est None ou vide")
-            return None
-        
-        # Préparer les données pour la BDD
-        # ✅ FIX : Utiliser 'nom_entreprise' au lieu de 'nom' pour correspondre au schéma de la BDD
-        import re
-        
-        # ✅ NETTOYER l'adresse : enlever "Closed", "Fermé", sauts de ligne, etc.
-        adresse_brute = artisan_data.get('adresse', '')
-        if adresse_brute:
-            adresse_clean = re.sub(r'\s*(Closed|Closes|Closes soon|Fermé|Fermée|Ouvert|Open|Opens|Opening|Soon)\s*', '', str(adresse_brute), flags=re.IGNORECASE)
-            adresse_clean = re.sub(r'\s*\n\s*', ' ', adresse_clean)  # Remplacer sauts de ligne par espaces
-            adresse_clean = re.sub(r'\s+', ' ', adresse_clean).strip()  # Normaliser les espaces
-        else:
-            adresse_clean = ''
-        
-        # ✅ Stocker le département de recherche pour référence (mais ne pas l'utiliser comme département réel)
-        departement_recherche = artisan_data.get('departement_recherche') or artisan_data.get('departement')
-
-        data = {
-            'nom_entreprise': artisan_data.get('nom'),  # ✅ FIX : nom_entreprise au lieu de nom
-            'telephone': artisan_data.get('telephone'),
-            'site_web': artisan_data.get('site_web'),
-            'google_maps_url': artisan_data.get('google_maps_url'),  # URL directe vers la fiche Google Maps
-            'adresse': adresse_clean,  # ✅ Adresse nettoyée
-            'code_postal': artisan_data.get('code_postal'),
-            'ville': artisan_data.get('ville'),
-            'departement': None,  # ✅ FIX: Sera dérivé du code_postal, pas du département recherché
-            'note': artisan_data.get('note'),
-            'nombre_avis': artisan_data.get('nb_avis') or artisan_data.get('nombre_avis'),  # ✅ Support des deux formats
-            'ville_recherche': artisan_data.get('ville_recherche'),
-            'departement_recherche': departement_recherche,  # ✅ Garder trace du département de recherche
-            'source': 'google_maps',
-            'source_telephone': 'google_maps',
-            'type_artisan': artisan_data.get('recherche') or artisan_data.get('type_artisan')  # ✅ Support des deux formats
-        }
+def preparer_artisan(artisan_data):
+    """
+    Normalise/enrichit une fiche extraite au format de la table artisans
+    (nettoyage d'adresse, code postal, département, ville, appel geo.api.gouv.fr si besoin)
+
+    Returns:
+        Données pour ajouter_artisan, ou None si la fiche n'a aucune donnée exploitable
+    """
+    # Vérifier que artisan_data contient au moins une donnée valide
+    if not artisan_data:
+        print("⚠️ preparer_artisan: artisan_data est None ou vide")
+        return None
+    
+    # Préparer les données pour la BDD
+    # ✅ FIX : Utiliser 'nom_entreprise' au lieu de 'nom' pour correspondre au schéma de la BDD
+    import re
+    
+    # ✅ NETTOYER l'adresse : enlever "Closed", "Fermé", sauts de ligne, etc.
+    adresse_brute = artisan_data.get('adresse', '')
+    if adresse_brute:
+        adresse_clean = re.sub(r'\s*(Closed|Closes|Closes soon|Fermé|Fermée|Ouvert|Open|Opens|Opening|Soon)\s*', '', str(adresse_brute), flags=re.IGNORECASE)
+        adresse_clean = re.sub(r'\s*\n\s*', ' ', adresse_clean)  # Remplacer sauts de ligne par espaces
+        adresse_clean = re.sub(r'\s+', ' ', adresse_clean).strip()  # Normaliser les espaces
+    else:
+        adresse_clean = ''
+    
+    # ✅ Stocker le département de recherche pour référence (mais ne pas l'utiliser comme département réel)
+    departement_recherche = artisan_data.get('departement_recherche') or artisan_data.get('departement')
+
+    data = {
+        'nom_entreprise': artisan_data.get('nom'),  # ✅ FIX : nom_entreprise au lieu de nom
+        'telephone': artisan_data.get('telephone'),
+        'site_web': artisan_data.get('site_web'),
+        'google_maps_url': artisan_data.get('google_maps_url'),  # URL directe vers la fiche Google Maps
+        'adresse': adresse_clean,  # ✅ Adresse nettoyée
+        'code_postal': artisan_data.get('code_postal'),
+        'ville': artisan_data.get('ville'),
+        'departement': None,  # ✅ FIX: Sera dérivé du code_postal, pas du département recherché
+        'note': artisan_data.get('note'),
+        'nombre_avis': artisan_data.get('nb_avis') or artisan_data.get('nombre_avis'),  # ✅ Support des deux formats
+        'ville_recherche': artisan_data.get('ville_recherche'),
+        'departement_recherche': departement_recherche,  # ✅ Garder trace du département de recherche
+        'source': 'google_maps',
+        'source_telephone': 'google_maps',
+        'type_artisan': artisan_data.get('recherche') or artisan_data.get('type_artisan')  # ✅ Support des deux formats
+    }
 
-        # ✅ PRIORITÉ 1: Extraire le code postal depuis l'adresse si manquant
-        if not data.get('code_postal') and data.get('adresse'):
-            cp_match = re.search(r'\b(\d{5})\b', data['adresse'])
-            if cp_match:
-                data['code_postal'] = cp_match.group(1)
-
-        # ✅ PRIORITÉ 2: Extraire le département depuis le code postal (la source la plus fiable)
-        if data.get('code_postal'):
-            code_postal = str(data['code_postal']).strip()
-            # Valider que c'est un code postal français valide (5 chiffres)
-            if re.match(r'^\d{5}$', code_postal):
-                # Pour les départements d'outre-mer (97x, 98x), prendre les 3 premiers chiffres
-                if code_postal.startswith('97') or code_postal.startswith('98'):
-                    data['departement'] = code_postal[:3]
-                else:
-                    data['departement'] = code_postal[:2]
+    # ✅ PRIORITÉ 1: Extraire le code postal depuis l'adresse si manquant
+    if not data.get('code_postal') and data.get('adresse'):
+        cp_match = re.search(r'\b(\d{5})\b', data['adresse'])
+        if cp_match:
+            data['code_postal'] = cp_match.group(1)
+
+    # ✅ PRIORITÉ 2: Extraire le département depuis le code postal (la source la plus fiable)
+    if data.get('code_postal'):
+        code_postal = str(data['code_postal']).strip()
+        # Valider que c'est un code postal français valide (5 chiffres)
+        if re.match(r'^\d{5}$', code_postal):
+            # Pour les départements d'outre-mer (97x, 98x), prendre les 3 premiers chiffres
+            if code_postal.startswith('97') or code_postal.startswith('98'):
+                data['departement'] = code_postal[:3]
+            else:
+                data['departement'] = code_postal[:2]
 
-        # ✅ FALLBACK: Utiliser le département recherché seulement si on n'a pas pu l'extraire du CP
-        if not data.get('departement') and departement_recherche:
-            data['departement'] = departement_recherche
-        
-        # ✅ Extraire la ville depuis l'adresse si manquante (amélioré)
-        if not data.get('ville') and data.get('adresse'):
-            adresse = str(data['adresse'])
-            # Pattern 1: "code_postal ville" (format français standard)
-            ville_match = re.search(r'\b\d{5}\s+([A-Za-zÀ-ÿ\s-]+?)(?:\s|$|,|;|France|Closed|Fermé)', adresse, re.IGNORECASE)
-            if ville_match:
-                ville = ville_match.group(1).strip()
-                # Nettoyer la ville (enlever "France", "Closed", etc.)
+    # ✅ FALLBACK: Utiliser le département recherché seulement si on n'a pas pu l'extraire du CP
+    if not data.get('departement') and departement_recherche:
+        data['departement'] = departement_recherche
+    
+    # ✅ Extraire la ville depuis l'adresse si manquante (amélioré)
+    if not data.get('ville') and data.get('adresse'):
+        adresse = str(data['adresse'])
+        # Pattern 1: "code_postal ville" (format français standard)
+        ville_match = re.search(r'\b\d{5}\s+([A-Za-zÀ-ÿ\s-]+?)(?:\s|$|,|;|France|Closed|Fermé)', adresse, re.IGNORECASE)
+        if ville_match:
+            ville = ville_match.group(1).strip()
+            # Nettoyer la ville (enlever "France", "Closed", etc.)
+            ville = re.sub(r'\s*(France|FR|FRANCE|Closed|Fermé|Fermée)\s*$', '', ville, flags=re.IGNORECASE).strip()
+            # ✅ Vérifier que ce n'est pas un nom d'entreprise
+            mots_interdits = ['rue', 'avenue', 'boulevard', 'place', 'allée', 'chemin', 'route', 
+                             'plomberie', 'solution', 'eaux', 'cernoise', 'services', 'entreprise']
+            if ville and ville.lower() not in mots_interdits and not any(mot in ville.lower() for mot in ['plombier', 'plomberie', 'solution']):
+                data['ville'] = ville
+        # Pattern 2: Si pas trouvé, chercher après le dernier chiffre
+        if not data.get('ville'):
+            ville_match2 = re.search(r'\d{5}\s+(.+?)(?:\s*$|,|;|France|Closed|Fermé)', adresse)
+            if ville_match2:
+                ville = ville_match2.group(1).strip()
                 ville = re.sub(r'\s*(France|FR|FRANCE|Closed|Fermé|Fermée)\s*$', '', ville, flags=re.IGNORECASE).strip()
                 # ✅ Vérifier que ce n'est pas un nom d'entreprise
                 mots_interdits = ['rue', 'avenue', 'boulevard', 'place', 'allée', 'chemin', 'route', 
                                  'plomberie', 'solution', 'eaux', 'cernoise', 'services', 'entreprise']
                 if ville and ville.lower() not in mots_interdits and not any(mot in ville.lower() for mot in ['plombier', 'plomberie', 'solution']):
                     data['ville'] = ville
-            # Pattern 2: Si pas trouvé, chercher après le dernier chiffre
-            if not data.get('ville'):
-                ville_match2 = re.search(r'\d{5}\s+(.+?)(?:\s*$|,|;|France|Closed|Fermé)', adresse)
-                if ville_match2:
-                    ville = ville_match2.group(1).strip()
-                    ville = re.sub(r'\s*(France|FR|FRANCE|Closed|Fermé|Fermée)\s*$', '', ville, flags=re.IGNORECASE).strip()
-                    # ✅ Vérifier que ce n'est pas un nom d'entreprise
-                    mots_interdits = ['rue', 'avenue', 'boulevard', 'place', 'allée', 'chemin', 'route', 
-                                     'plomberie', 'solution', 'eaux', 'cernoise', 'services', 'entreprise']
-                    if ville and ville.lower() not in mots_interdits and not any(mot in ville.lower() for mot in ['plombier', 'plomberie', 'solution']):
-                        data['ville'] = ville
-        
-        # ✅ Si toujours pas de ville, utiliser ville_recherche (PRIORITÉ)
-        if not data.get('ville'):
-            ville_recherche = artisan_data.get('ville_recherche') or artisan_data.get('ville')
-            if ville_recherche:
-                data['ville'] = ville_recherche
-                data['ville_recherche'] = ville_recherche
-        
-        # ✅ FALLBACK : Si on a la ville mais pas le code postal, chercher via l'API data.gouv.fr
-        if not data.get('code_postal') and data.get('ville'):
-            try:
-                ville_nom = data['ville']
-                # Chercher le code postal via l'API
-                url = f"https://geo.api.gouv.fr/communes?nom={ville_nom}&fields=nom,code,codesPostaux"
-                response = requests.get(url, timeout=2)
-                if response.status_code == 200:
-                    communes = response.json()
-                    if communes:
-                        # Prendre la première commune trouvée
-                        codes_postaux = communes[0].get('codesPostaux', [])
-                        if codes_postaux:
-                            data['code_postal'] = codes_postaux[0]
-                            # Extraire le département
-                            if len(data['code_postal']) >= 2:
-                                if data['code_postal'].startswith('97') or data['code_postal'].startswith('98'):
-                                    data['departement'] = data['code_postal'][:3]
-                                else:
-                                    data['departement'] = data['code_postal'][:2]
-            except Exception as e:
-                # Silencieux - ne pas bloquer si l'API échoue
-                pass
-        
-        # ✅ VALIDATION : Note et nombre d'avis doivent être cohérents
-        if data.get('note') is not None and data.get('nombre_avis') is None:
-            data['nombre_avis'] = 0
-        
-        # ✅ Vérifier qu'on a au moins une donnée valide avant d'insérer
-        has_valid_data = any([
-            data.get('nom_entreprise'),
-            data.get('telephone'),
-            data.get('site_web'),
-            data.get('adresse')
-        ])
-        
-        if not has_valid_data:
-            print(f"⚠️ save_callback: Aucune donnée valide pour sauvegarder. Données reçues: {artisan_data}")
+    
+    # ✅ Si toujours pas de ville, utiliser ville_recherche (PRIORITÉ)
+    if not data.get('ville'):
+        ville_recherche = artisan_data.get('ville_recherche') or artisan_data.get('ville')
+        if ville_recherche:
+            data['ville'] = ville_recherche
+            data['ville_recherche'] = ville_recherche
+    
+    # ✅ Si on a la ville mais pas le code postal : gazetteer local (sans réseau)
+    if not data.get('code_postal') and data.get('ville'):
+        commune = chercher_commune(data['ville'], departement_recherche) or chercher_commune(data['ville'])
+        if commune and commune.codes_postaux:
+            data['code_postal'] = commune.codes_postaux[0]
+            data['departement'] = commune.departement
+    
+    # ✅ FALLBACK : Commune absente du gazetteer, chercher via l'API data.gouv.fr
+    if not data.get('code_postal') and data.get('ville'):
+        try:
+            ville_nom = data['ville']
+            # Chercher le code postal via l'API
+            url = f"https://geo.api.gouv.fr/communes?nom={ville_nom}&fields=nom,code,codesPostaux"
+            response = requests.get(url, timeout=2)
+            if response.status_code == 200:
+                communes = response.json()
+                if communes:
+                    # Prendre la première commune trouvée
+                    codes_postaux = communes[0].get('codesPostaux', [])
+                    if codes_postaux:
+                        data['code_postal'] = codes_postaux[0]
+                        # Extraire le département
+                        if len(data['code_postal']) >= 2:
+                            if data['code_postal'].startswith('97') or data['code_postal'].startswith('98'):
+                                data['departement'] = data['code_postal'][:3]
+                            else:
+                                data['departement'] = data['code_postal'][:2]
+        except Exception as e:
+            # Silencieux - ne pas bloquer si l'API échoue
+            pass
+    
+    # ✅ VALIDATION : Note et nombre d'avis doivent être cohérents
+    if data.get('note') is not None and data.get('nombre_avis') is None:
+        data['nombre_avis'] = 0
+    
+    # ✅ Vérifier qu'on a au moins une donnée valide avant d'insérer
+    has_valid_data = any([
+        data.get('nom_entreprise'),
+        data.get('telephone'),
+        data.get('site_web'),
+        data.get('adresse')
+    ])
+    
+    if not has_valid_data:
+        print(f"⚠️ preparer_artisan: Aucune donnée valide pour sauvegarder. Données reçues: {artisan_data}")
+        return None
+    
+    return data
+
+# Champs manquants d'une fiche déjà gardée, apportés par une autre vue du même établissement
+ComplementFiche = namedtuple('ComplementFiche', ['place_key', 'champs'])
+
+class FiltreDoublonsRun:
+    """
+    Étape de dédoublonnage : une seule écriture BDD par établissement vu dans plusieurs villes du run
+
+    Une vue suivante plus complète (téléphone, site web...) n'est pas perdue : ses champs absents de la
+    fiche gardée partent en ComplementFiche (écrits par persister seulement là où la base est vide).
+    """
+
+    def __init__(self):
+        self._fiches = {}  # clé de dédoublonnage -> fiche gardée (place_key + champs complétables)
+        self._lock = threading.Lock()
+
+    def __call__(self, data):
+        cles = set()
+        if data.get('telephone'):
+            cles.add(f"tel:{data['telephone']}")
+        hash_nom_adresse = generate_name_addr_hash(data.get('nom_entreprise', ''), data.get('adresse', ''))
+        if hash_nom_adresse:
+            cles.add(f"nom_adresse:{hash_nom_adresse}")
+        with self._lock:
+            fiche = next((self._fiches[cle] for cle in cles if cle in self._fiches), None)
+            if fiche is None:
+                fiche = {champ: data.get(champ) for champ in CHAMPS_COMPLETABLES}
+                fiche['place_key'] = cle_fiche(data.get('google_maps_url'))
+                for cle in cles:
+                    self._fiches[cle] = fiche
+                return data
+            for cle in cles:
+                self._fiches.setdefault(cle, fiche)
+            manquants = {champ: data[champ] for champ in CHAMPS_COMPLETABLES if data.get(champ) and not fiche.get(champ)}
+            if not manquants or not fiche['place_key']:
+                return None
+            fiche.update(manquants)
+        return ComplementFiche(fiche['place_key'], manquants)
+
+def persister(data):
+    """Étape de persistance : dépôt dans la file de l'écrivain SQLite unique"""
+    if isinstance(data, ComplementFiche):
+        # Même file que la fiche gardée : le complément est appliqué après son insertion
+        ingestion_bdd.rafraichir(data.place_key, completer=data.champs)
+    else:
+        ingestion_bdd.ajouter(data)
+    return data
+
+def save_callback(artisan_data):
+    """Callback pour sauvegarder directement dans la BDD (chemin synchrone, sans pipeline)"""
+    try:
+        data = preparer_artisan(artisan_data)
+        if data is None:
             return None
         
         # Sauvegarder dans la BDD
@@ -350,62 +464,121 @@ def save_callback(artisan_data):
         print(traceback.format_exc())
         return None
 
-def scrape_ville(task_info, max_results, status_file):
-    """Scrape une ville et met à jour le statut"""
+def scrape_ville(task_info, max_results, status_file, driver_pool=None, places_connues=None, controleur_delais=None,
+                 regulateur=None):
+    """Scrape une ville et met à jour le statut
+    
+    Args:
+        driver_pool: DriverPool partagé - chaque worker réutilise son navigateur chaud
+        places_connues: Set partagé des fiches déjà en base / déjà vues pendant ce run
+        controleur_delais: ControleurDelais partagé (latences apprises conservées de ville en ville)
+        regulateur: RegulateurGoogle partagé (débit de recherches + pause commune en cas de blocage)
+    
+    Returns:
+        Nombre de fiches de la ville, ou None en cas d'échec (la ville part dans le manifeste de continuation).
+        Les fiches elles-mêmes partent au fil de l'eau dans le pipeline et le spool, sans rester en mémoire.
+    """
     metier_actuel = task_info['metier']
     ville_actuelle = task_info['ville']
     departement_actuel = task_info['departement']
     
-    # ✅ Vérifier si déjà scrapé (optionnel - peut être désactivé pour re-scraping)
-    # if is_already_scraped(metier_actuel, departement_actuel, ville_actuelle):
-    #     print(f"⏭️ {metier_actuel} - {departement_actuel} - {ville_actuelle} déjà scrapé, ignoré")
-    #     update_status_file(status_file, task_info, 0, 'skipped')
-    #     return []
+    # Les villes déjà dans scraping_history sont retirées avant le lancement (reprise / SKIP_SCRAPED_CITIES)
     
+    scraper = None
     try:
-        scraper = GoogleMapsScraper(headless=True)
+        scraper = GoogleMapsScraper(
+            headless=True,
+            driver_pool=driver_pool,
+            extraction_mode=os.environ.get('EXTRACTION_MODE', 'snapshot'),
+            nb_onglets=int(os.environ.get('NB_ONGLETS', '3')),
+            places_connues=places_connues,
+            controleur_delais=controleur_delais,
+            regulateur=regulateur,
+            # Rafraîchissement note/avis par l'écrivain SQLite unique, pas depuis le thread navigateur
+            callback_place_connue=lambda place_id, info: ingestion_bdd.rafraichir(
+                place_id, note=info.get('note'), nombre_avis=info.get('nb_avis')
+            )
+        )
         scraper.is_running = True
         
-        # ✅ Callback pour sauvegarder directement dans la BDD ET dans le fichier JSON
-        # Définir le chemin du fichier une seule fois
-        results_file = Path('data') / 'scraping_results_github_actions.json'
-        results_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        def progress_callback(index, total, info):
-            if info:
+        # ✅ Sauvegarder directement dans la BDD ET dans le spool JSONL, établissement par établissement
+        nb_resultats = 0
+        # ✅ Ville bloquée par Google : une seconde tentative après la pause commune des workers
+        tentatives = 2 if regulateur is not None else 1
+        for tentative in range(1, tentatives + 1):
+            if tentative > 1:
+                if not scraper.bloque or nb_resultats:
+                    break
+                print(f"🛑 {ville_actuelle}: blocage Google, nouvelle tentative après la pause...")
+                # Navigateur de la première tentative rendu au pool (ou fermé sans pool) : iter_scrape
+                # en prend un autre, sinon ce Chrome resterait ouvert jusqu'à la fin du run
+                scraper.quit()
+            for info in scraper.iter_scrape(recherche=metier_actuel, ville=ville_actuelle, max_results=max_results,
+                                            position=task_info.get('position')):
                 info['ville_recherche'] = ville_actuelle
                 info['recherche'] = metier_actuel
                 info['departement_recherche'] = departement_actuel  # ✅ Stocker le département recherché séparément
                 # Ne pas écraser le département extrait depuis le code postal, mais utiliser le département recherché en priorité
                 if not info.get('departement'):
                     info['departement'] = departement_actuel
-                # Sauvegarder dans la BDD
-                save_callback(info)
-                # ✅ Sauvegarder aussi dans le fichier JSON progressivement (à chaque établissement)
-                try:
-                    save_progress(results_file, [info])
-                except Exception as e:
-                    print(f"⚠️ Erreur sauvegarde JSON progressive: {e}")
-        
-        resultats = scraper.scraper(
-            recherche=metier_actuel,
-            ville=ville_actuelle,
-            max_results=max_results,
-            progress_callback=progress_callback
-        )
+                # Normalisation/enrichissement/BDD par le pipeline : le thread ne fait que piloter le navigateur
+                if pipeline_post is not None:
+                    pipeline_post.deposer(info)
+                else:
+                    save_callback(info)
+                # ✅ Déposer aussi dans le spool (ajout d'une ligne par le thread écrivain, sans relire le fichier)
+                if spool_resultats is not None:
+                    spool_resultats.ajouter(info)
+                nb_resultats += 1
+        # ✅ Rendre le navigateur au pool (il reste ouvert pour la ville suivante)
         scraper.quit()
         
-        # ✅ Marquer comme scrapé dans l'historique
-        mark_scraping_done(metier_actuel, departement_actuel, ville_actuelle, len(resultats) if resultats else 0)
+        # ✅ Bilan réseau (requêtes bloquées par CDP)
+        stats_reseau = scraper.stats_reseau
+        if stats_reseau.get('requetes_bloquees'):
+            print(f"🚫 {ville_actuelle}: {stats_reseau['requetes_bloquees']} requêtes bloquées "
+                  f"(~{stats_reseau['octets_evites_estimes'] / 1e6:.1f} Mo évités, "
+                  f"{stats_reseau['octets_charges'] / 1e6:.1f} Mo chargés)")
+        
+        # ✅ Budget épuisé pendant la pause anti-blocage : ville à reprendre (manifeste)
+        if scraper.abandonne and not nb_resultats:
+            update_status_file(status_file, task_info, 0, 'failed', 'budget de temps épuisé')
+            return None
+        
+        # ✅ Toujours bloqué : ne pas marquer comme scrapé, la ville sera reprise par un prochain run
+        if scraper.bloque and not nb_resultats:
+            update_status_file(status_file, task_info, 0, 'failed', 'blocage Google (unusual traffic/captcha)')
+            return None
+        
+        # ✅ Marquer comme scrapé dans l'historique (session_id relie l'historique à la timeline)
+        chrono = scraper.chrono
+        mark_scraping_done(metier_actuel, departement_actuel, ville_actuelle, nb_resultats,
+                           session_id=chrono.session_id, duration_seconds=int(chrono.totaux().get('total', 0)))
+        # ✅ Tuile : chaque commune couverte est marquée aussi (les résultats sont comptés sur la commune centre)
+        communes_tuile = [c for c in task_info.get('communes') or [] if c != ville_actuelle]
+        for commune in communes_tuile:
+            mark_scraping_done(metier_actuel, departement_actuel, commune, 0, session_id=chrono.session_id,
+                               notes=f"couverte par la tuile {ville_actuelle}")
+        if communes_tuile and nb_resultats >= max_results:
+            # Recherche plafonnée à max_results : une tuile dense peut laisser des fiches de côté
+            print(f"⚠️ {ville_actuelle}: tuile de {len(communes_tuile) + 1} communes plafonnée à {max_results} "
+                  f"résultats (réduire TILE_RADIUS_KM ou augmenter MAX_RESULTS)")
+        
+        # ✅ Timeline par étape (setup, consentement, recherche, scroll, clic/attente/extraction)
+        save_scraping_timings(chrono.session_id, metier_actuel, departement_actuel, ville_actuelle,
+                              chrono.environnement, chrono.mesures)
         
         # ✅ Mettre à jour le statut après chaque ville
-        update_status_file(status_file, task_info, len(resultats) if resultats else 0, 'completed')
+        update_status_file(status_file, task_info, nb_resultats, 'completed')
         
-        return resultats or []
+        return nb_resultats
     except Exception as e:
         print(f"❌ Erreur {ville_actuelle}: {e}")
         update_status_file(status_file, task_info, 0, 'failed', str(e))
-        return []
+        # ✅ Navigateur dans un état inconnu : le recycler plutôt que de le réutiliser
+        if scraper and scraper.driver:
+            scraper.stop()
+        return None
 
 def update_status_file(status_file, task_info, results_count, status, error=None):
     """Met à jour le fichier de statut"""
@@ -444,37 +617,13 @@ def update_status_file(status_file, task_info, results_count, status, error=None
         if status_data['total_tasks'] > 0:
             progress_pct = (status_data['completed_tasks'] / status_data['total_tasks'] * 100)
             print(f"📊 Progression: {status_data['completed_tasks']}/{status_data['total_tasks']} villes ({progress_pct:.1f}%) | {status_data['total_results']} résultats trouvés")
+            if pipeline_post is not None:
+                en_file = ', '.join(f'{nom} {nb}' for nom, nb in pipeline_post.en_attente().items())
+                print(f"🧮 Pipeline en file: {en_file} | BDD {ingestion_bdd.nb_ecrits} écrites, "
+                      f"{ingestion_bdd.backlog} en attente")
     except Exception as e:
         print(f"⚠️ Erreur mise à jour statut: {e}")
 
-def save_progress(results_file, new_results):
-    """Sauvegarde les résultats progressivement"""
-    try:
-        if results_file.exists():
-            with open(results_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        else:
-            data = {
-                'timestamp': datetime.now().isoformat(),
-                'total_results': 0,
-                'results': []
-            }
-        
-        # Ajouter les nouveaux résultats (éviter les doublons)
-        existing_ids = {f"{r.get('nom', '')}_{r.get('telephone', '')}_{r.get('ville_recherche', '')}" for r in data['results']}
-        for r in new_results:
-            r_id = f"{r.get('nom', '')}_{r.get('telephone', '')}_{r.get('ville_recherche', '')}"
-            if r_id not in existing_ids:
-                data['results'].append(r)
-        
-        data['total_results'] = len(data['results'])
-        data['last_updated'] = datetime.now().isoformat()
-        
-        with open(results_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        print(f"⚠️ Erreur sauvegarde progressive: {e}")
-
 if __name__ == "__main__":
     # ✅ Initialiser la base de données
     init_database()
@@ -487,6 +636,35 @@ if __name__ == "__main__":
     use_api_communes = os.environ.get('USE_API_COMMUNES', 'false').lower() == 'true'
     min_pop = int(os.environ.get('MIN_POP', '0'))
     max_pop = int(os.environ.get('MAX_POP', '50000'))
+    # ✅ Communes API regroupées en tuiles géographiques : une recherche par tuile au lieu d'une par commune
+    plan_tuiles = os.environ.get('PLAN_TUILES', 'true').lower() == 'true'
+    rayon_tuile_km = float(os.environ.get('TILE_RADIUS_KM', '5'))
+
+    # ✅ Pool de navigateurs : un Chrome chaud par thread, recyclé après N villes
+    driver_max_tasks = int(os.environ.get('DRIVER_MAX_TASKS', '30'))
+    driver_pool = DriverPool(max_taches_par_driver=driver_max_tasks)
+
+    # ✅ Délais/timeouts adaptatifs partagés par tous les workers (mesure de la vitesse réelle du runner)
+    controleur_delais = controleur_par_defaut(os.environ.get('GITHUB_ACTIONS') is not None)
+    # ✅ Budget de temps (le job est tué à timeout-minutes) et reprise d'un run interrompu
+    budget = budget_depuis_env()
+    # ✅ Débit de recherches et disjoncteur anti-blocage communs à tous les threads
+    # (une pause anti-blocage en cours est abandonnée quand le budget est épuisé)
+    regulateur = regulateur_depuis_env(abandon=budget.est_epuise)
+    reprendre = os.environ.get('RESUME_FROM_MANIFEST', 'false').lower() == 'true'
+    skip_scraped = reprendre or os.environ.get('SKIP_SCRAPED_CITIES', 'false').lower() == 'true'
+
+    # ✅ Fiches déjà en base : ne pas les rouvrir (SKIP_KNOWN_PLACES=false pour tout re-scraper)
+    places_connues = None
+    if os.environ.get('SKIP_KNOWN_PLACES', 'true').lower() == 'true':
+        places_connues = get_known_place_ids()
+        # La base n'est restaurée que par le cache Actions : les résultats commités du run précédent
+        # complètent la liste si le cache est absent ou expiré
+        for r in charger_resultats(Path('data/scraping_results_github_actions.json')):
+            cle = cle_fiche(r.get('google_maps_url'))
+            if cle:
+                places_connues.add(cle)
+        print(f"⏭️ {len(places_connues)} fiches Google Maps déjà connues seront ignorées")
 
     # Paramètres de commit périodique
     enable_periodic_commits = os.environ.get('ENABLE_PERIODIC_COMMITS', 'false').lower() == 'true'
@@ -498,6 +676,7 @@ if __name__ == "__main__":
     print(f'🔢 Max résultats: {max_results}')
     print(f'🧵 Threads: {num_threads}')
     print(f'💾 Sauvegarde directe dans la BDD activée')
+    print(f'♻️ Pool de navigateurs: recyclage après {driver_max_tasks} villes')
     if enable_periodic_commits:
         print(f'🔄 Commits périodiques activés (intervalle: {commit_interval} min)')
 
@@ -519,24 +698,54 @@ if __name__ == "__main__":
         villes_par_dept = {}
     
     # Préparer la liste des villes
-    toutes_villes = []
-    for dept in departements:
-        if use_api_communes:
-            communes = get_communes_from_api(dept, min_pop, max_pop)
-            villes_dept = [c['nom'] for c in communes]
-            print(f'📡 API: {len(villes_dept)} communes trouvées pour {dept}')
-        else:
-            villes_dept = villes_par_dept.get(dept, [])
-            if not villes_dept:
-                villes_dept = [f"{metiers[0]} {dept}"]
+    manifeste = lire_manifeste() if reprendre else None
+    if manifeste:
+        # ✅ Reprise : tâches non terminées du run précédent (METIERS/DEPARTEMENTS ignorés)
+        toutes_villes = manifeste['taches']
+        print(f"♻️ Reprise du manifeste du {manifeste.get('created_at', '?')} "
+              f"({manifeste.get('raison', '?')}): {len(toutes_villes)} villes")
+    else:
+        if reprendre:
+            print("ℹ️ Pas de manifeste de continuation : run complet")
+        toutes_villes = []
+        for dept in departements:
+            if use_api_communes:
+                communes = get_communes_from_api(dept, min_pop, max_pop)
+                print(f'📡 API: {len(communes)} communes trouvées pour {dept}')
+                if plan_tuiles:
+                    tuiles = planifier_tuiles(communes, rayon_tuile_km)
+                    bilan = rapport_recouvrement(tuiles)
+                    print(f"🧩 {dept}: {bilan['recherches_apres']} tuiles de {rayon_tuile_km:g} km pour "
+                          f"{bilan['recherches_avant']} communes ({bilan['recherches_evitees']} recherches évitées, "
+                          f"-{bilan['reduction_pct']}%, recouvrement moyen estimé {bilan['recouvrement_moyen_pct']}%)")
+                    for metier in metiers:
+                        for tuile in tuiles:
+                            toutes_villes.append({
+                                'metier': metier,
+                                'departement': dept,
+                                'ville': tuile['nom'],
+                                'position': position_tuile(tuile),
+                                'communes': [c['nom'] for c in tuile['communes']]
+                            })
+                    continue
+                villes_dept = [c['nom'] for c in communes]
+            else:
+                villes_dept = villes_par_dept.get(dept, [])
+                if not villes_dept:
+                    villes_dept = [f"{metiers[0]} {dept}"]
         
-        for metier in metiers:
-            for ville in villes_dept:
-                toutes_villes.append({
-                    'metier': metier,
-                    'departement': dept,
-                    'ville': ville
-                })
+            for metier in metiers:
+                for ville in villes_dept:
+                    toutes_villes.append({
+                        'metier': metier,
+                        'departement': dept,
+                        'ville': ville
+                    })
+    
+    if skip_scraped:
+        nb_avant = len(toutes_villes)
+        toutes_villes = filtrer_taches_faites(toutes_villes, is_already_scraped)
+        print(f'⏭️ {nb_avant - len(toutes_villes)} villes déjà dans scraping_history ignorées')
     
     print(f'📊 Total villes à scraper: {len(toutes_villes)}')
     
@@ -565,42 +774,142 @@ if __name__ == "__main__":
     }
     with open(results_file, 'w', encoding='utf-8') as f:
         json.dump(initial_results, f, ensure_ascii=False, indent=2)
+    spool_resultats = SpoolResultats(chemin_spool(results_file), reinitialiser=True)
+    suivi_taches = SuiviTaches(toutes_villes, {'metiers': metiers, 'departements': departements,
+                                               'max_results': max_results})
+    ingestion_bdd = IngestionArtisans(taille_lot=int(os.environ.get('DB_BATCH_SIZE', '50')),
+                                      intervalle_ms=int(os.environ.get('DB_BATCH_MS', '500')))
+    pipeline_post = Pipeline([
+        Etape('normalisation', preparer_artisan, nb_workers=int(os.environ.get('ENRICH_WORKERS', '4'))),
+        Etape('dedoublonnage', FiltreDoublonsRun()),
+        Etape('persistance', persister),
+    ])
+    debut_extraction = time.time()
     
     # Multi-threading
-    tous_resultats = []
+    total_resultats = 0
+    non_lancees = []  # ✅ Villes jamais démarrées (budget de temps épuisé)
+    echouees = []     # ✅ Villes en échec (blocage, erreur)
     if num_threads > 1:
         print(f'🚀 Multi-threading activé ({num_threads} threads)')
         with ThreadPoolExecutor(max_workers=num_threads) as executor:
-            futures = {executor.submit(scrape_ville, task, max_results, status_file): task for task in toutes_villes}
-            for future in as_completed(futures):
-                try:
-                    resultats = future.result()
-                    if resultats:
-                        tous_resultats.extend(resultats)
-                        # ✅ Sauvegarder progressivement
-                        save_progress(results_file, resultats)
-                        print(f'✅ {len(resultats)} résultats ajoutés (total: {len(tous_resultats)})')
-                except Exception as e:
-                    print(f'❌ Erreur thread: {e}')
+            # ✅ Une ville lancée à chaque place libre (au lieu de tout soumettre d'un coup) : le budget
+            # est vérifié avant chaque lancement
+            a_lancer = iter(toutes_villes)
+            en_cours = {}
+
+            def lancer_suivante():
+                task = next(a_lancer, None)
+                if task is None:
+                    return
+                if not budget.peut_demarrer():
+                    non_lancees.append(task)
+                    non_lancees.extend(a_lancer)
+                    return
+                future = executor.submit(scrape_ville, task, max_results, status_file, driver_pool, places_connues,
+                                         controleur_delais, regulateur)
+                en_cours[future] = (task, time.time())
+
+            for _ in range(num_threads):
+                lancer_suivante()
+            while en_cours:
+                termines, _ = wait(en_cours, return_when=FIRST_COMPLETED)
+                for future in termines:
+                    task, debut_tache = en_cours.pop(future)
+                    budget.enregistrer_duree(time.time() - debut_tache)
+                    try:
+                        nb_resultats = future.result()
+                    except Exception as e:
+                        print(f'❌ Erreur thread: {e}')
+                        nb_resultats = None
+                    if nb_resultats is None:
+                        echouees.append(task)
+                    else:
+                        suivi_taches.terminer(task)
+                    if nb_resultats:
+                        total_resultats += nb_resultats
+                        print(f'✅ {nb_resultats} résultats ajoutés (total: {total_resultats})')
+                    lancer_suivante()
     else:
         # Mode séquentiel
         for i, task in enumerate(toutes_villes, 1):
+            if not budget.peut_demarrer():
+                non_lancees = toutes_villes[i - 1:]
+                break
             print(f'🔍 [{i}/{len(toutes_villes)}] {task["metier"]} - {task["departement"]} - {task["ville"]}')
-            resultats = scrape_ville(task, max_results, status_file)
-            if resultats:
-                tous_resultats.extend(resultats)
-                # ✅ Sauvegarder progressivement
-                save_progress(results_file, resultats)
-                print(f'✅ {len(resultats)} résultats (total: {len(tous_resultats)})')
+            debut_tache = time.time()
+            nb_resultats = scrape_ville(task, max_results, status_file, driver_pool, places_connues,
+                                        controleur_delais, regulateur)
+            budget.enregistrer_duree(time.time() - debut_tache)
+            if nb_resultats is None:
+                echouees.append(task)
+            else:
+                suivi_taches.terminer(task)
+            if nb_resultats:
+                total_resultats += nb_resultats
+                print(f'✅ {nb_resultats} résultats (total: {total_resultats})')
     
-    print(f'✅ Scraping terminé: {len(tous_resultats)} résultats au total')
-
-    # Arrêter le thread de commit périodique
+    print(f'✅ Scraping terminé: {total_resultats} résultats au total')
+
+    # ✅ Débit par étape : extraction (threads navigateur) puis post-traitement
+    duree_extraction = time.time() - debut_extraction
+    print(f"🧭 Étape extraction: {num_threads} navigateurs, {total_resultats} fiches, "
+          f"{total_resultats * 60 / duree_extraction if duree_extraction else 0:.1f}/min")
+    pipeline_post.fermer()
+    for etape in pipeline_post.resume():
+        print(f"🧭 Étape {etape['etape']}: {etape['workers']} workers, {etape['entrees']} fiches "
+              f"({etape['ecartes']} écartées, {etape['erreurs']} erreurs), {etape['debit_par_min']}/min, "
+              f"occupation {etape['occupation_pct']}%")
+
+    # ✅ Écrire les dernières fiches en attente dans la BDD
+    ingestion_bdd.fermer()
+    resume_ingestion = ingestion_bdd.resume()
+    print(f"🗄️ Ingestion BDD: {resume_ingestion['ecrits']} fiches en {resume_ingestion['lots']} transactions, "
+          f"{resume_ingestion['rafraichis']} fiches connues rafraîchies, "
+          f"{resume_ingestion['erreurs']} erreurs, backlog max {resume_ingestion['backlog_max']}, "
+          f"commit moyen {resume_ingestion['commit_moyen_ms']} ms (p95 {resume_ingestion['commit_p95_ms']} ms)")
+    if resume_ingestion['erreur_ecrivain']:
+        print(f"⚠️ Écrivain SQLite arrêté en cours de run ({resume_ingestion['erreur_ecrivain']}) : "
+              f"fiches suivantes écrites directement")
+
+    # Arrêter le thread de commit périodique avant le compactage final et le manifeste final :
+    # attendre la fin d'un commit en cours (il compacte et réécrit le manifeste lui aussi)
     if enable_periodic_commits:
         print("🔄 Arrêt du thread de commit périodique...")
         stop_periodic_commit.set()
         if commit_thread:
-            commit_thread.join(timeout=5)
+            commit_thread.join()
+
+    # ✅ Vider le spool puis le compacter dans le JSON final
+    spool_resultats.fermer()
+    nb_compactes = compacter(spool_resultats.chemin, results_file)
+    print(f'🗜️ Spool compacté: {nb_compactes} résultats ({spool_resultats.nb_doublons} doublons ignorés, '
+          f'{spool_resultats.nb_fsync} fsync)')
+
+    # ✅ Manifeste de continuation : tout est écrit (BDD, spool, JSON), il ne reste que les villes à reprendre
+    taches_restantes = non_lancees + echouees
+    suivi_taches = None  # Manifeste final (avec sa raison) : les commits suivants ne le réécrivent plus
+    if taches_restantes:
+        ecrire_manifeste(taches_restantes, 'budget' if non_lancees else 'echecs',
+                         {'metiers': metiers, 'departements': departements, 'max_results': max_results})
+        print(f'📝 Manifeste de continuation: {len(taches_restantes)} villes à reprendre '
+              f'({len(non_lancees)} non lancées, {len(echouees)} en échec) -> {CHEMIN_MANIFESTE} '
+              f'(relancer avec RESUME_FROM_MANIFEST=true)')
+    else:
+        supprimer_manifeste()
+
+    # ✅ Fermer les navigateurs du pool
+    stats_pool = driver_pool.stats()
+    driver_pool.fermer_tout()
+    print(f"🧰 Pool navigateurs: {stats_pool['crees']} créés, {stats_pool['recycles']} recyclés, "
+          f"{stats_pool['actifs']} encore actifs en fin de run "
+          f"(recyclage toutes les {stats_pool['max_taches_par_driver']} tâches)")
+    resume_delais = controleur_delais.resume()
+    print(f"🎚️ Multiplicateur délais: {resume_delais['initial']}x -> {resume_delais['final']}x "
+          f"(min {resume_delais['min']}x, max {resume_delais['max']}x, {resume_delais['timeouts']} timeouts)")
+    resume_regulateur = regulateur.resume()
+    print(f"🚦 Régulateur: {resume_regulateur['blocages']} blocages Google, "
+          f"{resume_regulateur['attente_blocage_s']}s de pause, {resume_regulateur['attente_debit_s']}s d'attente de débit")
 
     # ✅ Mettre à jour le statut final
     final_status = {
@@ -609,8 +918,9 @@ if __name__ == "__main__":
         'total_tasks': len(toutes_villes),
         'completed_tasks': len([t for t in initial_status['tasks'].values() if t.get('status') == 'completed']),
         'failed_tasks': len([t for t in initial_status['tasks'].values() if t.get('status') == 'failed']),
-        'total_results': len(tous_resultats),
-        'status': 'completed'
+        'total_results': total_resultats,
+        'remaining_tasks': len(taches_restantes),
+        'status': 'partial' if taches_restantes else 'completed'
     }
     with open(status_file, 'w', encoding='utf-8') as f:
         json.dump(final_status, f, ensure_ascii=False, indent=2)
@@ -620,6 +930,6 @@ if __name__ == "__main__":
 
     # Commit final des résultats
     if enable_periodic_commits:
-        final_message = f"🤖 Scraping terminé: {len(tous_resultats)} résultats - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        final_message = f"🤖 Scraping terminé: {total_resultats} résultats - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         git_commit_and_push(final_message)
 
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Serveur local qui imite Google Maps (liste de résultats + panneau de détail) pour mesurer le scraper hors ligne
+
+Reproduit ce dont GoogleMapsScraper dépend :
+- /maps : barre de recherche (input#searchboxinput, Entrée -> /maps/search/...)
+- /maps/search/<requête> : div[role="feed"] scrollable, cartes div[role="article"] + a.hfpxzc,
+  chargement paresseux au scroll via une requête XHR /search?tbm=map (réponse préfixée )]}'),
+  marqueur de fin de liste (span.HlvSq)
+- clic sur une carte : panneau de détail div[role="main"] + h1.DUwDvf rendu après la latence configurée
+- /maps/place/<nom>/data=...!1s0x..:0x.. : fiche seule (mode 'onglets')
+
+Les établissements sont générés de façon déterministe à partir de la requête : deux lancements
+donnent exactement les mêmes données, ce qui rend les benchmarks comparables.
+
+Usage :
+    python scripts/serveur_fixtures_maps.py --port 8765 --nb 60 --latence-ms 300
+    -> GoogleMapsScraper(base_url='http://127.0.0.1:8765/maps')
+"""
+import re
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from html import escape
+from urllib.parse import quote_plus, unquote_plus, urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CATEGORIES = ['Plombier', 'Électricien', 'Chauffagiste', 'Menuisier', 'Serrurier', 'Peintre en bâtiment', 'Couvreur']
+NOMS = ['Martin', 'Bernard', 'Dubois', 'Thomas', 'Robert', 'Richard', 'Petit', 'Durand', 'Leroy', 'Moreau',
+        'Simon', 'Laurent', 'Lefebvre', 'Michel', 'Garcia', 'David', 'Bertrand', 'Roux', 'Vincent', 'Fournier']
+VILLES = [('Paris', '75001'), ('Lyon', '69002'), ('Marseille', '13001'), ('Toulouse', '31000'),
+          ('Nantes', '44000'), ('Bordeaux', '33000'), ('Lille', '59000')]
+RUES = ['rue de la République', 'avenue Jean Jaurès', 'boulevard Victor Hugo', 'rue Pasteur', 'place de la Mairie']
+
+TAILLE_PAGE = 20
+_RE_IDENTIFIANT = re.compile(r'!1s0x([0-9a-f]+):0x([0-9a-f]+)')
+
+
+def graine_requete(requete: str) -> int:
+    """Graine stable d'une requête (même requête -> mêmes établissements)"""
+    return int(hashlib.md5(requete.strip().lower().encode('utf-8')).hexdigest()[:8], 16)
+
+
+def generer_fiche(graine: int, index: int) -> list:
+    """
+    Tableau "fiche" au format des réponses de recherche Maps (positions décodées par scraping/xhr_capture.py)
+    """
+    rnd = random.Random(f"{graine}:{index}")
+    categorie = CATEGORIES[graine % len(CATEGORIES)]
+    ville, code_postal = VILLES[(graine // 7) % len(VILLES)]
+    nom = f"{categorie} {rnd.choice(NOMS)} {index + 1}"
+    fiche = [None] * 179
+    fiche[4] = [None] * 7 + [round(rnd.uniform(3.5, 5.0), 1), rnd.randint(1, 250)]
+    fiche[7] = [f"https://www.{rnd.choice(NOMS).lower()}-{index + 1}-artisan.fr/"] if rnd.random() < 0.6 else None
+    fiche[9] = [None, None, round(48.8 + rnd.uniform(-0.05, 0.05), 6), round(2.35 + rnd.uniform(-0.05, 0.05), 6)]
+    fiche[10] = f"0x{graine:x}:0x{index:x}"
+    fiche[11] = nom
+    fiche[13] = [categorie]
+    fiche[39] = f"{rnd.randint(1, 120)} {rnd.choice(RUES)}, {code_postal} {ville}"
+    fiche[78] = f"ChIJfixture{graine:x}x{index:x}"
+    if rnd.random() < 0.8:
+        telephone = f"0{rnd.choice([1, 2, 3, 4, 5, 6, 7, 9])}" + ''.join(str(rnd.randint(0, 9)) for _ in range(8))
+        fiche[178] = [[' '.join(telephone[i:i + 2] for i in range(0, 10, 2))]]
+    # Le téléphone n'est affiché que sur une partie des cartes (comme sur Maps)
+    fiche.append({'tel_sur_carte': rnd.random() < 0.5})
+    return fiche
+
+
+def page_fiches(graine: int, debut: int, nb_total: int) -> list:
+    return [generer_fiche(graine, i) for i in range(debut, min(debut + TAILLE_PAGE, nb_total))]
+
+
+# JS commun : rendu des cartes et du panneau de détail à partir des tableaux fiche
+_JS_COMMUN = """
+var FICHES = {};
+function e(t) { var d = document.createElement('div'); d.textContent = t == null ? '' : String(t); return d.innerHTML; }
+function hrefFiche(f) {
+    return '/maps/place/' + encodeURIComponent(f[11]).replace(/%20/g, '+') + '/data=!4m7!3m6!1s' + f[10] +
+        '!8m2!3d' + f[9][2] + '!4d' + f[9][3] + '!19s' + f[78];
+}
+function tel(f) { return f[178] ? f[178][0][0] : null; }
+function noteFr(f) { return String(f[4][7]).replace('.', ','); }
+function carte(f) {
+    FICHES[f[10]] = f;
+    var lignes = '<div class="W4Efsd"><span role="img" aria-label="' + noteFr(f) + ' étoiles ' + f[4][8] + ' avis"></span>' +
+        '<span>' + noteFr(f) + '</span><span>(' + f[4][8] + ')</span></div>' +
+        '<div class="W4Efsd">' + e(f[13][0]) + ' · ' + e(f[39].split(',')[0]) + '</div>';
+    if (tel(f) && f[179].tel_sur_carte) {
+        lignes += '<div class="W4Efsd">Ouvert · <span class="UsdlK">' + e(tel(f)) + '</span></div>';
+    }
+    var site = f[7] ? '<a data-value="Site Web" aria-label="Visiter le site Web de ' + e(f[11]) + '" href="' + e(f[7][0]) + '">Site Web</a>' : '';
+    return '<div role="article" class="Nv2PK" aria-label="' + e(f[11]) + '">' +
+        '<a class="hfpxzc" aria-label="' + e(f[11]) + '" href="' + hrefFiche(f) + '" data-id="' + f[10] + '"></a>' +
+        '<div class="fontHeadlineSmall">' + e(f[11]) + '</div>' + lignes + site + '</div>';
+}
+function panneau(f) {
+    var html = '<div role="main" aria-label="' + e(f[11]) + '" class="detail">' +
+        '<h1 class="DUwDvf">' + e(f[11]) + '</h1>' +
+        '<span role="img" aria-label="' + noteFr(f) + ' étoiles"></span>' +
+        '<span class="UY7F9" aria-label="' + f[4][8] + ' avis">(' + f[4][8] + ')</span>' +
+        '<button jsaction="pane.rating.category">' + e(f[13][0]) + '</button>' +
+        '<button data-item-id="address" aria-label="Adresse: ' + e(f[39]) + '">' + e(f[39]) + '</button>';
+    if (f[7]) {
+        html += '<a data-item-id="authority" aria-label="Site Web: ' + e(f[7][0]) + '" href="' + e(f[7][0]) + '">' + e(f[7][0]) + '</a>';
+    }
+    if (tel(f)) {
+        html += '<button data-item-id="phone:tel:' + tel(f).replace(/ /g, '') + '" aria-label="Numéro de téléphone: ' +
+            e(tel(f)) + '">' + e(tel(f)) + '</button>';
+    }
+    return html + '</div>';
+}
+function ouvrirPanneau(f) {
+    var ancien = document.querySelector('div.detail');
+    if (ancien) { ancien.parentNode.removeChild(ancien); }
+    setTimeout(function() {
+        document.getElementById('detail').insertAdjacentHTML('beforeend', panneau(f));
+    }, LATENCE_MS);
+}
+"""
+
+_PAGE_RECHERCHE = """<!DOCTYPE html>
+<html lang="fr"><head><meta charset="utf-8"><title>{titre} - Google Maps</title>
+<style>
+body {{ margin: 0; font-family: sans-serif; display: flex; }}
+#liste {{ width: 420px; }}
+div[role="feed"] {{ height: 100vh; overflow-y: auto; }}
+div[role="article"] {{ height: 120px; border-bottom: 1px solid #ddd; position: relative; }}
+a.hfpxzc {{ position: absolute; inset: 0; }}
+#detail {{ flex: 1; }}
+</style></head>
+<body>
+<input id="searchboxinput" aria-label="Rechercher dans Google Maps" value="{requete}">
+<div id="liste"><div role="main" aria-label="Résultats pour {requete}"><div role="feed" aria-label="Résultats pour {requete}"></div></div></div>
+<div id="detail"></div>
+<script>
+var LATENCE_MS = {latence_ms};
+var GRAINE = {graine};
+var NB_TOTAL = {nb_total};
+var PREMIERE_PAGE = {premiere_page};
+{js_commun}
+var feed = document.querySelector('div[role="feed"]');
+var charges = 0, enCours = false;
+function ajouter(fiches) {{
+    feed.insertAdjacentHTML('beforeend', fiches.map(carte).join(''));
+    charges += fiches.length;
+    if (charges >= NB_TOTAL && !document.querySelector('span.HlvSq')) {{
+        feed.insertAdjacentHTML('beforeend', '<p class="fontBodyMedium"><span><span class="HlvSq">Vous êtes arrivé à la fin de la liste.</span></span></p>');
+    }}
+}}
+feed.addEventListener('scroll', function() {{
+    if (enCours || charges >= NB_TOTAL || feed.scrollTop + feed.clientHeight < feed.scrollHeight - 200) {{ return; }}
+    enCours = true;
+    var xhr = new XMLHttpRequest();
+    xhr.open('GET', '/search?tbm=map&graine=' + GRAINE + '&debut=' + charges + '&nb=' + NB_TOTAL);
+    xhr.onload = function() {{
+        var donnees = JSON.parse(xhr.responseText.replace(/^\\)\\]\\}}'\\n/, ''));
+        ajouter(donnees[1].map(function(r) {{ return r[14]; }}));
+        enCours = false;
+    }};
+    xhr.send();
+}});
+document.addEventListener('click', function(ev) {{
+    var lien = ev.target.closest ? ev.target.closest('a.hfpxzc') : null;
+    if (!lien) {{ return; }}
+    ev.preventDefault();
+    history.pushState({{}}, '', lien.getAttribute('href'));
+    ouvrirPanneau(FICHES[lien.getAttribute('data-id')]);
+}});
+document.getElementById('searchboxinput').addEventListener('keydown', function(ev) {{
+    if (ev.key === 'Enter') {{ window.location.href = '/maps/search/' + encodeURIComponent(this.value); }}
+}});
+ajouter(PREMIERE_PAGE);
+</script>
+</body></html>
+"""
+
+_PAGE_ACCUEIL = """<!DOCTYPE html>
+<html lang="fr"><head><meta charset="utf-8"><title>Google Maps</title></head>
+<body><div role="main"><input id="searchboxinput" aria-label="Rechercher dans Google Maps"></div>
+<script>
+document.getElementById('searchboxinput').addEventListener('keydown', function(ev) {
+    if (ev.key === 'Enter') { window.location.href = '/maps/search/' + encodeURIComponent(this.value); }
+});
+</script></body></html>
+"""
+
+_PAGE_FICHE = """<!DOCTYPE html>
+<html lang="fr"><head><meta charset="utf-8"><title>{titre} - Google Maps</title></head>
+<body><div id="detail"></div>
+<script>
+var LATENCE_MS = {latence_ms};
+{js_commun}
+ouvrirPanneau({fiche});
+</script></body></html>
+"""
+
+
+class GestionnaireMaps(BaseHTTPRequestHandler):
+    """Routes /maps, /maps/search/..., /maps/place/..., /search?tbm=map"""
+
+    nb_etablissements = 60
+    latence_ms = 300
+    nb_requetes = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def _repondre(self, corps: str, type_contenu: str = 'text/html; charset=utf-8', code: int = 200):
+        donnees = corps.encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', type_contenu)
+        self.send_header('Content-Length', str(len(donnees)))
+        self.end_headers()
+        self.wfile.write(donnees)
+
+    def do_GET(self):
+        GestionnaireMaps.nb_requetes += 1
+        url = urlparse(self.path)
+        chemin = url.path.rstrip('/')
+
+        if chemin == '/search' and parse_qs(url.query).get('tbm') == ['map']:
+            # Page suivante de la liste (XHR) : même préfixe anti-XSSI que Google
+            params = parse_qs(url.query)
+            graine = int(params.get('graine', ['0'])[0])
+            debut = int(params.get('debut', ['0'])[0])
+            nb = int(params.get('nb', [str(self.nb_etablissements)])[0])
+            time.sleep(self.latence_ms / 1000.0)
+            resultats = [[None] * 14 + [f] for f in page_fiches(graine, debut, nb)]
+            self._repondre(")]}'\n" + json.dumps([None, resultats], ensure_ascii=False),
+                           'application/json; charset=utf-8')
+        elif chemin.startswith('/maps/search/'):
+            requete = unquote_plus(chemin[len('/maps/search/'):])
+            graine = graine_requete(requete)
+            self._repondre(_PAGE_RECHERCHE.format(
+                titre=escape(requete), requete=escape(requete, quote=True), latence_ms=self.latence_ms,
+                graine=graine, nb_total=self.nb_etablissements, js_commun=_JS_COMMUN,
+                premiere_page=json.dumps(page_fiches(graine, 0, self.nb_etablissements), ensure_ascii=False),
+            ))
+        elif chemin.startswith('/maps/place/'):
+            match = _RE_IDENTIFIANT.search(self.path)
+            if not match:
+                self._repondre('Fiche inconnue', code=404)
+                return
+            fiche = generer_fiche(int(match.group(1), 16), int(match.group(2), 16))
+            self._repondre(_PAGE_FICHE.format(titre=escape(fiche[11]), latence_ms=self.latence_ms,
+                                              js_commun=_JS_COMMUN, fiche=json.dumps(fiche, ensure_ascii=False)))
+        elif chemin in ('', '/maps'):
+            self._repondre(_PAGE_ACCUEIL)
+        else:
+            self._repondre('Introuvable', code=404)
+
+
+def demarrer_serveur(port: int = 8765, nb_etablissements: int = 60, latence_ms: int = 300,
+                     hote: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """
+    Démarre le serveur dans un thread daemon (utilisé par scripts/benchmark_scraper.py)
+
+    Returns:
+        Le serveur (serveur.server_address donne le port réel si port=0 ; serveur.shutdown() pour l'arrêter)
+    """
+    GestionnaireMaps.nb_etablissements = nb_etablissements
+    GestionnaireMaps.latence_ms = latence_ms
+    serveur = ThreadingHTTPServer((hote, port), GestionnaireMaps)
+    threading.Thread(target=serveur.serve_forever, daemon=True).start()
+    return serveur
+
+
+def url_base(serveur: ThreadingHTTPServer) -> str:
+    """Valeur à passer à GoogleMapsScraper(base_url=...)"""
+    hote, port = serveur.server_address[:2]
+    return f"http://{hote}:{port}/maps"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur de fixtures Google Maps (hors ligne)")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--nb', type=int, default=60, help="Établissements par recherche")
+    parser.add_argument('--latence-ms', type=int, default=300, help="Latence simulée (scroll, XHR, panneau)")
+    args = parser.parse_args()
+
+    serveur = demarrer_serveur(args.port, args.nb, args.latence_ms)
+    print(f"🗺️ Serveur de fixtures Maps: {url_base(serveur)} ({args.nb} établissements, latence {args.latence_ms} ms)")
+    print(f"   Exemple: {url_base(serveur)}/search/{quote_plus('plombier Paris')}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        serveur.shutdown()
+        print("🛑 Serveur arrêté")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Décodage des réponses XHR de recherche Google Maps (scraping/xhr_capture.py)
+Les fixtures de tests/fixtures/xhr reprennent le format des réponses /search?tbm=map
+(préfixe anti-XSSI, enveloppe {"c":..,"d":..} des pages suivantes) avec des fiches anonymisées.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scraping.dom_snapshot import parser_etat_panneau
+from scraping.place_ids import cle_fiche
+from scraping.xhr_capture import CaptureRecherche, charger_json_maps, decoder_reponse
+
+FIXTURES = Path(__file__).parent / "fixtures" / "xhr"
+
+# Format du dict produit par l'extraction DOM (celui que scraper() renvoie pour chaque fiche)
+CLES_INFO = set(parser_etat_panneau({}, lambda tel: tel))
+
+
+def _lire(nom: str) -> str:
+    return (FIXTURES / nom).read_text(encoding='utf-8')
+
+
+def _normaliser(tel: str) -> str:
+    return f"{tel[0:2]} {tel[2:4]} {tel[4:6]} {tel[6:8]} {tel[8:10]}"
+
+
+@pytest.mark.parametrize('nom', ['recherche_premiere_page.txt', 'recherche_page_suivante.txt'])
+def test_format_scraper(nom):
+    fiches = decoder_reponse(_lire(nom))
+    assert fiches
+    for info in fiches:
+        assert CLES_INFO <= set(info)
+        assert info['nom']
+        assert info['google_maps_url'].startswith('https://www.google.com/maps/place/')
+        assert cle_fiche(info['google_maps_url'])
+
+
+def test_premiere_page():
+    fiches = {info['nom']: info for info in decoder_reponse(_lire('recherche_premiere_page.txt'), _normaliser)}
+    assert list(fiches) == ['Plomberie Exemple', 'Dépannage Test', 'Artisan Sans Téléphone']
+
+    plomberie = fiches['Plomberie Exemple']
+    assert plomberie['telephone'] == '01 23 45 67 89'
+    assert plomberie['site_web'] == 'https://www.plomberie-exemple.fr/'
+    assert plomberie['adresse'] == "12 Rue de l'Exemple, 75011 Paris"
+    assert plomberie['code_postal'] == '75011'
+    assert plomberie['ville'] == 'Paris'
+    assert plomberie['note'] == 4.7
+    assert plomberie['nb_avis'] == 132
+    assert plomberie['categorie'] == 'Plombier'
+    assert '!1s0x47e671a5b1c2d3e4:0x1a2b3c4d5e6f7081' in plomberie['google_maps_url']
+    assert '!19sChIJAAAAAAAAAAAAAAAAAAAAAAA' in plomberie['google_maps_url']
+
+    # Téléphone en [3][0] au format international, lien de réservation Google écarté
+    depannage = fiches['Dépannage Test']
+    assert depannage['telephone'] == '06 12 34 56 78'
+    assert depannage['site_web'] is None
+    assert depannage['code_postal'] == '75011'
+
+    # Note sans nombre d'avis -> 0 avis, comme l'extraction DOM
+    sans_tel = fiches['Artisan Sans Téléphone']
+    assert sans_tel['telephone'] is None
+    assert sans_tel['note'] == 5.0
+    assert sans_tel['nb_avis'] == 0
+
+
+def test_page_suivante_enveloppee():
+    assert charger_json_maps(_lire('recherche_page_suivante.txt')) is not None
+    fiches = {info['nom']: info for info in decoder_reponse(_lire('recherche_page_suivante.txt'))}
+    assert fiches['Chauffage Démo SARL']['telephone'] == '0987654321'
+    assert fiches['Chauffage Démo SARL']['site_web'] == 'http://chauffage-demo.fr/'
+    # Numéro britannique : ignoré
+    assert fiches['Numéro Étranger Ltd']['telephone'] is None
+    assert fiches['Numéro Étranger Ltd']['note'] is None
+
+
+def test_reponse_illisible():
+    assert decoder_reponse('') == []
+    assert decoder_reponse(")]}'\n<html>") == []
+
+
+class _DriverFactice:
+    def __init__(self, corps):
+        self.corps = corps
+
+    def execute_cdp_cmd(self, commande, params):
+        return {'body': self.corps[params['requestId']]}
+
+
+def test_capture_depuis_journal():
+    driver = _DriverFactice({'1': _lire('recherche_premiere_page.txt'), '2': _lire('recherche_page_suivante.txt')})
+    capture = CaptureRecherche(driver, _normaliser)
+    capture.traiter([
+        {'method': 'Network.responseReceived',
+         'params': {'requestId': '1', 'response': {'url': 'https://www.google.com/search?tbm=map&q=plombier'}}},
+        {'method': 'Network.responseReceived',
+         'params': {'requestId': '2', 'response': {'url': 'https://www.google.com/search?tbm=map&q=plombier&ech=2'}}},
+        {'method': 'Network.responseReceived',
+         'params': {'requestId': '3', 'response': {'url': 'https://www.google.com/maps/vt?pb=tuile'}}},
+        {'method': 'Network.loadingFinished', 'params': {'requestId': '1'}},
+        {'method': 'Network.loadingFinished', 'params': {'requestId': '2'}},
+        {'method': 'Network.loadingFinished', 'params': {'requestId': '3'}},
+    ])
+    assert capture.nb_reponses == 2
+    assert len(capture.fiches) == 5
+
+    # Retrouvée depuis le href d'une carte de la liste (même clé que cle_fiche)
+    href = ('https://www.google.com/maps/place/Plomberie+Exemple/data=!4m7!3m6'
+            '!1s0x47e671a5b1c2d3e4:0x1a2b3c4d5e6f7081!8m2!3d48.8566!4d2.3522?authuser=0')
+    info = capture.fiche(href)
+    assert info['telephone'] == '01 23 45 67 89'
@@ -26,6 +26,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from whatsapp_database.queries import ajouter_artisan, get_statistiques
 from whatsapp_database.models import init_database
+from scraping.results_spool import charger_resultats
+from whatsapp_database.gazetteer import communes_du_departement, departement_de_ville
 
 # ✅ Initialiser la base de données au démarrage de la page (ajoute les nouvelles colonnes si nécessaire)
 try:
@@ -62,7 +64,10 @@ except:
 
 # ✅ Fonction pour récupérer les communes depuis data.gouv.fr
 def get_communes_from_api(departement: str, min_population: int = 0, max_population: int = 50000):
-    """Récupère les communes d'un département depuis l'API data.gouv.fr avec coordonnées GPS"""
+    """Récupère les communes d'un département avec coordonnées GPS (gazetteer local, sinon API data.gouv.fr)"""
+    communes_locales = communes_du_departement(departement, min_population, max_population)
+    if communes_locales is not None:
+        return communes_locales
     try:
         url = f"https://geo.api.gouv.fr/departements/{departement}/communes"
         params = {
@@ -1120,17 +1125,11 @@ if not st.session_state.scraped_results:
     results_file = Path(__file__).parent.parent.parent / "data" / "scraping_results_github_actions.json"
     results_list = []
     
-    # 1. Charger depuis le fichier JSON (si existe)
-    if results_file.exists():
-        try:
-            with open(results_file, 'r', encoding='utf-8') as f:
-                results_data = json.load(f)
-                if isinstance(results_data, dict) and 'results' in results_data:
-                    results_list = results_data['results']
-                elif isinstance(results_data, list):
-                    results_list = results_data
-        except Exception as e:
-            logger.error(f"Erreur chargement JSON: {e}")
+    # 1. Charger depuis le fichier JSON + les lignes du spool JSONL pas encore compactées
+    try:
+        results_list = charger_resultats(results_file)
+    except Exception as e:
+        logger.error(f"Erreur chargement JSON: {e}")
     
     # 2. ✅ AUSSI charger depuis la BDD (pour voir les résultats sauvegardés directement)
     try:
@@ -1152,7 +1151,9 @@ if not st.session_state.scraped_results:
                             else:
                                 dept = code_postal_str[:2]
                     
-                    # ✅ Si toujours pas de département, essayer depuis ville_recherche via API
+                    # ✅ Si toujours pas de département : gazetteer local, puis API
+                    if not dept and artisan.get('ville_recherche'):
+                        dept = departement_de_ville(artisan.get('ville_recherche', '').strip())
                     if not dept and artisan.get('ville_recherche'):
                         try:
                             ville_nom = artisan.get('ville_recherche', '').strip()
@@ -17,6 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from whatsapp_database.queries import get_artisans, get_statistiques, ajouter_artisan, importer_artisans_batch
 from whatsapp_database.models import get_connection, init_database
+from scraping.results_spool import chemin_spool, charger_resultats
 from whatsapp.message_builder import detect_site_type
 from whatsapp.phone_utils import is_mobile, is_landline
 import sqlite3
@@ -259,6 +260,7 @@ with col_sync:
             stash_result = subprocess.run(
                 ['git', 'stash', 'push', '-m', 'auto-stash-before-sync', '--',
                  'data/scraping_results_github_actions.json',
+                 'data/scraping_results_github_actions.jsonl',
                  'data/github_actions_status.json'],
                 capture_output=True, text=True, cwd=str(repo_root)
             )
@@ -322,32 +324,10 @@ with col_sync:
         results_file = data_dir / "scraping_results_github_actions.json"
         local_results_count = 0
 
-        if results_file.exists():
+        if results_file.exists() or chemin_spool(results_file).exists():
             try:
-                with open(results_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # ✅ FIX: Handle malformed JSON with extra data
-                try:
-                    data = json.loads(content)
-                except json.JSONDecodeError as e:
-                    if "Extra data" in str(e):
-                        # Parse only the first JSON object
-                        error_pos = e.pos if hasattr(e, 'pos') else len(content)
-                        truncated = content[:error_pos].rstrip()
-                        if not truncated.endswith('}'):
-                            last_brace = truncated.rfind('}')
-                            if last_brace > 0:
-                                truncated = truncated[:last_brace+1]
-                        data = json.loads(truncated)
-                    else:
-                        raise
-
-                results_list = []
-                if isinstance(data, dict) and 'results' in data:
-                    results_list = data.get('results', [])
-                elif isinstance(data, list):
-                    results_list = data
+                # ✅ JSON compacté + lignes du spool JSONL pas encore compactées (run en cours ou interrompu)
+                results_list = charger_resultats(results_file)
 
                 if results_list:
                     for info in results_list:
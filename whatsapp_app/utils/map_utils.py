@@ -10,6 +10,7 @@ import json
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from whatsapp_database.queries import get_artisans
+from whatsapp_database.gazetteer import departement_de_ville
 
 # ✅ Cache persistant pour ville -> département
 CACHE_FILE = Path(__file__).parent.parent.parent / "data" / "ville_dept_cache.json"
@@ -97,6 +98,11 @@ def create_scraping_map_by_job(metier=None):
     # ✅ OPTIMISATION : Traiter les villes uniques avec cache
     for ville, artisans_ville in villes_uniques.items():
         if ville not in ville_to_dept_cache:
+            # ✅ Gazetteer local d'abord (pas de réseau, pas d'écriture de cache)
+            dept_local = departement_de_ville(ville)
+            if dept_local:
+                ville_to_dept_cache[ville] = dept_local
+                continue
             # Essayer de trouver le département via API (une seule fois par ville)
             try:
                 import requests
@@ -0,0 +1,189 @@
+"""
+Gazetteer hors ligne des communes françaises
+Remplace les appels geo.api.gouv.fr (code postal, département, centre, communes d'un département)
+par des tables en mémoire chargées à la première utilisation depuis data/communes_fr.tsv.gz
+(généré par scripts/build_gazetteer.py).
+
+Format du fichier (TSV gzip, une commune par ligne) :
+    code_insee  nom  codes_postaux (séparés par ',')  departement  population  latitude  longitude
+La première ligne, préfixée par '#', contient les métadonnées JSON (source, date_source, complet).
+"""
+import re
+import gzip
+import json
+import logging
+import threading
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CHEMIN_GAZETTEER = Path(__file__).parent.parent / "data" / "communes_fr.tsv.gz"
+
+Commune = namedtuple('Commune', ['code_insee', 'nom', 'codes_postaux', 'departement', 'population',
+                                 'latitude', 'longitude'])
+
+
+@lru_cache(maxsize=8192)
+def normaliser_nom(nom: str) -> str:
+    """Clé de recherche insensible aux accents, à la casse, aux tirets/apostrophes et à "St"/"Saint" """
+    if not nom:
+        return ''
+    nom = unicodedata.normalize('NFKD', str(nom))
+    nom = ''.join(c for c in nom if not unicodedata.combining(c)).lower()
+    nom = re.sub(r"[-'’_.,/]", ' ', nom)
+    nom = re.sub(r'\bste\b', 'sainte', nom)
+    nom = re.sub(r'\bst\b', 'saint', nom)
+    return re.sub(r'\s+', ' ', nom).strip()
+
+
+def departement_du_code_postal(code_postal) -> Optional[str]:
+    """Département déduit d'un code postal (97x/98x : 3 chiffres), sans table"""
+    code_postal = str(code_postal or '').strip()
+    if not re.match(r'^\d{5}$', code_postal):
+        return None
+    if code_postal.startswith('97') or code_postal.startswith('98'):
+        return code_postal[:3]
+    return code_postal[:2]
+
+
+class Gazetteer:
+    """Tables de recherche : une liste de Commune + index par nom normalisé, code postal, INSEE et département"""
+
+    def __init__(self, communes: List[Commune], metadonnees: Optional[Dict] = None):
+        self.communes = communes
+        self.metadonnees = metadonnees or {}
+        par_nom: Dict[str, List[int]] = {}
+        par_code_postal: Dict[str, List[int]] = {}
+        par_departement: Dict[str, List[int]] = {}
+        self.par_insee: Dict[str, int] = {}
+        for i, commune in enumerate(communes):
+            par_nom.setdefault(normaliser_nom(commune.nom), []).append(i)
+            for code_postal in commune.codes_postaux:
+                par_code_postal.setdefault(code_postal, []).append(i)
+            par_departement.setdefault(commune.departement, []).append(i)
+            self.par_insee[commune.code_insee] = i
+        # Tuples plutôt que listes : index figés, plus compacts
+        self.par_nom = {k: tuple(v) for k, v in par_nom.items()}
+        self.par_code_postal = {k: tuple(v) for k, v in par_code_postal.items()}
+        self.par_departement = {k: tuple(v) for k, v in par_departement.items()}
+
+    @property
+    def complet(self) -> bool:
+        """True si le fichier couvre toutes les communes (sinon les listes par département sont partielles)"""
+        return bool(self.metadonnees.get('complet'))
+
+    def chercher(self, nom: str, departement: Optional[str] = None, code_postal: Optional[str] = None) -> Optional[Commune]:
+        """
+        Commune par nom (homonymes départagés par département / code postal, puis par population)
+        """
+        indices = self.par_nom.get(normaliser_nom(nom), ())
+        candidates = [self.communes[i] for i in indices]
+        if departement:
+            candidates = [c for c in candidates if c.departement == str(departement)]
+        if code_postal:
+            avec_code = [c for c in candidates if str(code_postal) in c.codes_postaux]
+            candidates = avec_code or candidates
+        if not candidates:
+            return None
+        return max(candidates, key=lambda c: c.population)
+
+    def communes_du_code_postal(self, code_postal: str) -> List[Commune]:
+        return [self.communes[i] for i in self.par_code_postal.get(str(code_postal).strip(), ())]
+
+    def communes_du_departement(self, departement: str) -> List[Commune]:
+        return [self.communes[i] for i in self.par_departement.get(str(departement), ())]
+
+
+def _lire(chemin: Path) -> Gazetteer:
+    communes = []
+    metadonnees = {}
+    with gzip.open(chemin, 'rt', encoding='utf-8') as f:
+        for ligne in f:
+            if ligne.startswith('#'):
+                try:
+                    metadonnees = json.loads(ligne[1:])
+                except ValueError:
+                    pass
+                continue
+            champs = ligne.rstrip('\n').split('\t')
+            if len(champs) != 7:
+                continue
+            code, nom, codes_postaux, departement, population, latitude, longitude = champs
+            communes.append(Commune(
+                code, nom, tuple(cp for cp in codes_postaux.split(',') if cp), departement,
+                int(population or 0),
+                float(latitude) if latitude else None,
+                float(longitude) if longitude else None,
+            ))
+    return Gazetteer(communes, metadonnees)
+
+
+_gazetteer: Optional[Gazetteer] = None
+_charge = False
+_lock = threading.Lock()
+
+
+def gazetteer() -> Optional[Gazetteer]:
+    """Gazetteer partagé, chargé à la première utilisation (None si le fichier n'a pas été généré)"""
+    global _gazetteer, _charge
+    if not _charge:
+        with _lock:
+            if not _charge:
+                if CHEMIN_GAZETTEER.exists():
+                    try:
+                        _gazetteer = _lire(CHEMIN_GAZETTEER)
+                        logger.info(f"🗺️ Gazetteer: {len(_gazetteer.communes)} communes chargées")
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"⚠️ Gazetteer illisible ({CHEMIN_GAZETTEER.name}): {e}")
+                _charge = True
+    return _gazetteer
+
+
+def chercher_commune(nom: str, departement: Optional[str] = None, code_postal: Optional[str] = None) -> Optional[Commune]:
+    """Commune par nom (None si inconnue ou gazetteer absent)"""
+    g = gazetteer()
+    return g.chercher(nom, departement, code_postal) if g and nom else None
+
+
+def departement_de_ville(nom: str) -> Optional[str]:
+    """Département d'une commune (la plus peuplée en cas d'homonymes)"""
+    commune = chercher_commune(nom)
+    return commune.departement if commune else None
+
+
+def code_postal_de_ville(nom: str, departement: Optional[str] = None) -> Optional[str]:
+    """Premier code postal d'une commune"""
+    commune = chercher_commune(nom, departement)
+    return commune.codes_postaux[0] if commune and commune.codes_postaux else None
+
+
+def communes_du_departement(departement: str, min_population: int = 0,
+                            max_population: Optional[int] = None) -> Optional[List[Dict]]:
+    """
+    Communes d'un département au format de get_communes_from_api
+    ('nom', 'code', 'code_postal', 'population', 'latitude', 'longitude'), triées par population croissante
+
+    Returns:
+        None si le gazetteer est absent ou partiel (l'appelant interroge alors l'API)
+    """
+    g = gazetteer()
+    if not g or not g.complet:
+        return None
+    resultat = []
+    for c in g.communes_du_departement(departement):
+        if c.population < min_population or (max_population is not None and c.population > max_population):
+            continue
+        resultat.append({
+            'nom': c.nom,
+            'code': c.code_insee,
+            'code_postal': c.codes_postaux[0] if c.codes_postaux else c.code_insee,
+            'population': c.population,
+            'latitude': c.latitude,
+            'longitude': c.longitude,
+        })
+    resultat.sort(key=lambda x: x['population'])
+    return resultat
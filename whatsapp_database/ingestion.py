@@ -0,0 +1,201 @@
+"""
+Ingestion des artisans par un écrivain SQLite unique
+Les threads de scraping déposent les fiches dans une file bornée ; un seul thread possède la connexion
+et applique dédoublonnage + upserts (ajouter_artisan) par transactions groupées (toutes les N fiches
+ou toutes les T ms), au lieu d'une connexion + un commit (fsync) par fiche et par thread.
+Les rafraîchissements des fiches déjà connues (note / avis, champs manquants) passent par la même file.
+Si l'écrivain s'arrête sur une erreur (base inaccessible au démarrage...), l'erreur est conservée et
+les dépôts suivants repassent en écriture directe au lieu de bloquer sur une file que plus personne ne vide.
+"""
+import time
+import queue
+import threading
+import traceback
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+from whatsapp_database.models import get_connection
+from whatsapp_database.queries import ajouter_artisan, build_dedup_cache, rafraichir_artisan_connu
+
+_FIN = object()  # Sentinelle d'arrêt du thread écrivain
+
+# Mise à jour légère d'une fiche connue (voir rafraichir_artisan_connu)
+_Rafraichissement = namedtuple('_Rafraichissement', ['place_id', 'note', 'nombre_avis', 'completer'])
+
+
+class IngestionArtisans:
+    """
+    Écrivain unique de la table artisans
+
+    Usage :
+        ingestion = IngestionArtisans()
+        ingestion.ajouter(data)     # depuis n'importe quel thread (bloque si la file est pleine)
+        ingestion.rafraichir(place_id, note, nombre_avis)
+        ingestion.rafraichir(place_id, completer={'telephone': ...})   # champs vides en base seulement
+        ingestion.fermer()          # écrit ce qui reste, commit, ferme la connexion
+    """
+
+    def __init__(self, taille_lot: int = 50, intervalle_ms: int = 500, taille_max_file: int = 1000):
+        """
+        Args:
+            taille_lot: Commit dès que ce nombre de fiches est en attente dans la transaction...
+            intervalle_ms: ...ou dès que la plus ancienne attend depuis ce délai
+            taille_max_file: File bornée : au-delà, les scrapers attendent l'écrivain (pas de mémoire sans limite)
+        """
+        self.taille_lot = taille_lot
+        self.intervalle_s = intervalle_ms / 1000.0
+        self._file: queue.Queue = queue.Queue(maxsize=taille_max_file)
+        self.nb_ecrits = 0
+        self.nb_rafraichis = 0
+        self.nb_erreurs = 0
+        self.nb_lots = 0
+        self.backlog_max = 0
+        self.latences_commit_ms: List[float] = []
+        self.erreur_ecrivain: Optional[str] = None  # Erreur qui a arrêté le thread écrivain
+        self._thread = threading.Thread(target=self._ecrire, name='ingestion-artisans', daemon=True)
+        self._thread.start()
+
+    @property
+    def backlog(self) -> int:
+        """Fiches en attente d'écriture"""
+        return self._file.qsize()
+
+    @property
+    def actif(self) -> bool:
+        """False si le thread écrivain s'est arrêté (fermeture ou erreur)"""
+        return self._thread.is_alive()
+
+    def ajouter(self, data: Dict):
+        """
+        Dépose une fiche (format ajouter_artisan)
+
+        Écrivain arrêté sur erreur : écriture directe (une connexion + un commit), les erreurs remontent
+        """
+        if not self._deposer(data):
+            self._vider_en_direct()
+            ajouter_artisan(data)
+            self.nb_ecrits += 1
+
+    def rafraichir(self, place_id: str, note: Optional[float] = None, nombre_avis: Optional[int] = None,
+                   completer: Optional[Dict] = None):
+        """Dépose un rafraîchissement de fiche connue (ignoré s'il n'y a rien à mettre à jour)"""
+        if not place_id or (note is None and nombre_avis is None and not completer):
+            return
+        if not self._deposer(_Rafraichissement(place_id, note, nombre_avis, completer)):
+            self._vider_en_direct()
+            if rafraichir_artisan_connu(place_id, note, nombre_avis, completer=completer):
+                self.nb_rafraichis += 1
+
+    def _deposer(self, item) -> bool:
+        """Met l'item en file ; False si l'écrivain est arrêté (l'appelant écrit lui-même)"""
+        while self._thread.is_alive():
+            try:
+                # Attente bornée : revérifier que l'écrivain vit toujours si la file reste pleine
+                self._file.put(item, timeout=1.0)
+            except queue.Full:
+                continue
+            self.backlog_max = max(self.backlog_max, self._file.qsize())
+            return True
+        return False
+
+    def _ecrire(self):
+        try:
+            self._boucle_ecriture()
+        except Exception as e:
+            self.erreur_ecrivain = f"{type(e).__name__}: {e}"
+            print(f"❌ Ingestion: écrivain SQLite arrêté ({self.erreur_ecrivain}), passage en écriture directe")
+            traceback.print_exc()
+            self._vider_en_direct()
+
+    def _vider_en_direct(self):
+        """Écrit une par une les fiches restées en file après l'arrêt de l'écrivain (appelé par tout thread)"""
+        while True:
+            try:
+                data = self._file.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                if isinstance(data, _Rafraichissement):
+                    if rafraichir_artisan_connu(data.place_id, data.note, data.nombre_avis, completer=data.completer):
+                        self.nb_rafraichis += 1
+                elif data is not _FIN:
+                    ajouter_artisan(data)
+                    self.nb_ecrits += 1
+            except Exception as e:
+                self.nb_erreurs += 1
+                nom = data.place_id if isinstance(data, _Rafraichissement) else data.get('nom_entreprise', 'N/A')
+                print(f"⚠️ Ingestion: fiche ignorée ({nom}): {e}")
+
+    def _boucle_ecriture(self):
+        conn = get_connection()
+        try:
+            # Cache nom+adresse construit une fois : plus de recherche LIKE par fiche
+            dedup_cache = build_dedup_cache()
+            en_attente = 0
+            debut_lot = None
+            fin = False
+            while not fin:
+                delai = self.intervalle_s if debut_lot is None else max(0.0, debut_lot + self.intervalle_s - time.time())
+                try:
+                    data = self._file.get(timeout=delai)
+                except queue.Empty:
+                    data = None
+                if data is _FIN:
+                    fin = True
+                elif isinstance(data, _Rafraichissement):
+                    if rafraichir_artisan_connu(data.place_id, data.note, data.nombre_avis, conn=conn, commit=False,
+                                                completer=data.completer):
+                        self.nb_rafraichis += 1
+                    en_attente += 1
+                    if debut_lot is None:
+                        debut_lot = time.time()
+                elif data is not None:
+                    try:
+                        ajouter_artisan(data, conn=conn, dedup_cache=dedup_cache, commit=False)
+                        self.nb_ecrits += 1
+                    except Exception as e:
+                        # Seule l'instruction fautive est annulée, le reste de la transaction est conservé
+                        self.nb_erreurs += 1
+                        print(f"⚠️ Ingestion: fiche ignorée ({data.get('nom_entreprise', 'N/A')}): {e}")
+                    en_attente += 1
+                    if debut_lot is None:
+                        debut_lot = time.time()
+                if en_attente and (fin or en_attente >= self.taille_lot or time.time() - debut_lot >= self.intervalle_s):
+                    self._commit(conn, en_attente)
+                    en_attente = 0
+                    debut_lot = None
+        finally:
+            conn.close()
+
+    def _commit(self, conn, nb: int):
+        debut = time.time()
+        try:
+            conn.commit()
+        except Exception as e:
+            self.nb_erreurs += nb
+            print(f"❌ Ingestion: échec du commit de {nb} fiches: {e}")
+            conn.rollback()
+            return
+        self.latences_commit_ms.append((time.time() - debut) * 1000)
+        self.nb_lots += 1
+
+    def fermer(self):
+        """Vide la file, commit le dernier lot et arrête l'écrivain"""
+        if self._deposer(_FIN):
+            self._thread.join()
+        # Écrivain arrêté sur erreur : ce qui reste en file est écrit directement
+        self._vider_en_direct()
+
+    def resume(self) -> Dict:
+        latences = sorted(self.latences_commit_ms)
+        return {
+            'ecrits': self.nb_ecrits,
+            'rafraichis': self.nb_rafraichis,
+            'erreurs': self.nb_erreurs,
+            'lots': self.nb_lots,
+            'backlog': self.backlog,
+            'backlog_max': self.backlog_max,
+            'erreur_ecrivain': self.erreur_ecrivain,
+            'commit_moyen_ms': round(sum(latences) / len(latences), 1) if latences else 0.0,
+            'commit_p95_ms': round(latences[int(0.95 * (len(latences) - 1))], 1) if latences else 0.0,
+        }
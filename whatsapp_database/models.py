@@ -123,6 +123,23 @@ def init_database():
         except sqlite3.OperationalError:
             pass  # Colonne existe déjà
     
+    # ✅ Table des timings par étape (une ligne par mesure, reliée à scraping_history par session_id)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scraping_timings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            metier TEXT,
+            departement TEXT,
+            ville TEXT,
+            environnement TEXT,  -- 'local' ou 'github_actions'
+            etape TEXT NOT NULL,  -- 'setup_driver', 'recherche', 'scroll', 'clic', 'attente_panneau'...
+            index_etablissement INTEGER,
+            debut_offset REAL,  -- Secondes depuis le début de la session
+            duree REAL NOT NULL,  -- Secondes
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    
     # Ajouter les nouvelles colonnes si elles n'existent pas (migration)
     nouvelles_colonnes = [
         ("siret", "TEXT"),
@@ -140,6 +157,7 @@ def init_database():
         ("ville_recherche", "TEXT"),  # Ville utilisée pour la recherche
         ("departement_recherche", "TEXT"),  # Département de la recherche (peut différer du département réel)
         ("google_maps_url", "TEXT"),  # URL directe vers la fiche Google Maps
+        ("place_key", "TEXT"),  # Clé de la fiche (scraping.place_ids.cle_fiche(google_maps_url)), indexée
     ]
     
     for colonne, type_col in nouvelles_colonnes:
@@ -158,7 +176,12 @@ def init_database():
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_a_repondu ON artisans(a_repondu)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_statut_reponse ON artisans(statut_reponse)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_source_telephone ON artisans(source_telephone)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_place_key ON artisans(place_key)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_scraping_history ON scraping_history(metier, departement, ville)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_scraping_timings_session ON scraping_timings(session_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_scraping_timings_etape ON scraping_timings(environnement, etape)")
+    
+    _remplir_place_keys(cursor)
     
     conn.commit()
     conn.close()
@@ -169,6 +192,17 @@ def init_database():
     # ✅ Retourner True pour confirmer l'initialisation
     return True
 
+def _remplir_place_keys(cursor):
+    """Migration : calcule place_key pour les fiches enregistrées avant l'ajout de la colonne"""
+    from scraping.place_ids import cle_fiche
+    
+    cursor.execute("""
+        SELECT id, google_maps_url FROM artisans
+        WHERE place_key IS NULL AND google_maps_url IS NOT NULL AND google_maps_url != ''
+    """)
+    cles = [(cle_fiche(url), artisan_id) for artisan_id, url in cursor.fetchall()]
+    cursor.executemany("UPDATE artisans SET place_key = ? WHERE id = ?", [c for c in cles if c[0]])
+
 def get_connection():
     """Retourne une connexion à la base de données"""
     return sqlite3.connect(DB_PATH)
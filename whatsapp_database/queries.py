@@ -64,7 +64,7 @@ def generate_name_addr_hash(name: str, address: str) -> str:
     return None
 
 
-def ajouter_artisan(data: Dict, conn=None, dedup_cache: Dict = None) -> int:
+def ajouter_artisan(data: Dict, conn=None, dedup_cache: Dict = None, commit: bool = True) -> int:
     """
     Ajoute un artisan ou met à jour si doublon (par téléphone, SIRET, ou nom+adresse)
     Retourne l'ID de l'artisan
@@ -78,6 +78,7 @@ def ajouter_artisan(data: Dict, conn=None, dedup_cache: Dict = None) -> int:
         data: Artisan data dictionary
         conn: Optional existing connection (for batch operations)
         dedup_cache: Optional cache dict for name+address lookups (for batch operations)
+        commit: Commit after the write (False: the caller commits, e.g. batched transactions)
     """
     own_connection = conn is None
     if own_connection:
@@ -88,6 +89,11 @@ def ajouter_artisan(data: Dict, conn=None, dedup_cache: Dict = None) -> int:
     if data.get('telephone'):
         data['telephone_formate'] = formater_telephone_fr(data['telephone'])
 
+    # Clé de la fiche Google Maps (colonne indexée : fiches connues, rafraîchissement)
+    if data.get('google_maps_url') and not data.get('place_key'):
+        from scraping.place_ids import cle_fiche
+        data['place_key'] = cle_fiche(data['google_maps_url'])
+
     existing_id = None
 
     # Priority 1: Check duplicate by phone number (uses index - fast)
@@ -154,7 +160,8 @@ def ajouter_artisan(data: Dict, conn=None, dedup_cache: Dict = None) -> int:
             query = f"UPDATE artisans SET {', '.join(update_fields)} WHERE id = ?"
             cursor.execute(query, update_values)
 
-        conn.commit()
+        if commit or own_connection:
+            conn.commit()
         if own_connection:
             conn.close()
         return existing_id
@@ -182,7 +189,8 @@ def ajouter_artisan(data: Dict, conn=None, dedup_cache: Dict = None) -> int:
         try:
             cursor.execute(query, values)
             artisan_id = cursor.lastrowid
-            conn.commit()
+            if commit or own_connection:
+                conn.commit()
 
             # Update dedup cache if provided
             if dedup_cache is not None and artisan_id:
@@ -201,7 +209,8 @@ def ajouter_artisan(data: Dict, conn=None, dedup_cache: Dict = None) -> int:
                     cursor.execute("SELECT id FROM artisans WHERE telephone = ?", (data['telephone'],))
                     result = cursor.fetchone()
                     if result:
-                        conn.commit()
+                        if commit or own_connection:
+                            conn.commit()
                         if own_connection:
                             conn.close()
                         return result[0]
@@ -306,7 +315,7 @@ def importer_artisans_batch(records: list, progress_callback=None) -> dict:
                     stats['imported'] += 1
 
             # Use ajouter_artisan with shared connection and cache
-            artisan_id = ajouter_artisan(record, conn=conn, dedup_cache=dedup_cache)
+            artisan_id = ajouter_artisan(record, conn=conn, dedup_cache=dedup_cache, commit=False)
 
             # Commit in batches
             if (i + 1) % batch_size == 0:
@@ -547,6 +556,36 @@ def mark_scraping_done(metier: str, departement: str, ville: str, results_count:
     finally:
         conn.close()
 
+def save_scraping_timings(session_id: str, metier: str, departement: str, ville: str,
+                          environnement: str, mesures: List[Dict]):
+    """
+    Enregistre la timeline d'une session de scraping (scraping.instrumentation.Chronometre)
+
+    Args:
+        session_id: ID de session (le même que dans scraping_history)
+        environnement: 'local' ou 'github_actions'
+        mesures: Liste de dicts {etape, duree, debut_offset, index_etablissement}
+    """
+    if not mesures:
+        return
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.executemany("""
+            INSERT INTO scraping_timings
+            (session_id, metier, departement, ville, environnement, etape, index_etablissement, debut_offset, duree)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (session_id, metier, departement, ville, environnement, m['etape'],
+             m.get('index_etablissement'), m.get('debut_offset'), m['duree'])
+            for m in mesures
+        ])
+        conn.commit()
+    except Exception as e:
+        print(f"Erreur sauvegarde timings: {e}")
+    finally:
+        conn.close()
+
 def is_already_scraped(metier: str, departement: str, ville: str) -> bool:
     """Vérifie si une combinaison métier/département/ville a déjà été scrapée"""
     conn = get_connection()
@@ -562,6 +601,104 @@ def is_already_scraped(metier: str, departement: str, ville: str) -> bool:
     finally:
         conn.close()
 
+def get_known_place_ids(departement: str = None) -> set:
+    """
+    Clés des fiches Google Maps déjà en base (colonne place_key, voir scraping.place_ids.cle_fiche)
+
+    Permet au scraper de ne pas rouvrir les fiches déjà connues.
+
+    Args:
+        departement: Limiter aux artisans de ce département (None = toute la base)
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    query = "SELECT place_key FROM artisans WHERE place_key IS NOT NULL"
+    params = []
+    if departement:
+        query += " AND (departement = ? OR departement_recherche = ?)"
+        params.extend([departement, departement])
+
+    try:
+        cursor.execute(query, params)
+        cles = {row[0] for row in cursor.fetchall()}
+    except sqlite3.OperationalError as e:
+        # Base non migrée (init_database ajoute la colonne place_key)
+        logger.warning(f"get_known_place_ids: {e}")
+        cles = set()
+    finally:
+        conn.close()
+
+    cles.discard(None)
+    return cles
+
+
+# Champs qu'un second passage sur une fiche peut compléter (jamais écraser), voir rafraichir_artisan_connu
+CHAMPS_COMPLETABLES = ('telephone', 'site_web', 'adresse', 'code_postal', 'ville', 'departement')
+
+def rafraichir_artisan_connu(place_id: str, note: float = None, nombre_avis: int = None,
+                             conn=None, commit: bool = True, completer: Dict = None) -> bool:
+    """
+    Mise à jour légère d'une fiche déjà connue (note / nombre d'avis lus sur la carte de résultat)
+
+    Args:
+        place_id: Clé de la fiche (voir scraping.place_ids.cle_fiche), comparée exactement à place_key
+        conn: Connexion existante (écrivain unique, voir whatsapp_database/ingestion.py)
+        commit: Commit après l'écriture (False : l'appelant commit, transactions groupées)
+        completer: Champs de CHAMPS_COMPLETABLES écrits seulement s'ils sont vides en base
+                   (même fiche revue plus complète dans une autre ville du run)
+
+    Returns:
+        True si au moins un artisan a été mis à jour
+    """
+    completer = {k: v for k, v in (completer or {}).items() if k in CHAMPS_COMPLETABLES and v not in (None, '')}
+    if not place_id or (note is None and nombre_avis is None and not completer):
+        return False
+
+    update_fields = []
+    update_values = []
+    if note is not None:
+        update_fields.append("note = ?")
+        update_values.append(note)
+    if nombre_avis is not None:
+        update_fields.append("nombre_avis = ?")
+        update_values.append(nombre_avis)
+    if completer.get('telephone'):
+        completer['telephone_formate'] = formater_telephone_fr(completer['telephone'])
+    champs_completes = []
+    for champ, valeur in completer.items():
+        # Ne jamais écraser une valeur déjà présente
+        champs_completes.append((f"{champ} = COALESCE(NULLIF({champ}, ''), ?)", valeur, champ.startswith('telephone')))
+
+    def executer(avec_telephone: bool):
+        champs = [(f, v) for f, v, tel in champs_completes if avec_telephone or not tel]
+        if not update_fields and not champs:
+            return
+        cursor.execute(
+            f"UPDATE artisans SET {', '.join(update_fields + [f for f, _ in champs])} WHERE place_key = ?",
+            update_values + [v for _, v in champs] + [place_id]
+        )
+
+    own_connection = conn is None
+    if own_connection:
+        conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        try:
+            executer(avec_telephone=True)
+        except sqlite3.IntegrityError:
+            # Téléphone déjà porté par une autre fiche (colonne UNIQUE) : compléter le reste
+            executer(avec_telephone=False)
+        if commit or own_connection:
+            conn.commit()
+        return cursor.rowcount > 0
+    except Exception as e:
+        print(f"Erreur rafraîchissement fiche connue: {e}")
+        return False
+    finally:
+        if own_connection:
+            conn.close()
+
 def get_scraping_history(metier: str = None, departement: str = None) -> List[Dict]:
     """Récupère l'historique des scrapings"""
     conn = get_connection()
@@ -7,6 +7,7 @@ from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from whatsapp_database.models import get_connection
 from whatsapp_database.queries import get_scraping_history
+from whatsapp_database.gazetteer import communes_du_departement
 import requests
 
 
@@ -30,11 +31,16 @@ def get_coverage_metrics(metier: Optional[str] = None, departement: Optional[str
     villes_scrapees = len(set((h['ville'], h.get('departement', '')) for h in historique))
     artisans_trouves = sum(h.get('results_count', 0) for h in historique)
     
-    # Essayer de récupérer le nombre de villes disponibles via API
+    # Nombre de villes disponibles : gazetteer local, sinon API
     villes_disponibles = None
     taux_couverture = None
     
-    if departement:
+    communes_locales = communes_du_departement(departement) if departement else None
+    if communes_locales is not None:
+        villes_disponibles = len(communes_locales)
+        if villes_disponibles > 0:
+            taux_couverture = (villes_scrapees / villes_disponibles) * 100
+    elif departement:
         try:
             url = f"https://geo.api.gouv.fr/departements/{departement}/communes"
             params = {"fields": "nom,code", "format": "json"}
@@ -191,6 +197,66 @@ def get_session_statistics(days: int = 30) -> List[Dict]:
     return [dict(row) for row in rows]
 
 
+def _percentile(valeurs: List[float], p: float) -> Optional[float]:
+    """Percentile par interpolation linéaire (p entre 0 et 100)"""
+    if not valeurs:
+        return None
+    valeurs = sorted(valeurs)
+    rang = (len(valeurs) - 1) * p / 100.0
+    bas = int(rang)
+    haut = min(bas + 1, len(valeurs) - 1)
+    return valeurs[bas] + (valeurs[haut] - valeurs[bas]) * (rang - bas)
+
+
+def get_timing_summary(environnement: Optional[str] = None, days: int = 30) -> List[Dict]:
+    """
+    Résumé p50/p95 de la durée de chaque étape de scraping, par environnement
+    
+    Args:
+        environnement: 'local' ou 'github_actions' (None = tous)
+        days: Nombre de jours à analyser
+    
+    Returns:
+        Liste de dicts avec: environnement, etape, nombre, p50, p95, moyenne, total
+        (triée par durée totale décroissante : la première ligne est l'étape à optimiser)
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    date_limit = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+    query = "SELECT environnement, etape, duree FROM scraping_timings WHERE created_at >= ?"
+    params = [date_limit]
+    if environnement:
+        query += " AND environnement = ?"
+        params.append(environnement)
+    
+    try:
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+    except sqlite3.OperationalError:
+        rows = []  # Table pas encore créée
+    finally:
+        conn.close()
+    
+    durees: Dict[tuple, List[float]] = {}
+    for env, etape, duree in rows:
+        durees.setdefault((env, etape), []).append(duree)
+    
+    resume = []
+    for (env, etape), valeurs in durees.items():
+        resume.append({
+            'environnement': env,
+            'etape': etape,
+            'nombre': len(valeurs),
+            'p50': _percentile(valeurs, 50),
+            'p95': _percentile(valeurs, 95),
+            'moyenne': sum(valeurs) / len(valeurs),
+            'total': sum(valeurs),
+        })
+    resume.sort(key=lambda r: r['total'], reverse=True)
+    return resume
+
+
 def get_priority_suggestions(metier: Optional[str] = None, limit: int = 10) -> List[Dict]:
     """
     Suggère des départements/villes prioritaires à scraper
@@ -290,6 +356,9 @@ def generate_research_report(metier: Optional[str] = None,
     # Suggestions
     suggestions = get_priority_suggestions(metier=metier, limit=5)
     
+    # Durées par étape (p50/p95 par environnement)
+    timings = get_timing_summary()
+    
     return {
         'periode': {
             'start_date': start_date,
@@ -307,5 +376,6 @@ def generate_research_report(metier: Optional[str] = None,
         'statistiques_par_metier': stats_metiers,
         'statistiques_par_departement': stats_departements,
         'sessions_recentes': sessions,
-        'suggestions_prioritaires': suggestions
+        'suggestions_prioritaires': suggestions,
+        'timings_par_etape': timings
     }